@@ -0,0 +1,72 @@
+"""
+Compara consultas compostas sobre viagens (``query()``) com a filtragem
+equivalente por varredura de ``listar_todos()``, e mostra o plano
+escolhido para cada uma.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_consultas [quantidade]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from controllers.destino_controller import DestinoController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+
+
+def _medir(funcao, repeticoes: int):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    aleatorio = random.Random(42)
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(PessoaController(), destino_controller)
+
+    destinos = [destino_controller.criar({'nome': f'Destino {i}', 'cidade': f'Cidade {i}', 'pais': 'Brasil'})
+                for i in range(200)]
+    base = date(2030, 1, 1)
+    for i in range(quantidade):
+        data_inicio = base + timedelta(days=aleatorio.randrange(3650))
+        viagem_controller.criar({
+            'titulo': f'Viagem {i}',
+            'data_inicio': data_inicio,
+            'data_fim': data_inicio + timedelta(days=aleatorio.randint(1, 30)),
+            'destino_ids': aleatorio.sample(destinos, aleatorio.randint(1, 3)),
+            'valor_total': 1000.0
+        })
+
+    hoje = base + timedelta(days=3000)
+    destino = destinos[7]
+
+    def por_varredura():
+        viagens = [v for v in viagem_controller.listar_todos()
+                   if v.data_fim >= hoje and any(d.destino.id == destino for d in v.destinos)]
+        return sorted(viagens, key=lambda v: v.data_inicio)[:50]
+
+    consultas = {
+        'destino + data_fim, ordem por data_inicio':
+            viagem_controller.query().where(data_fim__gte=hoje).where(destino=destino)
+            .order_by('data_inicio').limit(50),
+        'próximas 50 por data_inicio':
+            viagem_controller.query().where(data_inicio__gte=hoje).order_by('data_inicio').limit(50),
+    }
+
+    esperado, tempo_varredura = _medir(por_varredura, 5)
+    print(f"Viagens:             {quantidade}")
+    print(f"Varredura:           {tempo_varredura * 1000:.2f}ms")
+    for nome, consulta in consultas.items():
+        resultado, tempo = _medir(consulta.all, 20)
+        print(f"{nome}: {len(resultado)} em {tempo * 1000:.2f}ms")
+        print(f"    {consulta.explain()}")
+    assert list(consultas.values())[0].all() == esperado
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Mede a importação em lote de empresas com o índice único de CNPJ, a
+busca por CNPJ (com e sem formatação) e a busca por nome, cuja primeira
+chamada constrói o índice de trigramas sob demanda.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_empresas [quantidade]
+"""
+import sys
+import time
+
+from controllers.empresa_controller import EmpresaController
+
+
+def _registros(quantidade: int):
+    for i in range(quantidade):
+        yield {
+            'nome': f'Parceiro {i}',
+            'cnpj': f'{i:014d}',
+            'telefone': '(11) 3000-0000'
+        }
+
+
+def _formatar(cnpj: str) -> str:
+    return f'{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}'
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    controller = EmpresaController()
+
+    inicio = time.perf_counter()
+    resultado = controller.criar_lote(_registros(quantidade))
+    tempo_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    repetidos = controller.criar_lote(_registros(quantidade // 10))
+    tempo_conflitos = time.perf_counter() - inicio
+
+    cnpjs = [f'{i:014d}' for i in range(0, quantidade, 7)]
+    inicio = time.perf_counter()
+    for cnpj in cnpjs:
+        controller.buscar_por_cnpj(cnpj)
+        controller.buscar_por_cnpj(_formatar(cnpj))
+    tempo_busca = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    controller.buscar_por_nome('parceiro 4217')
+    tempo_primeira_busca = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    encontradas = controller.buscar_por_nome('parceiro 4217')
+    tempo_busca_nome = time.perf_counter() - inicio
+
+    print(f"Empresas:            {len(resultado['ids'])}")
+    print(f"Lote:                {tempo_lote:.3f}s ({quantidade / tempo_lote:,.0f}/s)")
+    print(f"Conflitos:           {len(repetidos['erros'])} em {tempo_conflitos:.3f}s")
+    print(f"Buscas por CNPJ:     {2 * len(cnpjs)} em {tempo_busca:.3f}s")
+    print(f"1ª busca por nome:   {tempo_primeira_busca:.3f}s (constrói o índice)")
+    print(f"Busca por nome:      {len(encontradas)} em {tempo_busca_nome * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
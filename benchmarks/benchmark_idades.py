@@ -0,0 +1,69 @@
+"""
+Buscas por idade em ``PessoaController``: a varredura anterior, que
+calculava a idade de cada pessoa, contra o índice ordenado de datas de
+nascimento (listar maiores de idade, uma faixa etária estreita e contar
+uma faixa).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_idades [pessoas]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from controllers.pessoa_controller import PessoaController
+
+REPETICOES = 20
+
+
+def _cadastrar(quantidade: int) -> PessoaController:
+    aleatorio = random.Random(42)
+    inicio = date(1930, 1, 1)
+    pessoa_controller = PessoaController()
+    resultado = pessoa_controller.criar_lote(
+        {'nome': f'Cliente {i}', 'celular': '48999990000', 'identificacao': f'{i:011d}',
+         'data_nascimento': inicio + timedelta(days=aleatorio.randint(0, 365 * 75))}
+        for i in range(quantidade))
+    assert not resultado['erros']
+    return pessoa_controller
+
+
+def _medir(funcao) -> tuple:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = funcao()
+    return (time.perf_counter() - inicio) / REPETICOES, resultado
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    pessoa_controller = _cadastrar(quantidade)
+    hoje = date.today()
+
+    def varrer(minima: int, maxima: int) -> list:
+        return [pessoa for pessoa in pessoa_controller.listar_todos()
+                if minima <= pessoa.calcular_idade() <= maxima]
+
+    casos = (
+        ('maiores de idade', lambda: varrer(18, 200), lambda: pessoa_controller.listar_maiores_idade()),
+        ('30 anos', lambda: varrer(30, 30), lambda: pessoa_controller.listar_por_faixa_etaria(30, 30)),
+        ('contar 30 a 39 anos', lambda: len(varrer(30, 39)),
+         lambda: pessoa_controller.contar_por_faixa_etaria(30, 39, hoje))
+    )
+    print(f"{quantidade} pessoas")
+    for descricao, varredura, indice in casos:
+        tempo_varredura, esperado = _medir(varredura)
+        tempo_indice, obtido = _medir(indice)
+        if isinstance(esperado, list):
+            assert {pessoa.id for pessoa in esperado} == {pessoa.id for pessoa in obtido}
+            tamanho = len(obtido)
+        else:
+            assert esperado == obtido
+            tamanho = obtido
+        print(f"{descricao:20} ({tamanho:6}): varredura {tempo_varredura * 1000:8.2f} ms, "
+              f"índice {tempo_indice * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Importação de manifestos de passagens (CSV e JSONL) com
+``ImportadorPassagens``, contra ``criar`` linha a linha, com 1% de
+linhas inválidas misturadas.
+
+Além da vazão, mede a memória usada pela importação em si (pico durante
+a importação menos o que fica retido nas passagens criadas), lendo em
+lotes e com o arquivo inteiro num lote só. Em lotes ela não depende do
+tamanho do arquivo; o que sobra são os redimensionamentos dos dicts dos
+índices, que acontecem em qualquer gravação.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_importacao_passagens [linhas]
+"""
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.empresa_controller import EmpresaController
+from controllers.passagem_controller import PassagemController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+from services.importacao_passagens import ImportadorPassagens
+
+PESSOAS = 500
+VIAGENS = 1000
+CAMPOS = ('viagem_id', 'tipo_transporte_id', 'responsavel_compra_id', 'origem', 'destino', 'data_viagem',
+          'horario_partida', 'horario_chegada', 'valor', 'compra_realizada', 'numero_assento', 'codigo_reserva')
+
+
+def _sistema():
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    empresa_controller = EmpresaController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    passagem_controller = PassagemController(empresa_controller, pessoa_controller, viagem_controller)
+    pessoas = [pessoa_controller.criar({'nome': f'Cliente {i}', 'celular': '48999990000',
+                                        'identificacao': f'{i:011d}', 'data_nascimento': date(1990, 1, 1)})
+               for i in range(PESSOAS)]
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    viagens = [viagem_controller.criar({
+        'titulo': f'Viagem {i}',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': 10000.0
+    }) for i in range(VIAGENS)]
+    empresa_id = empresa_controller.criar({'nome': 'Companhia', 'cnpj': '11222333000181',
+                                           'telefone': '4833334444'})
+    tipos = [passagem_controller.cadastrar_tipo_transporte({'empresa_id': empresa_id, 'tipo': tipo})
+             for tipo in ('Avião', 'Ônibus')]
+    return passagem_controller, pessoas, viagens, tipos
+
+
+def _registros(quantidade: int, pessoas: list, viagens: list, tipos: list):
+    aleatorio = random.Random(42)
+    for i in range(quantidade):
+        registro = {
+            'viagem_id': aleatorio.choice(viagens),
+            'tipo_transporte_id': aleatorio.choice(tipos),
+            'responsavel_compra_id': aleatorio.choice(pessoas) if aleatorio.random() < 0.5 else '',
+            'origem': 'Florianópolis',
+            'destino': 'Lisboa',
+            'data_viagem': f'2030-01-{aleatorio.randint(1, 8):02d}',
+            'horario_partida': f'{aleatorio.randint(0, 23):02d}:{aleatorio.choice((0, 15, 30, 45)):02d}',
+            'horario_chegada': f'{aleatorio.randint(0, 23):02d}:{aleatorio.choice((0, 15, 30, 45)):02d}',
+            'valor': f'{aleatorio.randint(100, 5000)}.00',
+            'compra_realizada': aleatorio.choice(('true', 'false')),
+            'numero_assento': f'{aleatorio.randint(1, 40)}{aleatorio.choice("ABCDEF")}',
+            'codigo_reserva': f'R{i:08d}'
+        }
+        sorteio = aleatorio.random()
+        if sorteio < 0.004:
+            registro['viagem_id'] = 'inexistente'
+        elif sorteio < 0.007:
+            registro['data_viagem'] = '2030-13-01'
+        elif sorteio < 0.01:
+            registro['valor'] = '-10'
+        yield registro
+
+
+def _escrever(caminho: str, formato: str, registros):
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        if formato == 'csv':
+            escritor = csv.DictWriter(arquivo, CAMPOS)
+            escritor.writeheader()
+            escritor.writerows(registros)
+        else:
+            for registro in registros:
+                arquivo.write(json.dumps(registro) + '\n')
+
+
+def _importar(caminho: str, quantidade: int, formato: str, medir_memoria: bool = False,
+              tamanho_lote: int = 5000):
+    passagem_controller, pessoas, viagens, tipos = _sistema()
+    _escrever(caminho, formato, _registros(quantidade, pessoas, viagens, tipos))
+    if medir_memoria:
+        tracemalloc.start()
+    resultado = ImportadorPassagens(passagem_controller, tamanho_lote).importar(caminho)
+    memoria = None
+    if medir_memoria:
+        retido, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memoria = pico - retido
+    assert passagem_controller.contar_todos() == resultado.importadas
+    assert resultado.importadas + len(resultado.rejeitadas) == quantidade
+    numeros = [numero for numero, _ in resultado.rejeitadas]
+    assert numeros == sorted(numeros)
+    return resultado, memoria
+
+
+def _criar_linha_a_linha(caminho: str, quantidade: int) -> float:
+    passagem_controller, pessoas, viagens, tipos = _sistema()
+    _escrever(caminho, 'csv', _registros(quantidade, pessoas, viagens, tipos))
+    inicio = time.perf_counter()
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        for registro in csv.DictReader(arquivo):
+            try:
+                registro['data_viagem'] = date.fromisoformat(registro['data_viagem'])
+                registro['valor'] = float(registro['valor'])
+                registro['compra_realizada'] = registro['compra_realizada'] == 'true'
+                passagem_controller.criar(registro)
+            except Exception:
+                pass
+    return time.perf_counter() - inicio
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for formato in ('csv', 'jsonl'):
+            caminho = os.path.join(diretorio, f'manifesto.{formato}')
+            resultado, _ = _importar(caminho, quantidade, formato)
+            print(f"{formato.upper():5} {resultado.linhas} linhas, {len(resultado.rejeitadas)} rejeitadas: "
+                  f"{resultado.segundos:.2f}s ({resultado.linhas_por_segundo:,.0f} linhas/s)")
+
+        tempo = _criar_linha_a_linha(os.path.join(diretorio, 'linhas.csv'), quantidade)
+        print(f"CSV com criar linha a linha: {tempo:.2f}s ({quantidade / tempo:,.0f} linhas/s)")
+
+        caminho = os.path.join(diretorio, 'memoria.csv')
+        for descricao, tamanho_lote in (('lotes de 5000', 5000), ('um lote só', quantidade)):
+            _, memoria = _importar(caminho, quantidade, 'csv', medir_memoria=True, tamanho_lote=tamanho_lote)
+            print(f"Memória da importação ({descricao}): {memoria / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Importação de uma base de clientes em CSV com ``ImportadorPessoas``,
+variando o número de processos, contra ``criar`` linha a linha. Cerca de
+1% das linhas são inválidas (menor de idade, data quebrada, documento
+repetido). Confere que o resultado (pessoas e erros por linha) é o mesmo
+com qualquer número de processos.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_importacao_pessoas [linhas] [processos...]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+from controllers.pessoa_controller import PessoaController
+from services.importacao_pessoas import ImportadorPessoas
+
+
+def _escrever(caminho: str, quantidade: int):
+    aleatorio = random.Random(42)
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(('nome', 'celular', 'identificacao', 'data_nascimento', 'tipo_identificacao'))
+        for i in range(quantidade):
+            nascimento = f'{aleatorio.randint(1940, 2004)}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}'
+            identificacao = f'{i:011d}'
+            sorteio = aleatorio.random()
+            if sorteio < 0.004:
+                nascimento = '2015-06-01'
+            elif sorteio < 0.007:
+                nascimento = '1990-02-30'
+            elif sorteio < 0.01:
+                identificacao = f'{aleatorio.randrange(max(i, 1)):011d}'
+            escritor.writerow((f'Cliente {i}', f'4899{aleatorio.randrange(10 ** 7):07d}', identificacao,
+                               nascimento, 'cpf'))
+
+
+def _criar_linha_a_linha(caminho: str) -> float:
+    pessoa_controller = PessoaController()
+    inicio = time.perf_counter()
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        for dados in csv.DictReader(arquivo):
+            try:
+                dados['data_nascimento'] = date.fromisoformat(dados['data_nascimento'])
+                pessoa_controller.criar(dados)
+            except Exception:
+                pass
+    return time.perf_counter() - inicio
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    nucleos = os.cpu_count() or 1
+    processos = [int(p) for p in sys.argv[2:]] or sorted({1, 2, 4, 8, nucleos} & set(range(1, nucleos + 1)) | {1})
+    print(f"{quantidade} linhas, {nucleos} núcleos")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'clientes.csv')
+        _escrever(caminho, quantidade)
+
+        referencia = None
+        base = None
+        for quantidade_processos in processos:
+            pessoa_controller = PessoaController()
+            resultado = ImportadorPessoas(pessoa_controller, quantidade_processos).importar(caminho)
+            pessoas = [(p.identificacao, p.data_nascimento) for p in pessoa_controller.iter_todos()]
+            if referencia is None:
+                referencia = (pessoas, resultado.rejeitadas)
+                base = resultado.segundos
+            assert (pessoas, resultado.rejeitadas) == referencia, "resultado mudou com o número de processos"
+            print(f"    {quantidade_processos:2} processos: {resultado.segundos:6.2f}s "
+                  f"({resultado.linhas_por_segundo:,.0f} linhas/s, {base / resultado.segundos:.1f}x), "
+                  f"{resultado.importadas} importadas, {len(resultado.rejeitadas)} rejeitadas")
+
+        tempo = _criar_linha_a_linha(caminho)
+        print(f"    criar linha a linha: {tempo:6.2f}s ({quantidade / tempo:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
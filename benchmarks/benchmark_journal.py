@@ -0,0 +1,72 @@
+"""
+Mede a vazão de escrita do JournalStorage em cada política de fsync e o
+tempo de recuperação (snapshot + cauda do journal) em função do tamanho
+do journal.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_journal
+"""
+import os
+import tempfile
+import time
+from datetime import date
+
+from controllers.journal import JournalStorage, POLITICAS_FSYNC, FSYNC_OS
+from controllers.pessoa_controller import PessoaController
+
+
+def _popular(storage: JournalStorage, quantidade: int):
+    controller = PessoaController(storage)
+    for i in range(quantidade):
+        controller.criar({
+            'nome': f'Pessoa {i}',
+            'celular': f'(11) 9{i:08d}',
+            'identificacao': f'{i:011d}',
+            'data_nascimento': date(1980 + i % 20, 1 + i % 12, 1 + i % 28)
+        })
+
+
+def medir_escrita(quantidade: int = 5000):
+    print("Escrita por política de fsync")
+    for politica in POLITICAS_FSYNC:
+        with tempfile.TemporaryDirectory() as diretorio:
+            storage = JournalStorage(diretorio, politica_fsync=politica, compactar_a_cada=None)
+            inicio = time.perf_counter()
+            _popular(storage, quantidade)
+            storage.fechar()
+            duracao = time.perf_counter() - inicio
+        print(f"  {politica:<7} {quantidade / duracao:>10.0f} registros/s")
+
+
+def medir_recuperacao(tamanhos=(1000, 10000, 100000)):
+    print("Recuperação em função do tamanho do journal")
+    for tamanho in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            storage = JournalStorage(diretorio, politica_fsync=FSYNC_OS, compactar_a_cada=None)
+            _popular(storage, tamanho)
+            storage.fechar()
+            tamanho_arquivo = os.path.getsize(os.path.join(diretorio, JournalStorage.ARQUIVO_JOURNAL))
+
+            inicio = time.perf_counter()
+            JournalStorage(diretorio, politica_fsync=FSYNC_OS).fechar()
+            so_journal = time.perf_counter() - inicio
+
+            storage = JournalStorage(diretorio, politica_fsync=FSYNC_OS)
+            storage.compactar()
+            storage.fechar()
+
+            inicio = time.perf_counter()
+            JournalStorage(diretorio, politica_fsync=FSYNC_OS).fechar()
+            so_snapshot = time.perf_counter() - inicio
+
+        print(f"  {tamanho:>7} registros ({tamanho_arquivo / 1024:>8.0f} KiB): "
+              f"journal {so_journal:.3f}s, snapshot {so_snapshot:.3f}s")
+
+
+def main():
+    medir_escrita()
+    medir_recuperacao()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compara memória e tempo de busca por viagem entre um dict de objetos
+Pagamento e o PagamentoStore colunar, sozinho e por dentro do
+``PagamentoController`` (``criar_lote``, com os índices e o livro de
+totais).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_pagamentos [quantidade]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.pagamento_controller import PagamentoController
+from controllers.pagamento_store import PagamentoStore
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+from models.pagamento import Pagamento
+from models.tipo_pagamento import TipoPagamento
+from utils.validacao_pagamento import digito_luhn, digitos_cpf
+
+PESSOAS = 5000
+VIAGENS = 1000
+
+
+def _pagamentos(quantidade: int):
+    tipos = list(TipoPagamento)
+    for i in range(quantidade):
+        tipo = tipos[i % len(tipos)]
+        dados = {}
+        if tipo == TipoPagamento.PIX:
+            base = f'{100000000 + i % 5000}'
+            dados['cpf_pagador'] = base + digitos_cpf(base)
+        elif tipo == TipoPagamento.CARTAO:
+            parcial = f'4111{i % 5000:011d}'
+            dados['numero_cartao'] = parcial + digito_luhn(parcial)
+            dados['bandeira'] = 'Visa'
+        yield Pagamento(date(2025, 1 + i % 12, 1 + i % 28), 10.0 + i % 500,
+                        f'pessoa-{i % PESSOAS}', f'viagem-{i % VIAGENS}', tipo, dados)
+
+
+def _medir(colecao, quantidade: int):
+    tracemalloc.start()
+    for pagamento in _pagamentos(quantidade):
+        colecao[pagamento.id] = pagamento
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memoria
+
+
+def _controlador() -> tuple:
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    pagamento_controller = PagamentoController(pessoa_controller, viagem_controller)
+    pessoas = pessoa_controller.criar_lote(
+        {'nome': f'Cliente {i}', 'celular': '48999990000', 'identificacao': f'{i:011d}',
+         'data_nascimento': date(1990, 1, 1)}
+        for i in range(PESSOAS))['ids']
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    viagens = [viagem_controller.criar({
+        'titulo': f'Viagem {i}',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': 1e12
+    }) for i in range(VIAGENS)]
+    return pagamento_controller, pessoas, viagens
+
+
+def _medir_controlador(quantidade: int):
+    pagamento_controller, pessoas, viagens = _controlador()
+    linhas = []
+    for i, pagamento in enumerate(_pagamentos(quantidade)):
+        linhas.append(dict(pagamento._dados_pagamento, pessoa_id=pessoas[i % PESSOAS],
+                           viagem_id=viagens[i % VIAGENS], valor=pagamento.valor,
+                           tipo=pagamento.tipo.value, data=pagamento.data))
+
+    tracemalloc.start()
+    resultado = pagamento_controller.criar_lote(linhas)
+    del resultado
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    obtido = [(p.valor, p.data) for p in pagamento_controller.listar_por_viagem(viagens[7])]
+    return memoria, time.perf_counter() - inicio, obtido
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    objetos = {}
+    memoria_objetos = _medir(objetos, quantidade)
+    inicio = time.perf_counter()
+    esperado = [(p.valor, p.data) for p in objetos.values() if p.viagem_id == 'viagem-7']
+    tempo_objetos = time.perf_counter() - inicio
+    del objetos
+
+    store = PagamentoStore()
+    memoria_store = _medir(store, quantidade)
+    inicio = time.perf_counter()
+    obtido = [(p.valor, p.data) for p in store.listar_por_viagem('viagem-7')]
+    tempo_store = time.perf_counter() - inicio
+    assert obtido == esperado
+    del store
+
+    memoria_controlador, tempo_controlador, obtido = _medir_controlador(quantidade)
+    assert obtido == esperado
+
+    print(f"Pagamentos:                     {quantidade}")
+    print(f"Memória dict de objetos:        {memoria_objetos / quantidade:.0f} bytes/pagamento")
+    print(f"Memória PagamentoStore:         {memoria_store / quantidade:.0f} bytes/pagamento")
+    print(f"Memória PagamentoController:    {memoria_controlador / quantidade:.0f} bytes/pagamento")
+    print(f"Busca por viagem (objetos):     {tempo_objetos * 1000:.1f} ms")
+    print(f"Busca por viagem (store):       {tempo_store * 1000:.1f} ms")
+    print(f"Busca por viagem (controlador): {tempo_controlador * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
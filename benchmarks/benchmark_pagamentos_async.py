@@ -0,0 +1,93 @@
+"""
+Pagamentos PIX autorizados por um gateway simulado com ``criar_async``.
+
+O gateway responde em 50ms (+ até 50ms aleatórios) e falha
+temporariamente em 2% das chamadas; respostas acima do timeout também
+são tentadas de novo. Mede a vazão com a concorrência limitada e
+compara com o tempo que o mesmo volume levaria autorizando um pagamento
+por vez. Ao final, dispara ao mesmo tempo mais pagamentos do que cabem
+numa viagem e confere que o total aceito não passa do valor dela.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_pagamentos_async [pagamentos] [concorrencia]
+"""
+import asyncio
+import sys
+import time
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.pagamento_controller import PagamentoController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+from exceptions import GatewayIndisponivelException, PagamentoExcedeSaldoException
+from services.gateway_pagamento import GatewaySimulado
+
+VIAGENS = 500
+VALOR_PAGAMENTO = 10.0
+
+
+def _dados(pessoa_id: str, viagem_id: str) -> dict:
+    return {'pessoa_id': pessoa_id, 'viagem_id': viagem_id, 'valor': VALOR_PAGAMENTO,
+            'data': date.today(), 'tipo': 'pix', 'cpf_pagador': '529.982.247-25'}
+
+
+async def _disparar(pagamento_controller: PagamentoController, lote: list):
+    return await asyncio.gather(*(pagamento_controller.criar_async(dados) for dados in lote),
+                                return_exceptions=True)
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    concorrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    pagamento_controller = PagamentoController(pessoa_controller, viagem_controller)
+    gateway = GatewaySimulado(latencia=0.05, variacao=0.05, taxa_falha=0.02, semente=42)
+    pagamento_controller.configurar_gateway(gateway, concorrencia=concorrencia, timeout=0.09,
+                                            tentativas=5, espera_inicial=0.05)
+
+    pessoa_id = pessoa_controller.criar({'nome': 'Cliente', 'celular': '48999990000',
+                                         'identificacao': '52998224725', 'data_nascimento': date(1990, 1, 1)})
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    viagens = [viagem_controller.criar({
+        'titulo': f'Viagem {i}',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': quantidade * VALOR_PAGAMENTO
+    }) for i in range(VIAGENS)]
+
+    lote = [_dados(pessoa_id, viagens[i % VIAGENS]) for i in range(quantidade)]
+    inicio = time.perf_counter()
+    resultados = asyncio.run(_disparar(pagamento_controller, lote))
+    tempo = time.perf_counter() - inicio
+    falhas = [r for r in resultados if isinstance(r, BaseException)]
+    sequencial = quantidade * (gateway.latencia + gateway.variacao / 2)
+
+    print(f"Pagamentos:        {quantidade} ({len(falhas)} sem autorização)")
+    print(f"Tempo:             {tempo:.2f}s ({quantidade / tempo:.0f} pagamentos/s)")
+    print(f"Um por vez:        ~{sequencial:.0f}s")
+    print(f"Chamadas:          {gateway.chamadas} ({gateway.chamadas - quantidade} repetidas)")
+    print(f"Pico em andamento: {gateway.pico_em_andamento} (limite {concorrencia})")
+    assert gateway.pico_em_andamento <= concorrencia
+    assert all(isinstance(f, GatewayIndisponivelException) for f in falhas)
+
+    valor_total = 100 * VALOR_PAGAMENTO
+    viagem_id = viagem_controller.criar({
+        'titulo': 'Lotada', 'data_inicio': date(2030, 1, 1), 'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id], 'valor_total': valor_total
+    })
+    gateway.taxa_falha = 0.0
+    resultados = asyncio.run(_disparar(pagamento_controller, [_dados(pessoa_id, viagem_id)] * 300))
+    recusados = sum(isinstance(r, PagamentoExcedeSaldoException) for r in resultados)
+    total_pago = viagem_controller.calcular_total_pago(viagem_id)
+    print(f"Mesma viagem:      300 disparados, R$ {total_pago:.2f} aceitos de R$ {valor_total:.2f}, "
+          f"{recusados} recusados por saldo")
+    assert total_pago <= valor_total
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Pagamentos simultâneos em várias threads.
+
+O processamento de cada pagamento espera uma latência fixa, simulando a
+resposta do gateway. Cada rodada usa uma viagem por thread e mede a vazão
+com 1, 2, 4, ... threads; como as travas são por viagem, ela deve crescer
+quase na mesma proporção. Uma rodada final põe todas as threads pagando
+a mesma viagem, tentando somar mais que o valor total, e confere que o
+total aceito nunca passa dele.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_pagamentos_concorrentes [threads_max] [latencia_ms]
+"""
+import sys
+import threading
+import time
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.pagamento_controller import PagamentoController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+from exceptions import PagamentoExcedeSaldoException
+from models.strategies_pagamento import StrategyPagamentoDinheiro
+
+PAGAMENTOS_POR_THREAD = 50
+VALOR_PAGAMENTO = 10.0
+
+
+def _simular_gateway(latencia: float):
+    processar = StrategyPagamentoDinheiro.processar_validado
+
+    def processar_com_latencia(self, dados):
+        time.sleep(latencia)
+        return processar(self, dados)
+
+    StrategyPagamentoDinheiro.processar_validado = processar_com_latencia
+
+
+def _controladores():
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    pagamento_controller = PagamentoController(pessoa_controller, viagem_controller)
+    pessoa_id = pessoa_controller.criar({'nome': 'Cliente', 'celular': '48999990000',
+                                         'identificacao': '52998224725', 'data_nascimento': date(1990, 1, 1)})
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    return viagem_controller, pagamento_controller, pessoa_id, destino_id
+
+
+def _criar_viagem(viagem_controller: ViagemController, destino_id: str, valor_total: float) -> str:
+    return viagem_controller.criar({
+        'titulo': 'Viagem',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': valor_total
+    })
+
+
+def _rodar(threads: int, alvo) -> float:
+    trabalhadores = [threading.Thread(target=alvo, args=(i,)) for i in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    return time.perf_counter() - inicio
+
+
+def main():
+    threads_max = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    latencia_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    _simular_gateway(latencia_ms / 1000)
+
+    print(f"Latência do gateway: {latencia_ms:.1f}ms, {PAGAMENTOS_POR_THREAD} pagamentos por thread")
+    print("Uma viagem por thread:")
+    threads = 1
+    vazao_base = None
+    while threads <= threads_max:
+        viagem_controller, pagamento_controller, pessoa_id, destino_id = _controladores()
+        viagens = [_criar_viagem(viagem_controller, destino_id, PAGAMENTOS_POR_THREAD * VALOR_PAGAMENTO)
+                   for _ in range(threads)]
+
+        def pagar(indice: int):
+            for _ in range(PAGAMENTOS_POR_THREAD):
+                pagamento_controller.criar({'pessoa_id': pessoa_id, 'viagem_id': viagens[indice],
+                                            'valor': VALOR_PAGAMENTO, 'data': date.today(), 'tipo': 'dinheiro'})
+
+        tempo = _rodar(threads, pagar)
+        vazao = threads * PAGAMENTOS_POR_THREAD / tempo
+        vazao_base = vazao_base or vazao
+        assert all(viagem_controller.calcular_saldo_devedor(viagem_id) == 0 for viagem_id in viagens)
+        print(f"    {threads:>3} threads: {vazao:8.0f} pagamentos/s ({vazao / vazao_base:.1f}x)")
+        threads *= 2
+
+    viagem_controller, pagamento_controller, pessoa_id, destino_id = _controladores()
+    valor_total = threads_max * PAGAMENTOS_POR_THREAD * VALOR_PAGAMENTO / 2
+    viagem_id = _criar_viagem(viagem_controller, destino_id, valor_total)
+    recusados = []
+
+    def pagar_mesma_viagem(indice: int):
+        for _ in range(PAGAMENTOS_POR_THREAD):
+            try:
+                pagamento_controller.criar({'pessoa_id': pessoa_id, 'viagem_id': viagem_id,
+                                            'valor': VALOR_PAGAMENTO, 'data': date.today(), 'tipo': 'dinheiro'})
+            except PagamentoExcedeSaldoException:
+                recusados.append(indice)
+
+    _rodar(threads_max, pagar_mesma_viagem)
+    total_pago = sum(p.valor for p in pagamento_controller.listar_por_viagem(viagem_id))
+    excedente = max(0.0, total_pago - valor_total)
+    print(f"Mesma viagem, {threads_max} threads: R$ {total_pago:.2f} aceitos de R$ {valor_total:.2f}, "
+          f"{len(recusados)} recusados, excedente R$ {excedente:.2f}")
+    assert excedente == 0
+    assert total_pago == viagem_controller.calcular_total_pago(viagem_id)
+
+
+if __name__ == "__main__":
+    main()
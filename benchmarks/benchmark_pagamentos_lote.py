@@ -0,0 +1,85 @@
+"""
+Importação de um arquivo de pagamentos: ``criar`` linha a linha contra
+``criar_lote``, com 1% de linhas inválidas misturadas.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_pagamentos_lote [linhas]
+"""
+import random
+import sys
+import time
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.pagamento_controller import PagamentoController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+
+PESSOAS = 1000
+VIAGENS = 2000
+
+
+def _sistema():
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    pagamento_controller = PagamentoController(pessoa_controller, viagem_controller)
+    pessoas = [pessoa_controller.criar({'nome': f'Cliente {i}', 'celular': '48999990000',
+                                        'identificacao': f'{i:011d}', 'data_nascimento': date(1990, 1, 1)})
+               for i in range(PESSOAS)]
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    viagens = [viagem_controller.criar({
+        'titulo': f'Viagem {i}',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': 1e9
+    }) for i in range(VIAGENS)]
+    return pagamento_controller, pessoas, viagens
+
+
+def _arquivo(quantidade: int, pessoas: list, viagens: list) -> list:
+    aleatorio = random.Random(42)
+    linhas = []
+    for _ in range(quantidade):
+        dados = {'pessoa_id': aleatorio.choice(pessoas), 'viagem_id': aleatorio.choice(viagens),
+                 'valor': float(aleatorio.randint(1, 5000)), 'data': date(2030, 1, 1)}
+        sorteio = aleatorio.random()
+        if sorteio < 0.4:
+            dados.update(tipo='pix', cpf_pagador='52998224725' if aleatorio.random() > 0.01 else '123')
+        elif sorteio < 0.8:
+            dados.update(tipo='cartao', bandeira='visa', numero_cartao='4111111111111111')
+        else:
+            dados.update(tipo='dinheiro')
+        linhas.append(dados)
+    return linhas
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    pagamento_controller, pessoas, viagens = _sistema()
+    linhas = _arquivo(quantidade, pessoas, viagens)
+    inicio = time.perf_counter()
+    resultado = pagamento_controller.criar_lote(linhas)
+    tempo_lote = time.perf_counter() - inicio
+    erros = len(resultado['erros'])
+
+    pagamento_controller, pessoas, viagens = _sistema()
+    linhas = _arquivo(quantidade, pessoas, viagens)
+    inicio = time.perf_counter()
+    for dados in linhas:
+        try:
+            pagamento_controller.criar(dados)
+        except Exception:
+            pass
+    tempo_linhas = time.perf_counter() - inicio
+
+    print(f"Linhas:      {quantidade} ({erros} rejeitadas)")
+    print(f"criar:       {tempo_linhas:.2f}s ({quantidade / tempo_linhas:,.0f} pagamentos/s)")
+    print(f"criar_lote:  {tempo_lote:.2f}s ({quantidade / tempo_lote:,.0f} pagamentos/s)")
+    assert len(pagamento_controller.listar_todos()) == quantidade - erros
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Mede os relatórios de destinos (mais populares e mais caros), que leem
+``viagem.destinos`` de todas as viagens, e o acesso repetido às
+propriedades de coleção de uma viagem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_relatorios [quantidade]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from controllers.destino_controller import DestinoController
+from controllers.pagamento_controller import PagamentoController
+from controllers.pessoa_controller import PessoaController
+from controllers.viagem_controller import ViagemController
+from services.relatorio_service import RelatorioService
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    aleatorio = random.Random(42)
+    pessoa_controller = PessoaController()
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(pessoa_controller, destino_controller)
+    pagamento_controller = PagamentoController(pessoa_controller, viagem_controller)
+    relatorios = RelatorioService(viagem_controller, destino_controller, pessoa_controller, pagamento_controller)
+
+    destinos = [destino_controller.criar({'nome': f'Destino {i}', 'cidade': f'Cidade {i}', 'pais': 'Brasil'})
+                for i in range(500)]
+    base = date(2030, 1, 1)
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        data_inicio = base + timedelta(days=aleatorio.randrange(3650))
+        viagem_controller.criar({
+            'titulo': f'Viagem {i}',
+            'data_inicio': data_inicio,
+            'data_fim': data_inicio + timedelta(days=7),
+            'destino_ids': aleatorio.sample(destinos, aleatorio.randint(1, 4)),
+            'valor_total': float(aleatorio.randint(500, 20000))
+        })
+    tempo_carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    relatorios.destinos_mais_populares()
+    tempo_populares = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    relatorios.destinos_mais_caros()
+    tempo_caros = time.perf_counter() - inicio
+
+    viagem = viagem_controller.listar_pagina(tamanho=1)[0][0]
+    acessos = 1000000
+    inicio = time.perf_counter()
+    for _ in range(acessos):
+        viagem.destinos
+        viagem.participantes
+        viagem.transportes
+    tempo_propriedades = time.perf_counter() - inicio
+
+    print(f"Viagens:                 {quantidade} (carga em {tempo_carga:.1f}s)")
+    print(f"Destinos mais populares: {tempo_populares:.3f}s")
+    print(f"Destinos mais caros:     {tempo_caros:.3f}s")
+    print(f"Propriedades:            {3 * acessos} acessos em {tempo_propriedades:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compara o tempo de reconstruir N pessoas pelo caminho completo de
+validação (PessoaController.criar) com o de restaurá-las de um snapshot.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_snapshot [quantidade]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from controllers.pessoa_controller import PessoaController
+from controllers.snapshot import ler_snapshot
+from controllers.storage import MemoryStorage
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    storage = MemoryStorage()
+    controller = PessoaController(storage)
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        controller.criar({
+            'nome': f'Pessoa {i}',
+            'celular': f'(11) 9{i:08d}',
+            'identificacao': f'{i:011d}',
+            'data_nascimento': date(1950 + i % 50, 1 + i % 12, 1 + i % 28)
+        })
+    tempo_criacao = time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'snapshot.bin')
+
+        inicio = time.perf_counter()
+        storage.salvar_snapshot(caminho)
+        tempo_gravacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        colecoes, _ = ler_snapshot(caminho)
+        restaurado = PessoaController(MemoryStorage(colecoes))
+        tempo_restauracao = time.perf_counter() - inicio
+
+        tamanho = os.path.getsize(caminho)
+
+    assert len(restaurado.listar_todos()) == quantidade
+
+    print(f"Entidades:          {quantidade}")
+    print(f"Criação validada:   {tempo_criacao:.2f}s")
+    print(f"Gravação snapshot:  {tempo_gravacao:.2f}s ({tamanho / 2**20:.1f} MiB)")
+    print(f"Restauração:        {tempo_restauracao:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
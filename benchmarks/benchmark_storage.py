@@ -0,0 +1,63 @@
+"""
+Compara o PessoaController em memória com o mesmo controlador sobre SQLite.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_storage [quantidade]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from controllers.pessoa_controller import PessoaController
+from controllers.storage import MemoryStorage, SQLiteStorage
+
+
+def _executar(controller: PessoaController, storage, quantidade: int) -> float:
+    inicio = time.perf_counter()
+
+    ids = []
+    for i in range(quantidade):
+        ids.append(controller.criar({
+            'nome': f'Pessoa {i}',
+            'celular': f'(11) 9{i:08d}',
+            'identificacao': f'{i:011d}',
+            'data_nascimento': date(1980 + i % 20, 1 + i % 12, 1 + i % 28)
+        }))
+    storage.sincronizar()
+
+    for pessoa_id in ids:
+        controller.buscar_por_id(pessoa_id)
+
+    controller.listar_todos()
+
+    for pessoa_id in ids[::2]:
+        controller.atualizar(pessoa_id, {'celular': '(11) 90000-0000'})
+
+    for pessoa_id in ids[::3]:
+        controller.deletar(pessoa_id)
+    storage.sincronizar()
+
+    return time.perf_counter() - inicio
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    memoria = MemoryStorage()
+    tempo_memoria = _executar(PessoaController(memoria), memoria, quantidade)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        sqlite = SQLiteStorage(os.path.join(diretorio, 'benchmark.db'))
+        tempo_sqlite = _executar(PessoaController(sqlite), sqlite, quantidade)
+        sqlite.fechar()
+
+    print(f"Entidades:  {quantidade}")
+    print(f"Memória:    {tempo_memoria:.3f}s")
+    print(f"SQLite:     {tempo_sqlite:.3f}s")
+    print(f"Fator:      {tempo_sqlite / tempo_memoria:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
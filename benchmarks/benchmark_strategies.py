@@ -0,0 +1,102 @@
+"""
+Custo de construir um Pagamento com as strategies compartilhadas do
+registro (``models.registro_strategies``), contra a versão anterior, que
+instanciava as três strategies a cada pagamento e guardava uma delas.
+
+Também registra em tempo de execução um tipo novo (boleto), sem alterar
+``Pagamento``, e mede a construção desse tipo.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_strategies [quantidade]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import date
+from typing import Any, Dict
+
+from models.pagamento import Pagamento
+from models.registro_strategies import registrar_strategy
+from models.strategies_pagamento import (
+    StrategyPagamentoCartao,
+    StrategyPagamentoDinheiro,
+    StrategyPagamentoPix
+)
+from models.strategy_pagamento import StrategyPagamento
+from models.tipo_pagamento import TipoPagamento
+
+
+class StrategyPagamentoBoleto(StrategyPagamento):
+    def validar(self, dados: Dict[str, Any]) -> bool:
+        return dados.get('valor', 0) > 0 and len(dados.get('linha_digitavel', '')) == 47
+
+    def processar(self, dados: Dict[str, Any]) -> bool:
+        return self.validar(dados)
+
+    def get_detalhes(self, dados: Dict[str, Any]) -> str:
+        return f"Boleto - {dados['linha_digitavel'][:5]}..."
+
+    def get_nome_tipo(self) -> str:
+        return "boleto"
+
+
+class _PagamentoSemRegistro(Pagamento):
+    def _get_strategy(self, tipo):
+        strategies = {
+            TipoPagamento.DINHEIRO: StrategyPagamentoDinheiro(),
+            TipoPagamento.PIX: StrategyPagamentoPix(),
+            TipoPagamento.CARTAO: StrategyPagamentoCartao()
+        }
+        return strategies[tipo]
+
+
+def _argumentos(tipo):
+    if tipo == TipoPagamento.PIX:
+        return {'cpf_pagador': '52998224725'}
+    if tipo == TipoPagamento.CARTAO:
+        return {'numero_cartao': '4111111111111111', 'bandeira': 'Visa'}
+    if tipo == 'boleto':
+        return {'linha_digitavel': '2' * 47}
+    return {}
+
+
+def _construir(classe, tipos, quantidade: int):
+    dados = [_argumentos(tipo) for tipo in tipos]
+    hoje = date(2025, 1, 1)
+    pagamentos = []
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        indice = i % len(tipos)
+        pagamentos.append(classe(hoje, 100.0, 'pessoa', 'viagem', tipos[indice], dict(dados[indice])))
+    return time.perf_counter() - inicio, pagamentos
+
+
+def _memoria(classe, tipos, quantidade: int) -> float:
+    tracemalloc.start()
+    _, pagamentos = _construir(classe, tipos, quantidade)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del pagamentos
+    return memoria / quantidade
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    tipos = list(TipoPagamento)
+
+    for descricao, classe in (('strategies novas por pagamento', _PagamentoSemRegistro),
+                              ('registro compartilhado', Pagamento)):
+        # Uma rodada de aquecimento, para carregar as strategies.
+        _construir(classe, tipos, 1000)
+        tempo, _ = _construir(classe, tipos, quantidade)
+        print(f"{descricao:32} {tempo:.2f}s ({tempo / quantidade * 1e6:.2f} µs/pagamento, "
+              f"{_memoria(classe, tipos, quantidade // 10):.0f} bytes/pagamento)")
+
+    registrar_strategy('boleto', StrategyPagamentoBoleto)
+    tempo, pagamentos = _construir(Pagamento, ['boleto'], quantidade)
+    assert all(pagamento.processar_pagamento() for pagamento in pagamentos[:100])
+    print(f"{'boleto (registrado agora)':32} {tempo:.2f}s ({tempo / quantidade * 1e6:.2f} µs/pagamento)")
+
+
+if __name__ == "__main__":
+    main()
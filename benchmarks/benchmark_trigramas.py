@@ -0,0 +1,55 @@
+"""
+Compara a busca por substring de atrações com varredura linear e com o
+índice de trigramas.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_trigramas [quantidade]
+"""
+import random
+import sys
+import time
+
+from controllers.indices import IndiceTrigramas
+
+_PREFIXOS = ['Praia', 'Museu', 'Parque', 'Mercado', 'Igreja', 'Forte', 'Farol', 'Teatro', 'Mirante', 'Lagoa']
+_NOMES = ['do Futuro', 'de Iracema', 'da Pipa', 'do Amor', 'Municipal', 'São Marcelo',
+          'de Ponta Negra', 'Pajuçara', 'do Pelourinho', 'Histórico', 'dos Reis Magos', 'Barra']
+_CONSULTAS = ['pipa', 'iracema', 'sao marcelo', 'FAROL DA BARRA', 'rte dos', 'tico 4217']
+
+
+def _atracoes(quantidade: int):
+    aleatorio = random.Random(42)
+    for i in range(quantidade):
+        yield f'atracao-{i}', f'{aleatorio.choice(_PREFIXOS)} {aleatorio.choice(_NOMES)} {i}'
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    atracoes = dict(_atracoes(quantidade))
+
+    inicio = time.perf_counter()
+    indice = IndiceTrigramas()
+    for atracao_id, nome in atracoes.items():
+        indice.adicionar(nome, atracao_id)
+    tempo_construcao = time.perf_counter() - inicio
+
+    print(f"Atrações:   {quantidade}")
+    print(f"Construção: {tempo_construcao:.2f}s")
+    print(f"{'consulta':<18}{'resultados':>12}{'varredura':>12}{'índice':>12}")
+    for consulta in _CONSULTAS:
+        inicio = time.perf_counter()
+        consulta_lower = consulta.lower()
+        esperado = [a for a, nome in atracoes.items() if consulta_lower in nome.lower()]
+        tempo_varredura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        encontrados = indice.buscar(consulta)
+        tempo_indice = time.perf_counter() - inicio
+
+        print(f"{consulta:<18}{len(encontrados):>12}{tempo_varredura * 1000:>10.1f}ms"
+              f"{tempo_indice * 1000:>10.1f}ms")
+        del esperado
+
+
+if __name__ == "__main__":
+    main()
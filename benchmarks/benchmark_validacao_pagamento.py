@@ -0,0 +1,56 @@
+"""
+Validação de números de cartão (Luhn e bandeira): ``analisar_cartao``
+um a um, contra ``analisar_cartoes`` com o lote inteiro. A conferência
+anterior, que só contava os dígitos, entra como referência.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_validacao_pagamento [quantidade]
+"""
+import random
+import sys
+import time
+
+from utils.validacao_pagamento import analisar_cartao, analisar_cartoes, digito_luhn
+
+_PREFIXOS = ('4111', '5555', '3782', '6011', '5067', '6362')
+
+
+def _numeros(quantidade: int) -> list:
+    aleatorio = random.Random(42)
+    numeros = []
+    for _ in range(quantidade):
+        prefixo = aleatorio.choice(_PREFIXOS)
+        tamanho = 15 if prefixo == '3782' else 16
+        parcial = prefixo + ''.join(aleatorio.choices('0123456789', k=tamanho - len(prefixo) - 1))
+        # 1% com o dígito verificador errado.
+        digito = digito_luhn(parcial) if aleatorio.random() > 0.01 else str(aleatorio.randint(0, 9))
+        numeros.append(parcial + digito)
+    return numeros
+
+
+def _medir(funcao, *argumentos):
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    numeros = _numeros(quantidade)
+
+    tempo, _ = _medir(lambda: [13 <= len(''.join(filter(str.isdigit, numero))) <= 19 for numero in numeros])
+    print(f"Só tamanho (anterior):   {tempo:.2f}s ({quantidade / tempo:,.0f} números/s)")
+
+    tempo, um_a_um = _medir(lambda: [analisar_cartao(numero) for numero in numeros])
+    print(f"analisar_cartao:         {tempo:.2f}s ({quantidade / tempo:,.0f} números/s)")
+
+    tempo, lote = _medir(analisar_cartoes, numeros)
+    print(f"analisar_cartoes (lote): {tempo:.2f}s ({quantidade / tempo:,.0f} números/s)")
+
+    assert lote.validos == [resultado.valido for resultado in um_a_um]
+    assert lote.bandeiras == [resultado.bandeira for resultado in um_a_um]
+    print(f"Inválidos: {lote.validos.count(False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Controle de concorrência otimista (``versao_esperada``) contra travas
+pessimistas, com várias threads disputando poucas viagens.
+
+Cada operação lê uma viagem, "pensa" por um tempo fixo (a espera de um
+atendente ou de um serviço externo) e, numa fração das operações, grava
+``valor_total`` lido + 1. No modo pessimista a operação inteira segura a
+trava da viagem, leituras inclusive. No otimista ninguém segura trava
+enquanto pensa: a gravação leva a versão lida e, em caso de conflito, a
+operação é refeita. Ao final confere que nenhum incremento se perdeu.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_versoes [threads] [viagens] [pensar_ms]
+"""
+import random
+import sys
+import threading
+import time
+from datetime import date
+
+from controllers.destino_controller import DestinoController
+from controllers.pessoa_controller import PessoaController
+from controllers.travas import TravasListradas
+from controllers.viagem_controller import ViagemController
+from exceptions import ConflitoVersaoException
+
+OPERACOES_POR_THREAD = 200
+FRACOES_ESCRITA = (0.05, 0.2, 0.5)
+
+
+def _preparar(quantidade: int):
+    destino_controller = DestinoController()
+    viagem_controller = ViagemController(PessoaController(), destino_controller)
+    destino_id = destino_controller.criar({'nome': 'Destino', 'cidade': 'Cidade', 'pais': 'Brasil'})
+    viagens = [viagem_controller.criar({
+        'titulo': f'Viagem {i}',
+        'data_inicio': date(2030, 1, 1),
+        'data_fim': date(2030, 1, 8),
+        'destino_ids': [destino_id],
+        'valor_total': 0.0
+    }) for i in range(quantidade)]
+    return viagem_controller, viagens
+
+
+def _rodar(modo: str, threads: int, quantidade: int, pensar: float, fracao_escrita: float):
+    viagem_controller, viagens = _preparar(quantidade)
+    travas = TravasListradas(quantidade)
+    escritas = [0] * threads
+    conflitos = [0] * threads
+
+    def operar(viagem_id: str, escrever: bool) -> bool:
+        viagem = viagem_controller.buscar_por_id(viagem_id)
+        versao = viagem_controller.versao(viagem_id)
+        valor = viagem.valor_total
+        time.sleep(pensar)
+        if escrever:
+            viagem_controller.atualizar(viagem_id, {'valor_total': valor + 1},
+                                        versao if modo == 'otimista' else None)
+        return escrever
+
+    def trabalhar(indice: int):
+        aleatorio = random.Random(indice)
+        for _ in range(OPERACOES_POR_THREAD):
+            posicao = aleatorio.randrange(quantidade)
+            escrever = aleatorio.random() < fracao_escrita
+            if modo == 'pessimista':
+                with travas.trava(posicao):
+                    escritas[indice] += operar(viagens[posicao], escrever)
+                continue
+            while True:
+                try:
+                    escritas[indice] += operar(viagens[posicao], escrever)
+                    break
+                except ConflitoVersaoException:
+                    conflitos[indice] += 1
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(i,)) for i in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    tempo = time.perf_counter() - inicio
+
+    total = sum(viagem_controller.buscar_por_id(viagem_id).valor_total for viagem_id in viagens)
+    assert total == sum(escritas), f"{modo}: {sum(escritas) - total:.0f} incrementos perdidos"
+    return threads * OPERACOES_POR_THREAD / tempo, sum(conflitos)
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    pensar = (float(sys.argv[3]) if len(sys.argv) > 3 else 1.0) / 1000
+
+    print(f"{threads} threads, {quantidade} viagens, {pensar * 1000:.1f}ms por operação, "
+          f"{OPERACOES_POR_THREAD} operações por thread")
+    for fracao_escrita in FRACOES_ESCRITA:
+        pessimista, _ = _rodar('pessimista', threads, quantidade, pensar, fracao_escrita)
+        otimista, conflitos = _rodar('otimista', threads, quantidade, pensar, fracao_escrita)
+        print(f"    {fracao_escrita:4.0%} escritas: pessimista {pessimista:7.0f} op/s, "
+              f"otimista {otimista:7.0f} op/s ({conflitos} conflitos refeitos)")
+
+
+if __name__ == "__main__":
+    main()
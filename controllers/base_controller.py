@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, TypeVar, Generic
+from typing import Dict, Any, List, Optional, TypeVar, Generic, MutableMapping, Callable, Iterable, Iterator, Tuple
 import uuid
+from contextlib import contextmanager
+from controllers.storage import StorageBackend, MemoryStorage
+from controllers.indices import ColecaoIndexada, DefinicaoIndice
+from controllers.consulta import Consulta
+from exceptions import ConflitoVersaoException
 
 T = TypeVar('T')
 
 class BaseController(ABC, Generic[T]):
-    def __init__(self):
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        self._storage = storage if storage is not None else MemoryStorage()
         self._dados: Dict[str, T] = {}
+        self._indices: Dict[str, ColecaoIndexada] = {}
+        self._principal: Optional[ColecaoIndexada] = None
     
     @abstractmethod
     def criar(self, dados: Dict[str, Any]) -> str:
@@ -20,11 +28,112 @@ class BaseController(ABC, Generic[T]):
     def listar_todos(self) -> List[T]:
         pass
     
-    def atualizar(self, entity_id: str, dados: Dict[str, Any]) -> bool:
+    def atualizar(self, entity_id: str, dados: Dict[str, Any],
+                  versao_esperada: Optional[int] = None) -> bool:
         return False
     
-    def deletar(self, entity_id: str) -> bool:
+    def deletar(self, entity_id: str, versao_esperada: Optional[int] = None) -> bool:
         return False
     
+    def versao(self, entity_id: str) -> Optional[int]:
+        """Versão atual da entidade, para ``versao_esperada``."""
+        return self._principal.versao(entity_id)
+    
+    @contextmanager
+    def _escrita(self, entity_id: str, versao_esperada: Optional[int]):
+        """Confere ``versao_esperada`` e segura a trava da coleção principal até a gravação."""
+        with self._principal.trava:
+            if versao_esperada is not None:
+                atual = self._principal.versao(entity_id)
+                if atual is not None and atual != versao_esperada:
+                    raise ConflitoVersaoException(entity_id, versao_esperada, atual)
+            yield
+    
+    def _colecao(self, nome: str,
+                 fabrica: Optional[Callable[[], MutableMapping]] = None,
+                 indices: Optional[Iterable[DefinicaoIndice]] = None) -> MutableMapping[str, Any]:
+        """Coleção ``nome`` do storage, indexada por ``indices``; a primeira aberta é a principal."""
+        colecao = self._storage.colecao(nome, fabrica)
+        if indices or self._principal is None:
+            colecao = ColecaoIndexada(colecao, indices or ())
+            for definicao in colecao.definicoes():
+                self._indices[definicao.nome] = colecao
+        if self._principal is None:
+            self._principal = colecao
+        return colecao
+    
+    def query(self) -> Consulta:
+        return Consulta(self._principal)
+    
+    def listar_pagina(self, cursor: Optional[int] = None, tamanho: int = 20) -> Tuple[List[T], Optional[int]]:
+        """Entidades da página e o cursor da próxima (``None`` na última)."""
+        if tamanho <= 0:
+            raise ValueError("O tamanho da página deve ser maior que zero")
+        return self._principal.pagina(cursor, tamanho)
+    
+    def contar_todos(self) -> int:
+        return len(self._principal)
+    
+    def iter_todos(self, tamanho_pagina: int = 500) -> Iterator[T]:
+        """Percorre a coleção principal por páginas, sem copiá-la."""
+        cursor = None
+        while True:
+            entidades, cursor = self.listar_pagina(cursor, tamanho_pagina)
+            yield from entidades
+            if cursor is None:
+                return
+    
+    def _indice(self, nome: str):
+        return self._indices[nome].indice(nome)
+    
+    def _consultar(self, nome: str, chave: Any) -> List[T]:
+        colecao = self._indices[nome]
+        with colecao.trava:
+            ids = colecao.indice(nome).buscar(colecao.definicao(nome).preparar(chave))
+            colecao.registrar_consulta(nome, bool(ids))
+            return colecao.entidades(ids)
+    
+    def _consultar_unico(self, nome: str, chave: Any) -> Optional[T]:
+        colecao = self._indices[nome]
+        with colecao.trava:
+            entidade_id = colecao.indice(nome).buscar(colecao.definicao(nome).preparar(chave))
+            colecao.registrar_consulta(nome, entidade_id is not None)
+            return None if entidade_id is None else colecao.get(entidade_id)
+    
+    def _consultar_intervalo(self, nome: str, minimo: Any = None, maximo: Any = None,
+                             incluir_minimo: bool = True, incluir_maximo: bool = True,
+                             ordem_do_indice: bool = False) -> List[T]:
+        """Com ``ordem_do_indice``, na ordem da chave em vez da ordem da coleção."""
+        colecao = self._indices[nome]
+        definicao = colecao.definicao(nome)
+        with colecao.trava:
+            ids = list(colecao.indice(nome).intervalo(definicao.preparar(minimo), definicao.preparar(maximo),
+                                                      incluir_minimo, incluir_maximo))
+            colecao.registrar_consulta(nome, bool(ids))
+            if ordem_do_indice:
+                return [colecao[entidade_id] for entidade_id in ids]
+            return colecao.entidades(ids)
+    
+    def _contar_intervalo(self, nome: str, minimo: Any = None, maximo: Any = None,
+                          incluir_minimo: bool = True, incluir_maximo: bool = True) -> int:
+        colecao = self._indices[nome]
+        definicao = colecao.definicao(nome)
+        with colecao.trava:
+            return colecao.indice(nome).contar_intervalo(definicao.preparar(minimo), definicao.preparar(maximo),
+                                                         incluir_minimo, incluir_maximo)
+    
+    def estatisticas_indices(self) -> Dict[str, Dict[str, Any]]:
+        """Tipo, tamanho, consultas e acertos de cada índice declarado."""
+        return {
+            nome: {
+                'tipo': definicao.tipo,
+                'tamanho': colecao.tamanho(nome),
+                'consultas': colecao.consultas[nome],
+                'acertos': colecao.acertos[nome]
+            }
+            for nome, colecao in self._indices.items()
+            for definicao in colecao.definicoes() if definicao.nome == nome
+        }
+    
     def _gerar_id(self) -> str:
         return str(uuid.uuid4())
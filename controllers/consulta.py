@@ -0,0 +1,334 @@
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from controllers.indices import (
+    ColecaoIndexada,
+    DefinicaoIndice,
+    INDICE_HASH,
+    INDICE_MULTIVALOR,
+    INDICE_ORDENADO,
+    INDICE_TRIGRAMAS,
+    INDICE_UNICO
+)
+from utils.texto import normalizar_texto
+
+OPERADORES = ('eq', 'ne', 'lt', 'lte', 'gt', 'gte', 'in', 'contains')
+_INDICES_IGUALDADE = (INDICE_HASH, INDICE_UNICO, INDICE_ORDENADO, INDICE_MULTIVALOR)
+
+Limite = Optional[Tuple[Any, bool]]
+
+
+class _Condicao:
+    """Filtro ``campo__operador=valor`` sobre um índice ou atributo (``pessoa__id``)."""
+
+    def __init__(self, campo: str, operador: str, valor: Any, definicao: Optional[DefinicaoIndice]):
+        self.campo = campo
+        self.operador = operador
+        self.definicao = definicao
+        pelo_nome = definicao is not None and definicao.nome == campo
+        self.multivalor = pelo_nome and definicao.tipo == INDICE_MULTIVALOR
+
+        if operador == 'contains':
+            self.valor = self.chave_indice = normalizar_texto(valor)
+        elif definicao is None:
+            self.valor = self.chave_indice = valor
+        else:
+            if operador == 'in':
+                self.chave_indice = [definicao.preparar(item) for item in valor]
+            else:
+                self.chave_indice = definicao.preparar(valor)
+            self.valor = self.chave_indice if pelo_nome else valor
+            if operador in ('eq', 'ne', 'in'):
+                self._conferir_chaves(self.chave_indice if operador == 'in' else [self.chave_indice])
+
+        self._extrair = definicao.chave if pelo_nome else attrgetter(campo.replace('__', '.'))
+
+    def _conferir_chaves(self, chaves: Iterable[Any]):
+        # Chaves de índice são buscadas em dicts: um objeto sem hash (uma
+        # entidade no lugar do id dela, por exemplo) não tem como ser
+        # encontrado nem comparado com as chaves guardadas.
+        for chave in chaves:
+            try:
+                hash(chave)
+            except TypeError:
+                raise ValueError(f"Valor inválido para {self.campo}: {chave!r}; "
+                                 f"informe o identificador (ex.: o id da entidade)") from None
+
+    def aceita(self, entidade: Any) -> bool:
+        atual = self._extrair(entidade)
+        if self.multivalor:
+            if self.operador == 'ne':
+                return all(item != self.valor for item in atual)
+            return any(self._comparar(item) for item in atual)
+        return self._comparar(atual)
+
+    def _comparar(self, atual: Any) -> bool:
+        operador, valor = self.operador, self.valor
+        if operador == 'eq':
+            return atual == valor
+        if operador == 'ne':
+            return atual != valor
+        if operador == 'in':
+            return atual in valor
+        if atual is None:
+            return False
+        if operador == 'contains':
+            return valor in normalizar_texto(atual)
+        if operador == 'lt':
+            return atual < valor
+        if operador == 'lte':
+            return atual <= valor
+        if operador == 'gt':
+            return atual > valor
+        return atual >= valor
+
+
+class _Acesso:
+    """Caminho de acesso escolhido pelo planejador: de onde vêm os ids e quantos se espera."""
+
+    def __init__(self, tipo: str, indice: Optional[str], estimativa: int,
+                 ids: Callable[[], Iterable[str]], ordenado: bool = False):
+        self.tipo = tipo
+        self.indice = indice
+        self.estimativa = estimativa
+        self.ids = ids
+        self.ordenado = ordenado
+
+
+class Consulta:
+    """
+    Consulta composta sobre a coleção principal de um controlador:
+
+        viagens.query().where(data_fim__gte=hoje).where(destino=destino_id) \\
+            .order_by('data_inicio').limit(50)
+
+    Parte do índice mais seletivo (ou varre) e confere as demais condições.
+    """
+
+    def __init__(self, colecao: MutableMapping):
+        self._colecao = colecao
+        self._condicoes: List[_Condicao] = []
+        self._ordenacao: List[Tuple[str, bool]] = []
+        self._limite: Optional[int] = None
+
+    def _copiar(self) -> 'Consulta':
+        copia = Consulta(self._colecao)
+        copia._condicoes = list(self._condicoes)
+        copia._ordenacao = list(self._ordenacao)
+        copia._limite = self._limite
+        return copia
+
+    def _definicao(self, campo: str) -> Optional[DefinicaoIndice]:
+        if not isinstance(self._colecao, ColecaoIndexada):
+            return None
+        definicoes = self._colecao.definicoes()
+        caminho = campo.replace('__', '.')
+        for definicao in definicoes:
+            if definicao.nome == campo:
+                return definicao
+        for definicao in definicoes:
+            if definicao.campo == caminho and definicao.tipo != INDICE_MULTIVALOR:
+                return definicao
+        return None
+
+    def where(self, **condicoes: Any) -> 'Consulta':
+        """Condições ``campo=valor`` ou ``campo__operador=valor`` (eq, ne, lt, lte, gt, gte, in, contains)."""
+        copia = self._copiar()
+        for expressao, valor in condicoes.items():
+            campo, _, operador = expressao.rpartition('__')
+            if not campo or operador not in OPERADORES:
+                campo, operador = expressao, 'eq'
+            copia._condicoes.append(_Condicao(campo, operador, valor, copia._definicao(campo)))
+        return copia
+
+    def order_by(self, *campos: str) -> 'Consulta':
+        """Campos de ordenação; prefixo ``-`` para ordem decrescente."""
+        copia = self._copiar()
+        copia._ordenacao = [(campo.lstrip('-'), campo.startswith('-')) for campo in campos]
+        return copia
+
+    def limit(self, quantidade: int) -> 'Consulta':
+        if quantidade < 0:
+            raise ValueError("O limite deve ser maior ou igual a zero")
+        copia = self._copiar()
+        copia._limite = quantidade
+        return copia
+
+    def _limites(self, nome: str) -> Tuple[Limite, Limite]:
+        """Limites mais restritivos das condições de intervalo sobre o índice ``nome``."""
+        minimo = maximo = None
+        for condicao in self._condicoes:
+            if condicao.definicao is None or condicao.definicao.nome != nome:
+                continue
+            chave, operador = condicao.chave_indice, condicao.operador
+            if operador in ('gt', 'gte'):
+                if minimo is None or chave > minimo[0] or (chave == minimo[0] and operador == 'gt'):
+                    minimo = (chave, operador == 'gte')
+            elif operador in ('lt', 'lte'):
+                if maximo is None or chave < maximo[0] or (chave == maximo[0] and operador == 'lt'):
+                    maximo = (chave, operador == 'lte')
+        return minimo, maximo
+
+    def _acesso_intervalo(self, nome: str, reverso: bool = False) -> _Acesso:
+        minimo, maximo = self._limites(nome)
+        estrutura = self._colecao.indice(nome)
+        argumentos = {
+            'minimo': minimo[0] if minimo else None,
+            'incluir_minimo': minimo[1] if minimo else True,
+            'maximo': maximo[0] if maximo else None,
+            'incluir_maximo': maximo[1] if maximo else True,
+        }
+        return _Acesso('intervalo', nome, estrutura.contar_intervalo(**argumentos),
+                       lambda: estrutura.intervalo(reverso=reverso, **argumentos), ordenado=True)
+
+    def _acessos(self) -> List[_Acesso]:
+        colecao = self._colecao
+        acessos = []
+        intervalos = []
+
+        for condicao in self._condicoes:
+            definicao = condicao.definicao
+            if definicao is None:
+                continue
+            nome, tipo, chave = definicao.nome, definicao.tipo, condicao.chave_indice
+
+            if condicao.operador == 'eq' and tipo in _INDICES_IGUALDADE:
+                estrutura = colecao.indice(nome)
+                if tipo == INDICE_UNICO:
+                    encontrado = estrutura.buscar(chave)
+                    ids = [] if encontrado is None else [encontrado]
+                    acessos.append(_Acesso('unico', nome, len(ids), lambda ids=ids: ids))
+                else:
+                    acessos.append(_Acesso(tipo, nome, estrutura.contar(chave),
+                                           lambda e=estrutura, c=chave: e.buscar(c)))
+            elif condicao.operador == 'in' and tipo in (INDICE_HASH, INDICE_ORDENADO, INDICE_MULTIVALOR):
+                estrutura = colecao.indice(nome)
+                chaves = list(dict.fromkeys(chave))
+                acessos.append(_Acesso(tipo, nome, sum(estrutura.contar(c) for c in chaves),
+                                       lambda e=estrutura, cs=chaves: dict.fromkeys(
+                                           i for c in cs for i in e.buscar(c))))
+            elif condicao.operador == 'contains' and tipo == INDICE_TRIGRAMAS:
+                ids = colecao.indice(nome).buscar(chave)
+                acessos.append(_Acesso('trigramas', nome, len(ids), lambda ids=ids: ids))
+            elif (condicao.operador in ('lt', 'lte', 'gt', 'gte') and tipo == INDICE_ORDENADO
+                  and definicao.nome == condicao.campo and nome not in intervalos):
+                intervalos.append(nome)
+
+        acessos.extend(self._acesso_intervalo(nome) for nome in intervalos)
+        return acessos
+
+    def _indice_de_ordenacao(self) -> Optional[Tuple[str, bool]]:
+        """Índice ordenado, com todas as entidades, que é a única ordenação pedida."""
+        if len(self._ordenacao) != 1 or not isinstance(self._colecao, ColecaoIndexada):
+            return None
+        campo, reverso = self._ordenacao[0]
+        definicao = self._definicao(campo)
+        if definicao is None or definicao.nome != campo or definicao.tipo != INDICE_ORDENADO:
+            return None
+        if len(self._colecao.indice(campo)) != len(self._colecao):
+            return None
+        return campo, reverso
+
+    def _planejar(self) -> _Acesso:
+        colecao = self._colecao
+        acessos = self._acessos() if isinstance(colecao, ColecaoIndexada) else []
+        escolhido = min(acessos, key=lambda acesso: acesso.estimativa, default=None)
+
+        ordenacao = self._indice_de_ordenacao()
+        if ordenacao is not None:
+            nome, reverso = ordenacao
+            if escolhido is None or (escolhido.tipo == 'intervalo' and escolhido.indice == nome):
+                return self._acesso_intervalo(nome, reverso)
+            # Com outro índice mais seletivo, os candidatos dele são
+            # ordenados em memória: percorrer o índice da ordenação até
+            # completar o limite pode examinar quase a coleção inteira
+            # quando o filtro e a ordem são correlacionados (datas).
+
+        if escolhido is None:
+            return _Acesso('varredura', None, len(colecao), colecao.keys)
+        escolhido.ordenado = False
+        if isinstance(colecao, ColecaoIndexada):
+            ids_do_indice = escolhido.ids
+            escolhido.ids = lambda: sorted(ids_do_indice(), key=colecao.sequencia)
+        return escolhido
+
+    def _ordenar_em_memoria(self, entidades: List[Any]) -> List[Any]:
+        # Ordenações estáveis da última chave para a primeira; valores
+        # None ficam sempre no fim.
+        for campo, reverso in reversed(self._ordenacao):
+            definicao = self._definicao(campo)
+            if definicao is not None and definicao.nome == campo:
+                extrair = definicao.chave
+            else:
+                extrair = attrgetter(campo.replace('__', '.'))
+            presentes = [entidade for entidade in entidades if extrair(entidade) is not None]
+            ausentes = [entidade for entidade in entidades if extrair(entidade) is None]
+            presentes.sort(key=extrair, reverse=reverso)
+            entidades = presentes + ausentes
+        return entidades
+
+    def _executar(self, plano: Dict[str, Any]) -> Iterator[Any]:
+        colecao = self._colecao
+        condicoes = self._condicoes
+        acesso = self._planejar()
+        ordem_do_indice = bool(self._ordenacao) and acesso.ordenado
+
+        plano.update({
+            'acesso': acesso.tipo,
+            'indice': acesso.indice,
+            'estimativa': acesso.estimativa,
+            'ordenacao': ('indice' if ordem_do_indice else 'memoria') if self._ordenacao else None,
+            'limite': self._limite,
+            'examinadas': 0,
+            'retornadas': 0,
+        })
+        if acesso.indice is not None:
+            colecao.registrar_consulta(acesso.indice, acesso.estimativa > 0)
+
+        def filtrar() -> Iterator[Any]:
+            for entidade_id in acesso.ids():
+                entidade = colecao.get(entidade_id)
+                if entidade is None:
+                    continue
+                plano['examinadas'] += 1
+                if all(condicao.aceita(entidade) for condicao in condicoes):
+                    yield entidade
+
+        resultados: Iterable[Any] = filtrar()
+        if self._ordenacao and not ordem_do_indice:
+            resultados = self._ordenar_em_memoria(list(resultados))
+        if self._limite is not None:
+            resultados = islice(resultados, self._limite)
+
+        for entidade in resultados:
+            plano['retornadas'] += 1
+            yield entidade
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._executar({})
+
+    def _trava(self):
+        return self._colecao.trava if isinstance(self._colecao, ColecaoIndexada) else nullcontext()
+
+    def all(self) -> List[Any]:
+        with self._trava():
+            return list(self)
+
+    def first(self) -> Optional[Any]:
+        with self._trava():
+            return next(iter(self.limit(1)), None)
+
+    def count(self) -> int:
+        with self._trava():
+            return sum(1 for _ in self)
+
+    def explain(self) -> Dict[str, Any]:
+        """Executa a consulta e devolve o plano, com as entidades examinadas e retornadas."""
+        plano: Dict[str, Any] = {}
+        with self._trava():
+            for _ in self._executar(plano):
+                pass
+        return plano
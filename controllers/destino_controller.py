@@ -1,13 +1,21 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, MutableMapping
 from controllers.base_controller import BaseController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_HASH, INDICE_UNICO
 from models.destino import Destino
 from exceptions import DestinaNaoEncontradoException, CampoObrigatorioException
+from utils.texto import normalizar_texto
 
 
 class DestinoController(BaseController[Destino]):
-    def __init__(self):
-        super().__init__()
-        self._destinos: Dict[str, Destino] = {}
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._destinos: MutableMapping[str, Destino] = self._colecao('destinos', indices=(
+            DefinicaoIndice('cidade', INDICE_HASH, 'cidade', normalizar=normalizar_texto),
+            DefinicaoIndice('pais', INDICE_HASH, 'pais', normalizar=normalizar_texto),
+            DefinicaoIndice('cidade_pais', INDICE_UNICO,
+                            lambda d: (normalizar_texto(d.cidade), normalizar_texto(d.pais)))
+        ))
     
     def criar(self, dados: Dict[str, Any]) -> str:
         try:
@@ -17,6 +25,10 @@ class DestinoController(BaseController[Destino]):
                 descricao=dados.get('descricao')
             )
             
+            chave = (normalizar_texto(destino.cidade), normalizar_texto(destino.pais))
+            if chave in self._indice('cidade_pais'):
+                raise ValueError(f"Destino já cadastrado: {destino.nome_completo()}")
+            
             self._destinos[destino.id] = destino
             return destino.id
             
@@ -35,26 +47,27 @@ class DestinoController(BaseController[Destino]):
     def listar_todos(self) -> List[Destino]:
         return list(self._destinos.values())
     
-    def atualizar(self, destino_id: str, dados: Dict[str, Any]) -> bool:
-        destino = self.buscar_por_id(destino_id)
-        if destino is None:
-            return False
-        
-        if 'descricao' in dados:
-            destino.descricao = dados['descricao']
-        
-        return True
-    
-    def deletar(self, destino_id: str) -> bool:
-        if destino_id in self._destinos:
-            del self._destinos[destino_id]
+    def atualizar(self, destino_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(destino_id, versao_esperada):
+            destino = self.buscar_por_id(destino_id)
+            if destino is None:
+                return False
+            
+            if 'descricao' in dados:
+                destino.descricao = dados['descricao']
+            
+            self._destinos[destino_id] = destino
             return True
-        return False
+    
+    def deletar(self, destino_id: str, versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(destino_id, versao_esperada):
+            if destino_id in self._destinos:
+                del self._destinos[destino_id]
+                return True
+            return False
     
     def buscar_por_cidade(self, cidade: str) -> List[Destino]:
-        return [d for d in self._destinos.values() 
-                if d.cidade.lower() == cidade.lower()]
+        return self._consultar('cidade', cidade)
     
     def buscar_por_pais(self, pais: str) -> List[Destino]:
-        return [d for d in self._destinos.values() 
-                if d.pais.lower() == pais.lower()]
+        return self._consultar('pais', pais)
@@ -1,5 +1,9 @@
-from typing import Dict, Any, List, Optional
+import copy
+import re
+from typing import Dict, Any, Iterable, List, Optional, MutableMapping
 from controllers.base_controller import BaseController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_UNICO, INDICE_TRIGRAMAS
 from models.empresa import Empresa
 from exceptions import (
     EmpresaNaoEncontradaException,
@@ -7,33 +11,68 @@ from exceptions import (
 )
 
 
+_NAO_DIGITOS = re.compile(r'\D')
+
+
 class EmpresaController(BaseController[Empresa]):
 
     
-    def __init__(self):
-        super().__init__()
-        self._empresas: Dict[str, Empresa] = {}
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._empresas: MutableMapping[str, Empresa] = self._colecao('empresas', indices=(
+            DefinicaoIndice('cnpj', INDICE_UNICO, 'cnpj', normalizar=self._normalizar_cnpj),
+            DefinicaoIndice('nome', INDICE_TRIGRAMAS, 'nome', sob_demanda=True)
+        ))
     
-    def criar(self, dados: Dict[str, Any]) -> str:
-
+    @staticmethod
+    def _normalizar_cnpj(cnpj: str) -> str:
+        """Só os dígitos do CNPJ."""
+        digitos = _NAO_DIGITOS.sub('', cnpj)
+        return digitos or cnpj.strip()
+    
+    def _montar(self, dados: Dict[str, Any]) -> Empresa:
         try:
-            empresa = Empresa(
+            return Empresa(
                 nome=dados['nome'],
                 cnpj=dados['cnpj'],
                 telefone=dados['telefone']
             )
+        except KeyError as e:
+            raise CampoObrigatorioException(str(e))
+    
+    def criar(self, dados: Dict[str, Any]) -> str:
+
+        empresa = self._montar(dados)
+        
+        if self._normalizar_cnpj(empresa.cnpj) in self._indice('cnpj'):
+            raise ValueError(f"Já existe uma empresa cadastrada com o CNPJ {empresa.cnpj}")
+        
+        self._empresas[empresa.id] = empresa
+        return empresa.id
+    
+    def criar_lote(self, lista_dados: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Linhas rejeitadas vão para 'erros', pela posição da linha, sem interromper o lote."""
+        ids: List[str] = []
+        erros: Dict[int, str] = {}
+        
+        for linha, dados in enumerate(lista_dados):
+            try:
+                empresa = self._montar(dados)
+            except (CampoObrigatorioException, ValueError, AttributeError, TypeError) as e:
+                erros[linha] = str(e)
+                continue
             
-            for emp in self._empresas.values():
-                if emp.cnpj == empresa.cnpj:
-                    raise ValueError(f"Já existe uma empresa cadastrada com o CNPJ {empresa.cnpj}")
+            if self._normalizar_cnpj(empresa.cnpj) in self._indice('cnpj'):
+                erros[linha] = f"Já existe uma empresa cadastrada com o CNPJ {empresa.cnpj}"
+                continue
             
             self._empresas[empresa.id] = empresa
-            return empresa.id
-            
-        except KeyError as e:
-            raise CampoObrigatorioException(str(e))
-        except ValueError:
-            raise
+            ids.append(empresa.id)
+        
+        return {
+            'ids': ids,
+            'erros': erros
+        }
     
     def buscar_por_id(self, empresa_id: str) -> Optional[Empresa]:
 
@@ -48,52 +87,56 @@ class EmpresaController(BaseController[Empresa]):
     
     def buscar_por_cnpj(self, cnpj: str) -> Optional[Empresa]:
 
-        for empresa in self._empresas.values():
-            if empresa.cnpj == cnpj:
-                return empresa
-        return None
+        return self._consultar_unico('cnpj', cnpj)
     
     def buscar_por_nome(self, nome: str) -> List[Empresa]:
 
-        nome_lower = nome.lower()
-        return [emp for emp in self._empresas.values() 
-                if nome_lower in emp.nome.lower()]
+        return self._consultar('nome', nome)
     
     def listar_todos(self) -> List[Empresa]:
 
         return list(self._empresas.values())
     
-    def atualizar(self, empresa_id: str, dados: Dict[str, Any]) -> bool:
+    def atualizar(self, empresa_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
 
-        empresa = self.buscar_por_id(empresa_id)
-        if empresa is None:
-            return False
-        
-        try:
-            if 'nome' in dados:
-                empresa.nome = dados['nome']
+        with self._escrita(empresa_id, versao_esperada):
+            empresa = self.buscar_por_id(empresa_id)
+            if empresa is None:
+                return False
             
-            if 'cnpj' in dados:
-                novo_cnpj = dados['cnpj'].strip()
-                for emp_id, emp in self._empresas.items():
-                    if emp_id != empresa_id and emp.cnpj == novo_cnpj:
+            try:
+                if 'cnpj' in dados:
+                    novo_cnpj = dados['cnpj'].strip()
+                    if self._indice('cnpj').conflita(self._normalizar_cnpj(novo_cnpj), empresa_id):
                         raise ValueError(f"Já existe uma empresa cadastrada com o CNPJ {novo_cnpj}")
-                empresa.cnpj = novo_cnpj
-            
-            if 'telefone' in dados:
-                empresa.telefone = dados['telefone']
-            
-            return True
-            
-        except ValueError:
-            raise
+                
+                # Os setters validam cada campo; aplicados numa cópia, um
+                # campo inválido não deixa a empresa alterada pela metade.
+                atualizada = copy.copy(empresa)
+                
+                if 'nome' in dados:
+                    atualizada.nome = dados['nome']
+                
+                if 'cnpj' in dados:
+                    atualizada.cnpj = dados['cnpj'].strip()
+                
+                if 'telefone' in dados:
+                    atualizada.telefone = dados['telefone']
+                
+                vars(empresa).update(vars(atualizada))
+                self._empresas[empresa_id] = empresa
+                return True
+                
+            except ValueError:
+                raise
     
-    def deletar(self, empresa_id: str) -> bool:
+    def deletar(self, empresa_id: str, versao_esperada: Optional[int] = None) -> bool:
 
-        if empresa_id in self._empresas:
-            del self._empresas[empresa_id]
-            return True
-        return False
+        with self._escrita(empresa_id, versao_esperada):
+            if empresa_id in self._empresas:
+                del self._empresas[empresa_id]
+                return True
+            return False
     
     def contar_total(self) -> int:
 
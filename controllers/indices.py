@@ -0,0 +1,598 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import MutableMapping
+from itertools import islice, repeat
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from utils.texto import normalizar_texto
+
+INDICE_HASH = 'hash'
+INDICE_UNICO = 'unico'
+INDICE_ORDENADO = 'ordenado'
+INDICE_MULTIVALOR = 'multivalor'
+INDICE_TRIGRAMAS = 'trigramas'
+
+
+class IndiceHash:
+    """Chave -> ids, na ordem em que foram indexados."""
+
+    def __init__(self):
+        self._entradas: Dict[Hashable, Dict[str, None]] = {}
+
+    def adicionar(self, chave: Hashable, entidade_id: str):
+        ids = self._entradas.get(chave)
+        if ids is None:
+            ids = self._entradas[chave] = {}
+        ids[entidade_id] = None
+
+    def remover(self, chave: Hashable, entidade_id: str):
+        ids = self._entradas.get(chave)
+        if ids is None:
+            return
+        ids.pop(entidade_id, None)
+        if not ids:
+            del self._entradas[chave]
+
+    def buscar(self, chave: Hashable) -> List[str]:
+        return list(self._entradas.get(chave, ()))
+
+    def contar(self, chave: Hashable) -> int:
+        return len(self._entradas.get(chave, ()))
+
+    def chaves(self) -> Iterator[Hashable]:
+        return iter(self._entradas)
+
+    def limpar(self):
+        self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class IndiceMultivalor(IndiceHash):
+    """
+    Índice hash em que cada entidade tem várias chaves (ex.: os ids dos
+    participantes de uma viagem); a entidade aparece na busca de cada uma.
+    """
+
+    def adicionar(self, chaves: Iterable[Hashable], entidade_id: str):
+        for chave in chaves:
+            super().adicionar(chave, entidade_id)
+
+    def remover(self, chaves: Iterable[Hashable], entidade_id: str):
+        for chave in chaves:
+            super().remover(chave, entidade_id)
+
+    def substituir(self, antigas: Tuple[Hashable, ...], novas: Tuple[Hashable, ...], entidade_id: str):
+        """
+        Troca as chaves da entidade mexendo só nas que mudaram, para que
+        incluir um participante numa viagem grande não reindexe todos.
+        """
+        antigas, novas = set(antigas), set(novas)
+        self.remover(antigas - novas, entidade_id)
+        self.adicionar(novas - antigas, entidade_id)
+
+
+class IndiceUnico:
+    """Chave -> id; quem indexa confere ``conflita`` antes de ``adicionar``."""
+
+    def __init__(self):
+        self._entradas: Dict[Hashable, str] = {}
+
+    def adicionar(self, chave: Hashable, entidade_id: str):
+        self._entradas[chave] = entidade_id
+
+    def remover(self, chave: Hashable, entidade_id: str):
+        if self._entradas.get(chave) == entidade_id:
+            del self._entradas[chave]
+
+    def buscar(self, chave: Hashable) -> Optional[str]:
+        return self._entradas.get(chave)
+
+    def conflita(self, chave: Hashable, entidade_id: Optional[str] = None) -> bool:
+        atual = self._entradas.get(chave)
+        return atual is not None and atual != entidade_id
+
+    def chaves(self) -> Iterator[Hashable]:
+        return iter(self._entradas)
+
+    def limpar(self):
+        self._entradas.clear()
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._entradas
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class IndiceOrdenado:
+    """
+    Chaves em blocos de listas paralelas mantidas com ``bisect``: inserir
+    ou remover só desloca um bloco. Chaves ``None`` ficam de fora.
+    """
+
+    CARGA = 1000
+
+    def __init__(self):
+        self._blocos_chaves: List[List[Any]] = []
+        self._blocos_ids: List[List[str]] = []
+        self._maximos: List[Any] = []
+        self._tamanho = 0
+
+    def adicionar(self, chave: Any, entidade_id: str):
+        if chave is None:
+            return
+        if not self._maximos:
+            self._blocos_chaves.append([chave])
+            self._blocos_ids.append([entidade_id])
+            self._maximos.append(chave)
+            self._tamanho = 1
+            return
+
+        bloco = min(bisect_right(self._maximos, chave), len(self._maximos) - 1)
+        chaves = self._blocos_chaves[bloco]
+        ids = self._blocos_ids[bloco]
+        posicao = bisect_right(chaves, chave)
+        chaves.insert(posicao, chave)
+        ids.insert(posicao, entidade_id)
+        self._maximos[bloco] = chaves[-1]
+        self._tamanho += 1
+
+        if len(chaves) > 2 * self.CARGA:
+            self._blocos_chaves.insert(bloco + 1, chaves[self.CARGA:])
+            self._blocos_ids.insert(bloco + 1, ids[self.CARGA:])
+            del chaves[self.CARGA:]
+            del ids[self.CARGA:]
+            self._maximos.insert(bloco, chaves[-1])
+
+    def estender(self, chaves: List[Any], ids: List[str]):
+        """Acrescenta chaves ordenadas, não menores que a maior do índice, direto no fim."""
+        if self._maximos and len(self._blocos_chaves[-1]) < self.CARGA:
+            espaco = self.CARGA - len(self._blocos_chaves[-1])
+            self._blocos_chaves[-1].extend(chaves[:espaco])
+            self._blocos_ids[-1].extend(ids[:espaco])
+            self._maximos[-1] = self._blocos_chaves[-1][-1]
+            chaves, ids = chaves[espaco:], ids[espaco:]
+        for inicio in range(0, len(chaves), self.CARGA):
+            self._blocos_chaves.append(chaves[inicio:inicio + self.CARGA])
+            self._blocos_ids.append(ids[inicio:inicio + self.CARGA])
+            self._maximos.append(self._blocos_chaves[-1][-1])
+        self._tamanho += len(ids)
+
+    def remover(self, chave: Any, entidade_id: str):
+        if chave is None:
+            return
+        # Chaves iguais podem se estender por mais de um bloco.
+        for bloco in range(bisect_left(self._maximos, chave), len(self._maximos)):
+            chaves = self._blocos_chaves[bloco]
+            if chaves[0] > chave:
+                return
+            ids = self._blocos_ids[bloco]
+            inicio = bisect_left(chaves, chave)
+            for posicao in range(inicio, bisect_right(chaves, chave, inicio)):
+                if ids[posicao] == entidade_id:
+                    del chaves[posicao]
+                    del ids[posicao]
+                    self._tamanho -= 1
+                    if chaves:
+                        self._maximos[bloco] = chaves[-1]
+                    else:
+                        del self._blocos_chaves[bloco]
+                        del self._blocos_ids[bloco]
+                        del self._maximos[bloco]
+                    return
+
+    def _posicao(self, chave: Any, direita: bool) -> Tuple[int, int]:
+        """
+        Posição (bloco, índice no bloco) equivalente a ``bisect_left`` ou,
+        com ``direita``, ``bisect_right`` sobre todas as chaves.
+        """
+        busca = bisect_right if direita else bisect_left
+        bloco = busca(self._maximos, chave)
+        if bloco == len(self._maximos):
+            return self._fim()
+        return bloco, busca(self._blocos_chaves[bloco], chave)
+
+    def _fim(self) -> Tuple[int, int]:
+        if not self._maximos:
+            return 0, 0
+        return len(self._maximos) - 1, len(self._blocos_chaves[-1])
+
+    def _limites(self, minimo: Any, maximo: Any,
+                 incluir_minimo: bool, incluir_maximo: bool) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        inicio = (0, 0) if minimo is None else self._posicao(minimo, not incluir_minimo)
+        fim = self._fim() if maximo is None else self._posicao(maximo, incluir_maximo)
+        return inicio, max(fim, inicio)
+
+    def _fatias(self, inicio: Tuple[int, int], fim: Tuple[int, int]) -> Iterator[List[str]]:
+        if not self._maximos:
+            return
+        (bloco_inicio, posicao_inicio), (bloco_fim, posicao_fim) = inicio, fim
+        for bloco in range(bloco_inicio, bloco_fim + 1):
+            ids = self._blocos_ids[bloco]
+            yield ids[posicao_inicio if bloco == bloco_inicio else 0:
+                      posicao_fim if bloco == bloco_fim else len(ids)]
+
+    def buscar(self, chave: Any) -> List[str]:
+        resultado = []
+        for ids in self._fatias(*self._limites(chave, chave, True, True)):
+            resultado.extend(ids)
+        return resultado
+
+    def contar(self, chave: Any) -> int:
+        return self.contar_intervalo(chave, chave)
+
+    def intervalo(self, minimo: Any = None, maximo: Any = None,
+                  incluir_minimo: bool = True, incluir_maximo: bool = True,
+                  reverso: bool = False) -> Iterator[str]:
+        """
+        Ids com chave entre ``minimo`` e ``maximo`` (``None`` = sem limite),
+        em ordem crescente de chave ou decrescente com ``reverso``.
+        """
+        fatias = self._fatias(*self._limites(minimo, maximo, incluir_minimo, incluir_maximo))
+        if not reverso:
+            return (entidade_id for ids in fatias for entidade_id in ids)
+        return (entidade_id for ids in reversed(list(fatias)) for entidade_id in reversed(ids))
+
+    def contar_intervalo(self, minimo: Any = None, maximo: Any = None,
+                         incluir_minimo: bool = True, incluir_maximo: bool = True) -> int:
+        (bloco_inicio, posicao_inicio), (bloco_fim, posicao_fim) = self._limites(
+            minimo, maximo, incluir_minimo, incluir_maximo)
+        if not self._maximos:
+            return 0
+        if bloco_inicio == bloco_fim:
+            return posicao_fim - posicao_inicio
+        meio = sum(len(self._blocos_ids[bloco]) for bloco in range(bloco_inicio + 1, bloco_fim))
+        return len(self._blocos_ids[bloco_inicio]) - posicao_inicio + meio + posicao_fim
+
+    def chaves(self) -> Iterator[Any]:
+        anterior = object()
+        for chaves in self._blocos_chaves:
+            for chave in chaves:
+                if chave != anterior:
+                    anterior = chave
+                    yield chave
+
+    def limpar(self):
+        self._blocos_chaves.clear()
+        self._blocos_ids.clear()
+        self._maximos.clear()
+        self._tamanho = 0
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+
+class IndiceTrigramas:
+    """Índice invertido de trigramas do texto normalizado, para buscas por substring."""
+
+    TAMANHO = 3
+    LISTAS_INTERSECTADAS = 3
+
+    def __init__(self):
+        self._textos: Dict[str, str] = {}
+        self._postagens: Dict[str, Dict[str, None]] = {}
+
+    @classmethod
+    def _trigramas(cls, texto: str) -> Set[str]:
+        return {texto[i:i + cls.TAMANHO] for i in range(len(texto) - cls.TAMANHO + 1)}
+
+    def adicionar(self, texto: str, entidade_id: str):
+        if entidade_id in self._textos:
+            self.remover(texto, entidade_id)
+
+        normalizado = normalizar_texto(texto)
+        self._textos[entidade_id] = normalizado
+        for trigrama in self._trigramas(normalizado):
+            ids = self._postagens.get(trigrama)
+            if ids is None:
+                ids = self._postagens[trigrama] = {}
+            ids[entidade_id] = None
+
+    def remover(self, texto: Optional[str], entidade_id: str):
+        normalizado = self._textos.pop(entidade_id, None)
+        if normalizado is None:
+            return
+        for trigrama in self._trigramas(normalizado):
+            ids = self._postagens[trigrama]
+            del ids[entidade_id]
+            if not ids:
+                del self._postagens[trigrama]
+
+    def buscar(self, consulta: str) -> List[str]:
+        consulta = normalizar_texto(consulta)
+        trigramas = self._trigramas(consulta)
+        if not trigramas:
+            return [entidade_id for entidade_id, texto in self._textos.items() if consulta in texto]
+
+        postagens = []
+        for trigrama in trigramas:
+            ids = self._postagens.get(trigrama)
+            if ids is None:
+                return []
+            postagens.append(ids)
+        postagens.sort(key=len)
+
+        # A verificação final é exata, então basta intersectar as listas
+        # mais seletivas; as demais custariam uma passada cada sem ganho.
+        candidatos = list(postagens[0])
+        for ids in postagens[1:self.LISTAS_INTERSECTADAS]:
+            if not candidatos:
+                return []
+            candidatos = list(filter(ids.__contains__, candidatos))
+
+        textos = self._textos
+        return [entidade_id for entidade_id in candidatos if consulta in textos[entidade_id]]
+
+    def limpar(self):
+        self._textos.clear()
+        self._postagens.clear()
+
+    def __contains__(self, entidade_id: object) -> bool:
+        return entidade_id in self._textos
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+
+_ESTRUTURAS = {
+    INDICE_HASH: IndiceHash,
+    INDICE_UNICO: IndiceUnico,
+    INDICE_ORDENADO: IndiceOrdenado,
+    INDICE_MULTIVALOR: IndiceMultivalor,
+    INDICE_TRIGRAMAS: IndiceTrigramas,
+}
+
+
+class DefinicaoIndice:
+    """
+    Nome, tipo e chave (caminho de atributo ou função) de um índice.
+    ``normalizar`` vale para o valor da entidade e para o procurado;
+    índices ``sob_demanda`` só são construídos na primeira consulta.
+    """
+
+    def __init__(self, nome: str, tipo: str, chave: Union[str, Callable[[Any], Any]],
+                 normalizar: Optional[Callable[[Any], Any]] = None,
+                 sob_demanda: bool = False):
+        if tipo not in _ESTRUTURAS:
+            raise ValueError(f"Tipo de índice inválido: {tipo}")
+        self.nome = nome
+        self.tipo = tipo
+        self.campo = chave if isinstance(chave, str) else None
+        self.sob_demanda = sob_demanda and tipo != INDICE_UNICO
+        self._extrair = attrgetter(chave) if isinstance(chave, str) else chave
+        self._normalizar = normalizar
+        if tipo != INDICE_MULTIVALOR and normalizar is None:
+            self.chave = self._extrair
+
+    def preparar(self, valor: Any) -> Any:
+        if self._normalizar is None or valor is None:
+            return valor
+        return self._normalizar(valor)
+
+    def chave(self, entidade: Any) -> Any:
+        valor = self._extrair(entidade)
+        if self.tipo == INDICE_MULTIVALOR:
+            if self._normalizar is not None:
+                valor = (self.preparar(item) for item in valor)
+            return tuple(dict.fromkeys(valor))
+        return self.preparar(valor)
+
+    def criar_estrutura(self):
+        return _ESTRUTURAS[self.tipo]()
+
+
+class ColecaoIndexada(MutableMapping):
+    """
+    Mantém, sob ``trava``, os índices, a sequência (ordem e cursor) e a
+    versão de cada entidade de outra coleção a cada gravação e remoção.
+    """
+
+    def __init__(self, base: MutableMapping, definicoes: Iterable[DefinicaoIndice]):
+        self._base = base
+        self._definicoes = list(definicoes)
+        self._estruturas = {definicao.nome: None if definicao.sob_demanda else definicao.criar_estrutura()
+                            for definicao in self._definicoes}
+        self._posicoes_unicas = [posicao for posicao, definicao in enumerate(self._definicoes)
+                                 if definicao.tipo == INDICE_UNICO]
+        self._entradas: Dict[str, Tuple[int, Tuple[Any, ...]]] = {}
+        self._versoes: Dict[str, int] = {}
+        self._ordem = IndiceOrdenado()
+        self._proxima_sequencia = 0
+        self.consultas: Dict[str, int] = dict.fromkeys(self._estruturas, 0)
+        self.acertos: Dict[str, int] = dict.fromkeys(self._estruturas, 0)
+        self.trava = threading.RLock()
+        self._gravar_com_chaves = getattr(base, 'gravar_com_chaves', None)
+
+        chaves_indexadas = getattr(base, 'chaves_indexadas', None)
+        if chaves_indexadas is None:
+            for entidade_id, entidade in base.items():
+                self._indexar(entidade_id, self._chaves(entidade), None)
+        else:
+            for entidade_id, chaves in chaves_indexadas([definicao.nome for definicao in self._definicoes]):
+                if chaves is None:
+                    # Gravada sem as chaves (banco antigo ou índice novo):
+                    # calcula e regrava para a próxima abertura.
+                    entidade = base[entidade_id]
+                    chaves = self._chaves(entidade)
+                    self._gravar_base(entidade_id, entidade, chaves)
+                self._indexar(entidade_id, chaves, None)
+
+    @property
+    def base(self) -> MutableMapping:
+        return self._base
+
+    def _chaves(self, entidade: Any) -> Tuple[Any, ...]:
+        return tuple(definicao.chave(entidade) for definicao in self._definicoes)
+
+    def _gravar_base(self, entidade_id: str, entidade: Any, chaves: Tuple[Any, ...]):
+        if self._gravar_com_chaves is None:
+            self._base[entidade_id] = entidade
+        else:
+            self._gravar_com_chaves(entidade_id, entidade,
+                                    {definicao.nome: chave for definicao, chave in zip(self._definicoes, chaves)})
+
+    def _indexar(self, entidade_id: str, novas: Tuple[Any, ...],
+                 anterior: Optional[Tuple[int, Tuple[Any, ...]]]):
+        if anterior is None:
+            sequencia = self._proxima_sequencia
+            self._proxima_sequencia += 1
+            self._ordem.adicionar(sequencia, entidade_id)
+            for definicao, chave in zip(self._definicoes, novas):
+                estrutura = self._estruturas[definicao.nome]
+                if estrutura is not None:
+                    estrutura.adicionar(chave, entidade_id)
+        else:
+            sequencia, antigas = anterior
+            for definicao, antiga, nova in zip(self._definicoes, antigas, novas):
+                estrutura = self._estruturas[definicao.nome]
+                if estrutura is None or antiga == nova:
+                    continue
+                if definicao.tipo == INDICE_MULTIVALOR:
+                    estrutura.substituir(antiga, nova, entidade_id)
+                else:
+                    estrutura.remover(antiga, entidade_id)
+                    estrutura.adicionar(nova, entidade_id)
+        self._entradas[entidade_id] = (sequencia, novas)
+
+    def __getitem__(self, entidade_id: str) -> Any:
+        return self._base[entidade_id]
+
+    def __setitem__(self, entidade_id: str, entidade: Any):
+        novas = self._chaves(entidade)
+        with self.trava:
+            for posicao in self._posicoes_unicas:
+                definicao = self._definicoes[posicao]
+                if self._estruturas[definicao.nome].conflita(novas[posicao], entidade_id):
+                    raise ValueError(f"Valor duplicado no índice único {definicao.nome}: {novas[posicao]}")
+
+            versao = self.versao(entidade_id) or 0
+            self._gravar_base(entidade_id, entidade, novas)
+            self._indexar(entidade_id, novas, self._entradas.get(entidade_id))
+            self._versoes[entidade_id] = versao + 1
+
+    def indexar_lote(self, itens: Iterable[Tuple[str, Any]],
+                     chaves: Optional[List[Tuple[Any, ...]]] = None):
+        """Indexa ids já gravados direto na base; não confere índices únicos."""
+        ids, entidades = [], []
+        for entidade_id, entidade in itens:
+            ids.append(entidade_id)
+            entidades.append(entidade)
+        if chaves is None:
+            colunas = [[definicao.chave(entidade) for entidade in entidades] for definicao in self._definicoes]
+        else:
+            colunas = [list(coluna) for coluna in zip(*chaves)] or [[] for _ in self._definicoes]
+        with self.trava:
+            inicio = self._proxima_sequencia
+            sequencias = range(inicio, inicio + len(ids))
+            self._proxima_sequencia += len(ids)
+            self._ordem.estender(list(sequencias), ids)
+            for definicao, coluna in zip(self._definicoes, colunas):
+                estrutura = self._estruturas[definicao.nome]
+                if estrutura is not None:
+                    adicionar = estrutura.adicionar
+                    for chave, entidade_id in zip(coluna, ids):
+                        adicionar(chave, entidade_id)
+            if chaves is None:
+                chaves = zip(*colunas) if colunas else repeat(())
+            self._entradas.update(zip(ids, zip(sequencias, chaves)))
+
+    def gravar_lote(self, itens: List[Tuple[str, Any]], chaves: Optional[List[Tuple[Any, ...]]] = None):
+        """Grava e indexa ids novos de uma vez; não confere índices únicos."""
+        with self.trava:
+            if self._gravar_com_chaves is not None and chaves is None:
+                chaves = [self._chaves(entidade) for _, entidade in itens]
+            for posicao, (entidade_id, entidade) in enumerate(itens):
+                if chaves is None:
+                    self._base[entidade_id] = entidade
+                else:
+                    self._gravar_base(entidade_id, entidade, chaves[posicao])
+            self.indexar_lote(itens, chaves)
+
+    def __delitem__(self, entidade_id: str):
+        with self.trava:
+            del self._base[entidade_id]
+            self._versoes.pop(entidade_id, None)
+            entrada = self._entradas.pop(entidade_id, None)
+            if entrada is not None:
+                self._ordem.remover(entrada[0], entidade_id)
+                for definicao, chave in zip(self._definicoes, entrada[1]):
+                    estrutura = self._estruturas[definicao.nome]
+                    if estrutura is not None:
+                        estrutura.remover(chave, entidade_id)
+
+    def __contains__(self, entidade_id: object) -> bool:
+        return entidade_id in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._base)
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    def get(self, entidade_id: str, padrao: Any = None) -> Any:
+        return self._base.get(entidade_id, padrao)
+
+    def values(self):
+        return self._base.values()
+
+    def items(self):
+        return self._base.items()
+
+    def indice(self, nome: str):
+        estrutura = self._estruturas[nome]
+        if estrutura is None:
+            with self.trava:
+                estrutura = self._estruturas[nome] or self._construir(nome)
+        return estrutura
+
+    def _construir(self, nome: str):
+        definicao = self.definicao(nome)
+        posicao = self._definicoes.index(definicao)
+        estrutura = definicao.criar_estrutura()
+        for entidade_id in self._ordem.intervalo():
+            estrutura.adicionar(self._entradas[entidade_id][1][posicao], entidade_id)
+        self._estruturas[nome] = estrutura
+        return estrutura
+
+    def tamanho(self, nome: str) -> Optional[int]:
+        """Tamanho do índice, ou ``None`` se ele ainda não foi construído."""
+        estrutura = self._estruturas[nome]
+        return None if estrutura is None else len(estrutura)
+
+    def definicoes(self) -> List[DefinicaoIndice]:
+        return list(self._definicoes)
+
+    def definicao(self, nome: str) -> DefinicaoIndice:
+        return next(definicao for definicao in self._definicoes if definicao.nome == nome)
+
+    def registrar_consulta(self, nome: str, encontrou: bool):
+        self.consultas[nome] += 1
+        if encontrou:
+            self.acertos[nome] += 1
+
+    def sequencia(self, entidade_id: str) -> int:
+        return self._entradas[entidade_id][0]
+
+    def versao(self, entidade_id: str) -> Optional[int]:
+        """Versão atual da entidade, ou ``None`` se ela não está na coleção."""
+        versao = self._versoes.get(entidade_id)
+        if versao is None and entidade_id in self._entradas:
+            return 1
+        return versao
+
+    def pagina(self, cursor: Optional[int], tamanho: int) -> Tuple[List[Any], Optional[int]]:
+        """Entidades depois da sequência ``cursor`` e o cursor da próxima página, ou ``None``."""
+        with self.trava:
+            ids = list(islice(self._ordem.intervalo(minimo=cursor, incluir_minimo=False), tamanho + 1))
+            proximo = self._entradas[ids[tamanho - 1]][0] if len(ids) > tamanho else None
+            base = self._base
+            return [base[entidade_id] for entidade_id in ids[:tamanho]], proximo
+
+    def entidades(self, ids: Iterable[str]) -> List[Any]:
+        """Entidades dos ids informados, na ordem em que estão na coleção."""
+        with self.trava:
+            base = self._base
+            return [base[entidade_id] for entidade_id in sorted(ids, key=self.sequencia)]
@@ -0,0 +1,197 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from controllers.storage import StorageBackend, converter_colecao
+from controllers.snapshot import gravar_snapshot, ler_snapshot
+
+# Cabeçalho de cada registro: tamanho do payload, CRC32 do payload e LSN.
+_CABECALHO = struct.Struct('<IIQ')
+
+_OP_GRAVAR = 0
+_OP_REMOVER = 1
+
+FSYNC_SEMPRE = 'sempre'
+FSYNC_GRUPO = 'grupo'
+FSYNC_OS = 'os'
+POLITICAS_FSYNC = (FSYNC_SEMPRE, FSYNC_GRUPO, FSYNC_OS)
+
+
+class JournalColecao(MutableMapping):
+    def __init__(self, storage: 'JournalStorage', nome: str, dados: MutableMapping):
+        self._storage = storage
+        self._nome = nome
+        self._dados = dados
+
+    @property
+    def base(self) -> MutableMapping:
+        return self._dados
+
+    def __getitem__(self, entidade_id: str) -> Any:
+        return self._dados[entidade_id]
+
+    def __setitem__(self, entidade_id: str, entidade: Any):
+        self._dados[entidade_id] = entidade
+        self._storage._registrar(_OP_GRAVAR, self._nome, entidade_id, entidade)
+
+    def __delitem__(self, entidade_id: str):
+        del self._dados[entidade_id]
+        self._storage._registrar(_OP_REMOVER, self._nome, entidade_id, None)
+
+    def __contains__(self, entidade_id: object) -> bool:
+        return entidade_id in self._dados
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dados)
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+    def get(self, entidade_id: str, padrao: Any = None) -> Any:
+        return self._dados.get(entidade_id, padrao)
+
+    def values(self):
+        return self._dados.values()
+
+    def items(self):
+        return self._dados.items()
+
+
+class JournalStorage(StorageBackend):
+    """
+    Armazenamento em memória com journal append-only e snapshots
+    periódicos; ``politica_fsync`` é ``sempre``, ``grupo`` ou ``os``.
+    """
+
+    ARQUIVO_SNAPSHOT = 'snapshot.bin'
+    ARQUIVO_JOURNAL = 'journal.log'
+
+    def __init__(self, diretorio: str, politica_fsync: str = FSYNC_GRUPO,
+                 intervalo_grupo_ms: int = 10,
+                 compactar_a_cada: Optional[int] = 100000):
+        if politica_fsync not in POLITICAS_FSYNC:
+            raise ValueError(f"Política de fsync inválida: {politica_fsync}")
+
+        super().__init__()
+        os.makedirs(diretorio, exist_ok=True)
+        self._caminho_snapshot = os.path.join(diretorio, self.ARQUIVO_SNAPSHOT)
+        self._caminho_journal = os.path.join(diretorio, self.ARQUIVO_JOURNAL)
+        self._politica_fsync = politica_fsync
+        self._intervalo_grupo = intervalo_grupo_ms / 1000
+        self._compactar_a_cada = compactar_a_cada
+
+        self._lock = threading.Lock()
+        self._estado, self._lsn = self._recuperar()
+        self._registros_desde_snapshot = 0
+        self._pendente_fsync = False
+
+        self._journal = open(self._caminho_journal, 'ab')
+
+        self._parar = threading.Event()
+        self._thread_grupo: Optional[threading.Thread] = None
+        if politica_fsync == FSYNC_GRUPO:
+            self._thread_grupo = threading.Thread(target=self._laco_group_commit, daemon=True)
+            self._thread_grupo.start()
+
+    def _criar_colecao(self, nome: str,
+                       fabrica: Optional[Callable[[], MutableMapping]] = None) -> MutableMapping:
+        dados = converter_colecao(self._estado.get(nome), fabrica)
+        self._estado[nome] = dados
+        return JournalColecao(self, nome, dados)
+
+    @property
+    def lsn(self) -> int:
+        return self._lsn
+
+    def _recuperar(self) -> Tuple[Dict[str, MutableMapping], int]:
+        estado: Dict[str, MutableMapping] = {}
+        lsn_snapshot = 0
+        if os.path.exists(self._caminho_snapshot):
+            estado, lsn_snapshot = ler_snapshot(self._caminho_snapshot)
+
+        lsn = lsn_snapshot
+        if not os.path.exists(self._caminho_journal):
+            return estado, lsn
+
+        with open(self._caminho_journal, 'r+b') as arquivo:
+            conteudo = arquivo.read()
+            posicao = 0
+            while posicao + _CABECALHO.size <= len(conteudo):
+                tamanho, crc, lsn_registro = _CABECALHO.unpack_from(conteudo, posicao)
+                inicio = posicao + _CABECALHO.size
+                payload = conteudo[inicio:inicio + tamanho]
+                if len(payload) < tamanho or zlib.crc32(payload) != crc:
+                    break
+
+                posicao = inicio + tamanho
+                if lsn_registro <= lsn_snapshot:
+                    continue
+
+                operacao, nome, entidade_id, entidade = pickle.loads(payload)
+                colecao = estado.setdefault(nome, {})
+                if operacao == _OP_GRAVAR:
+                    colecao[entidade_id] = entidade
+                else:
+                    colecao.pop(entidade_id, None)
+                lsn = lsn_registro
+
+            if posicao < len(conteudo):
+                arquivo.truncate(posicao)
+
+        return estado, lsn
+
+    def _registrar(self, operacao: int, nome: str, entidade_id: str, entidade: Any):
+        payload = pickle.dumps((operacao, nome, entidade_id, entidade), pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._lsn += 1
+            self._journal.write(_CABECALHO.pack(len(payload), zlib.crc32(payload), self._lsn))
+            self._journal.write(payload)
+
+            if self._politica_fsync == FSYNC_SEMPRE:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            elif self._politica_fsync == FSYNC_OS:
+                self._journal.flush()
+            else:
+                self._pendente_fsync = True
+
+            self._registros_desde_snapshot += 1
+            compactar = (self._compactar_a_cada is not None and
+                         self._registros_desde_snapshot >= self._compactar_a_cada)
+
+        if compactar:
+            self.compactar()
+
+    def _laco_group_commit(self):
+        while not self._parar.wait(self._intervalo_grupo):
+            self.sincronizar()
+
+    def sincronizar(self):
+        with self._lock:
+            if self._journal.closed:
+                return
+            self._journal.flush()
+            if self._pendente_fsync:
+                os.fsync(self._journal.fileno())
+                self._pendente_fsync = False
+
+    def compactar(self):
+        with self._lock:
+            gravar_snapshot(self._caminho_snapshot, self._estado, self._lsn)
+            self._journal.close()
+            self._journal = open(self._caminho_journal, 'wb')
+            self._registros_desde_snapshot = 0
+            self._pendente_fsync = False
+
+    def fechar(self):
+        self._parar.set()
+        if self._thread_grupo is not None:
+            self._thread_grupo.join()
+        self.sincronizar()
+        with self._lock:
+            self._journal.close()
@@ -0,0 +1,100 @@
+import threading
+from typing import Dict, Iterable, List
+
+from controllers.travas import TravasListradas
+from models.pagamento import Pagamento
+
+
+class LivroPagamentos:
+    """
+    Totais pagos (``[total, quantidade]``) por viagem e por pessoa, reservas
+    de pagamentos aguardando o gateway e a trava de cada viagem.
+    """
+
+    def __init__(self, travas: int = 1024):
+        self._por_viagem: Dict[str, List] = {}
+        self._por_pessoa: Dict[str, List] = {}
+        self._reservas: Dict[str, List] = {}
+        self._trava = threading.Lock()
+        self._travas_viagem = TravasListradas(travas)
+
+    def trava_viagem(self, viagem_id: str) -> threading.RLock:
+        return self._travas_viagem.trava(viagem_id)
+
+    def carregar(self, pagamentos: Iterable[Pagamento]):
+        with self._trava:
+            self._por_viagem.clear()
+            self._por_pessoa.clear()
+            for pagamento in pagamentos:
+                self._somar(pagamento)
+
+    def registrar(self, pagamento: Pagamento):
+        with self._trava:
+            self._somar(pagamento)
+
+    def registrar_lote(self, pagamentos: Iterable[Pagamento]):
+        with self._trava:
+            for pagamento in pagamentos:
+                self._somar(pagamento)
+
+    def estornar(self, pagamento: Pagamento):
+        with self._trava:
+            self._descontar(self._por_viagem, pagamento.viagem_id, pagamento.valor)
+            self._descontar(self._por_pessoa, pagamento.pessoa_id, pagamento.valor)
+
+    def _somar(self, pagamento: Pagamento):
+        for totais, chave in ((self._por_viagem, pagamento.viagem_id), (self._por_pessoa, pagamento.pessoa_id)):
+            entrada = totais.get(chave)
+            if entrada is None:
+                totais[chave] = [pagamento.valor, 1]
+            else:
+                entrada[0] += pagamento.valor
+                entrada[1] += 1
+
+    @staticmethod
+    def _descontar(totais: Dict[str, List], chave: str, valor: float):
+        entrada = totais.get(chave)
+        if entrada is None:
+            return
+        if entrada[1] == 1:
+            del totais[chave]
+        else:
+            entrada[0] -= valor
+            entrada[1] -= 1
+
+    def reservar(self, viagem_id: str, valor: float):
+        with self._trava:
+            entrada = self._reservas.get(viagem_id)
+            if entrada is None:
+                self._reservas[viagem_id] = [valor, 1]
+            else:
+                entrada[0] += valor
+                entrada[1] += 1
+
+    def liberar(self, viagem_id: str, valor: float):
+        with self._trava:
+            self._descontar(self._reservas, viagem_id, valor)
+
+    def reservado(self, viagem_id: str) -> float:
+        entrada = self._reservas.get(viagem_id)
+        return 0.0 if entrada is None else entrada[0]
+
+    def tem_pagamentos(self, viagem_id: str) -> bool:
+        """Se a viagem tem pagamentos registrados ou aguardando autorização."""
+        return viagem_id in self._por_viagem or viagem_id in self._reservas
+
+    def total_por_viagem(self, viagem_id: str) -> float:
+        entrada = self._por_viagem.get(viagem_id)
+        return 0.0 if entrada is None else entrada[0]
+
+    def total_por_pessoa(self, pessoa_id: str) -> float:
+        entrada = self._por_pessoa.get(pessoa_id)
+        return 0.0 if entrada is None else entrada[0]
+
+    def totais_por_viagem(self) -> Dict[str, float]:
+        with self._trava:
+            return {chave: entrada[0] for chave, entrada in self._por_viagem.items()}
+
+    def totais_por_pessoa(self) -> Dict[str, float]:
+        with self._trava:
+            return {chave: entrada[0] for chave, entrada in self._por_pessoa.items()}
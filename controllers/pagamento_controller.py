@@ -1,65 +1,391 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+import math
+import operator
+import random
+import weakref
+from collections import namedtuple
+from contextlib import ExitStack
+from numbers import Real
+from itertools import compress, repeat
+from typing import Dict, Any, Iterable, List, Optional, MutableMapping, Tuple, Union
 from datetime import date
 from controllers.base_controller import BaseController
 from controllers.pessoa_controller import PessoaController
+from controllers.storage import StorageBackend
+from controllers.pagamento_store import PagamentoStore, novos_ids
+from controllers.livro_pagamentos import LivroPagamentos
+from controllers.indices import DefinicaoIndice, INDICE_HASH
 from models.pagamento import Pagamento
 from models.tipo_pagamento import TipoPagamento
+from services.gateway_pagamento import GatewayPagamento
+from models.registro_strategies import obter_strategy, tipos_registrados
+from utils.validacao_pagamento import analisar_cartoes, analisar_cpf, bandeira_confere, nome_bandeira
 from exceptions import (
     PagamentoInvalidoException,
     ValorInvalidoException,
     CampoObrigatorioException,
-    PagamentoExcedeSaldoException
+    PagamentoExcedeSaldoException,
+    PessoaNaoEncontradaException,
+    GatewayIndisponivelException
 )
 
+_AUSENTE = object()
+_TIPOS_POR_NOME = {tipo.value: tipo for tipo in TipoPagamento}
+_CAMPOS_OBRIGATORIOS = ('pessoa_id', 'valor', 'tipo', 'viagem_id', 'data')
+_CAMPOS_POR_TIPO = {
+    TipoPagamento.DINHEIRO: (),
+    TipoPagamento.PIX: ('cpf_pagador',),
+    TipoPagamento.CARTAO: ('bandeira', 'numero_cartao')
+}
+_LIMITE_DINHEIRO = 10000
+
+# Linha de um lote já validada: tem os atributos que os índices e o livro
+# de pagamentos leem de um Pagamento, sem construir o objeto.
+_LinhaLote = namedtuple('_LinhaLote', 'viagem_id pessoa_id valor')
+
+
+def _erro_de_tipo(dados: Dict[str, Any]) -> Optional[Exception]:
+    """Erro para campos presentes com o tipo errado (data em texto, valor em texto...)."""
+    for campo in ('pessoa_id', 'viagem_id'):
+        try:
+            hash(dados.get(campo))
+        except TypeError:
+            return ValueError(f"Identificador inválido em {campo}: {dados[campo]!r}")
+    valor = dados.get('valor', 0)
+    if not isinstance(valor, Real) or isinstance(valor, bool) or not math.isfinite(valor):
+        return ValorInvalidoException(valor, "Valor deve ser um número")
+    data = dados.get('data')
+    if data is not None and not isinstance(data, date):
+        return ValueError(f"Data do pagamento inválida: {data!r}")
+    return None
+
+
+def _resolver_tipo(nome: Any, registrados: Iterable[str]) -> Union[TipoPagamento, str, None]:
+    """O TipoPagamento do nome, o próprio nome para tipos registrados em ``registro_strategies``, ou None."""
+    if not isinstance(nome, str):
+        return None
+    nome = nome.lower().strip()
+    tipo = _TIPOS_POR_NOME.get(nome)
+    if tipo is None and nome in registrados:
+        return nome
+    return tipo
+
+
+def _detalhes_registrado(dados: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Dados específicos de um tipo registrado: os campos além dos obrigatórios, já ordenados."""
+    detalhes = tuple(sorted((campo, valor) for campo, valor in dados.items()
+                            if campo not in _CAMPOS_OBRIGATORIOS))
+    try:
+        hash(detalhes)
+    except TypeError:
+        raise PagamentoInvalidoException("Dados de pagamento inválidos") from None
+    return detalhes
+
 
 class PagamentoController(BaseController[Pagamento]):
-    def __init__(self, pessoa_controller: PessoaController, viagem_controller=None):
-        super().__init__()
-        self._pagamentos: Dict[str, Pagamento] = {}
+    def __init__(self, pessoa_controller: PessoaController, viagem_controller=None,
+                 storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        # O PagamentoStore já guarda as linhas de cada viagem e pessoa; os
+        # índices hash só são necessários nos outros backends.
+        indices = () if isinstance(self._storage.colecao('pagamentos', PagamentoStore), PagamentoStore) else (
+            DefinicaoIndice('viagem', INDICE_HASH, 'viagem_id'),
+            DefinicaoIndice('pessoa', INDICE_HASH, 'pessoa_id')
+        )
+        self._pagamentos: MutableMapping[str, Pagamento] = self._colecao('pagamentos', PagamentoStore, indices)
         self._pessoa_controller = pessoa_controller
         self._viagem_controller = viagem_controller
+        
+        self._livro = viagem_controller.livro_pagamentos if viagem_controller else LivroPagamentos()
+        self._livro.carregar(self._pagamentos.values())
+        self.configurar_gateway(None)
     
-    def criar(self, dados: Dict[str, Any]) -> str:
-        try:
-            self._pessoa_controller.buscar_por_id_obrigatorio(dados['pessoa_id'])
+    def configurar_gateway(self, gateway: Optional[GatewayPagamento], concorrencia: int = 100,
+                           timeout: float = 5.0, tentativas: int = 3, espera_inicial: float = 0.1):
+        """Gateway de ``criar_async``, com limite de concorrência, timeout e novas tentativas."""
+        if concorrencia <= 0 or tentativas <= 0:
+            raise ValueError("Concorrência e tentativas devem ser maiores que zero")
+        self._gateway = gateway
+        self._concorrencia = concorrencia
+        self._timeout = timeout
+        self._tentativas = tentativas
+        self._espera_inicial = espera_inicial
+        self._semaforos = weakref.WeakKeyDictionary()
+    
+    def _conferir_saldo(self, dados: Dict[str, Any]):
+        if self._viagem_controller and 'viagem_id' in dados:
+            viagem_id = dados['viagem_id']
+            saldo_devedor = (self._viagem_controller.calcular_saldo_devedor(viagem_id)
+                             - self._livro.reservado(viagem_id))
+            valor_pagamento = dados['valor']
             
-            if self._viagem_controller and 'viagem_id' in dados:
-                saldo_devedor = self._viagem_controller.calcular_saldo_devedor(dados['viagem_id'])
-                valor_pagamento = dados['valor']
+            if valor_pagamento > saldo_devedor:
+                raise PagamentoExcedeSaldoException(valor_pagamento, saldo_devedor)
+    
+    def _montar(self, dados: Dict[str, Any]) -> Pagamento:
+        self._pessoa_controller.buscar_por_id_obrigatorio(dados['pessoa_id'])
+        self._conferir_saldo(dados)
+        
+        tipo = _resolver_tipo(dados['tipo'], tipos_registrados())
+        if tipo is None:
+            raise ValueError(f"Tipo de pagamento inválido: {dados['tipo']}")
+        
+        dados_pagamento = {}
+        
+        if tipo == TipoPagamento.PIX:
+            dados_pagamento['cpf_pagador'] = dados['cpf_pagador']
+        elif tipo == TipoPagamento.CARTAO:
+            dados_pagamento['numero_cartao'] = dados['numero_cartao']
+            dados_pagamento['bandeira'] = dados['bandeira']
+        elif isinstance(tipo, str):
+            dados_pagamento.update(_detalhes_registrado(dados))
+        
+        return Pagamento(
+            data=dados['data'],
+            valor=dados['valor'],
+            pessoa_id=dados['pessoa_id'],
+            viagem_id=dados['viagem_id'],
+            tipo=tipo,
+            dados_pagamento=dados_pagamento
+        )
+    
+    def _gravar(self, pagamento: Pagamento):
+        self._pagamentos[pagamento.id] = pagamento
+        self._livro.registrar(pagamento)
+    
+    def criar(self, dados: Dict[str, Any]) -> str:
+        """Confere o saldo e grava sob a trava da viagem."""
+        erro = _erro_de_tipo(dados)
+        if erro is not None:
+            raise erro
+        with self._livro.trava_viagem(dados.get('viagem_id')):
+            try:
+                pagamento = self._montar(dados)
                 
-                if valor_pagamento > saldo_devedor:
-                    raise PagamentoExcedeSaldoException(valor_pagamento, saldo_devedor)
-            
-            tipo = dados['tipo'].lower()
-            tipo_enum = TipoPagamento.from_string(tipo)
-            
-            dados_pagamento = {}
-            
-            if tipo_enum == TipoPagamento.PIX:
-                dados_pagamento['cpf_pagador'] = dados['cpf_pagador']
-            elif tipo_enum == TipoPagamento.CARTAO:
-                dados_pagamento['numero_cartao'] = dados['numero_cartao']
-                dados_pagamento['bandeira'] = dados['bandeira']
-            
-            pagamento = Pagamento(
-                data=dados['data'],
-                valor=dados['valor'],
-                pessoa_id=dados['pessoa_id'],
-                viagem_id=dados['viagem_id'],
-                tipo=tipo_enum,
-                dados_pagamento=dados_pagamento
-            )
-            
-            if pagamento.processar_pagamento():
-                self._pagamentos[pagamento.id] = pagamento
-                return pagamento.id
-            else:
+                if pagamento.processar_pagamento():
+                    self._gravar(pagamento)
+                    return pagamento.id
+                else:
+                    raise PagamentoInvalidoException("Falha ao processar pagamento")
+                
+            except KeyError as e:
+                raise CampoObrigatorioException(str(e))
+            except (PagamentoInvalidoException, ValorInvalidoException, PagamentoExcedeSaldoException):
+                raise 
+    
+    async def criar_async(self, dados: Dict[str, Any]) -> str:
+        """Como ``criar``, com o valor reservado enquanto o gateway autoriza."""
+        erro = _erro_de_tipo(dados)
+        if erro is not None:
+            raise erro
+        with self._livro.trava_viagem(dados.get('viagem_id')):
+            try:
+                pagamento = self._montar(dados)
+            except KeyError as e:
+                raise CampoObrigatorioException(str(e))
+            self._livro.reservar(pagamento.viagem_id, pagamento.valor)
+        
+        try:
+            autorizado = await self._autorizar(pagamento)
+        except BaseException:
+            self._livro.liberar(pagamento.viagem_id, pagamento.valor)
+            raise
+        
+        with self._livro.trava_viagem(pagamento.viagem_id):
+            self._livro.liberar(pagamento.viagem_id, pagamento.valor)
+            if not autorizado:
                 raise PagamentoInvalidoException("Falha ao processar pagamento")
+            self._gravar(pagamento)
+        return pagamento.id
+    
+    def _semaforo(self) -> asyncio.Semaphore:
+        laco = asyncio.get_running_loop()
+        semaforo = self._semaforos.get(laco)
+        if semaforo is None:
+            semaforo = self._semaforos[laco] = asyncio.Semaphore(self._concorrencia)
+        return semaforo
+    
+    async def _autorizar(self, pagamento: Pagamento) -> bool:
+        semaforo = self._semaforo()
+        espera = self._espera_inicial
+        for tentativa in range(1, self._tentativas + 1):
+            try:
+                async with semaforo:
+                    return await asyncio.wait_for(pagamento.processar_pagamento_async(self._gateway), self._timeout)
+            except (asyncio.TimeoutError, GatewayIndisponivelException):
+                if tentativa == self._tentativas:
+                    raise GatewayIndisponivelException(
+                        f"pagamento {pagamento.id} sem autorização após {tentativa} tentativas")
+            await asyncio.sleep(espera * (0.5 + random.random()))
+            espera *= 2
+    
+    def criar_lote(self, lote: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Pagamentos já liquidados (sem gateway), validados por colunas e com o
+        saldo conferido na ordem das linhas. Devolve 'ids' e 'erros' como
+        ``EmpresaController.criar_lote``.
+        """
+        linhas = list(lote)
+        erros: List[Optional[Exception]] = [None] * len(linhas)
+        colunas, antes_do_saldo = self._validar_lote(linhas, erros)
+        valores, viagens = colunas['valor'], colunas['viagem_id']
+        
+        conferir = [linha for linha in compress(range(len(linhas)), map(operator.not_, antes_do_saldo))
+                    if viagens[linha] is not _AUSENTE] if self._viagem_controller else []
+        viagens_lote = {viagens[linha] for linha in conferir}
+        travas = {id(trava): trava for trava in map(self._livro.trava_viagem, viagens_lote)}
+        with ExitStack() as pilha:
+            for _, trava in sorted(travas.items()):
+                pilha.enter_context(trava)
             
-        except KeyError as e:
-            raise CampoObrigatorioException(str(e))
-        except (PagamentoInvalidoException, ValorInvalidoException, PagamentoExcedeSaldoException):
-            raise 
+            restantes = {viagem_id: self._viagem_controller.calcular_saldo_devedor(viagem_id)
+                         - self._livro.reservado(viagem_id) for viagem_id in viagens_lote}
+            for linha in conferir:
+                restante = restantes[viagens[linha]]
+                if valores[linha] > restante:
+                    erros[linha] = PagamentoExcedeSaldoException(valores[linha], restante)
+                elif erros[linha] is None:
+                    restantes[viagens[linha]] = restante - valores[linha]
+            
+            validas = list(compress(range(len(linhas)), map(operator.not_, erros)))
+            ids = self._gravar_lote(validas, colunas)
+        
+        return {
+            'ids': ids,
+            'erros': {linha: str(erro) or type(erro).__name__
+                      for linha, erro in enumerate(erros) if erro is not None}
+        }
+    
+    def _validar_lote(self, linhas: List[Dict[str, Any]],
+                      erros: List[Optional[Exception]]) -> Tuple[Dict[str, list], List[bool]]:
+        """Preenche ``erros`` na ordem de ``criar``; devolve as colunas e as linhas que falharam antes do saldo."""
+        def marcar(indices: Iterable[int], erro):
+            for linha in indices:
+                if erros[linha] is None:
+                    erros[linha] = erro(linha)
+        
+        def ausentes(coluna: list, indices: Iterable[int]) -> Iterable[int]:
+            return compress(indices, map(operator.is_, coluna, repeat(_AUSENTE)))
+        
+        def faltando(campo: str):
+            return lambda linha: CampoObrigatorioException(str(KeyError(campo)))
+        
+        quantidade = len(linhas)
+        todas = range(quantidade)
+        colunas = {campo: [dados.get(campo, _AUSENTE) for dados in linhas] for campo in _CAMPOS_OBRIGATORIOS}
+        pessoas, valores, viagens = colunas['pessoa_id'], colunas['valor'], colunas['viagem_id']
+        
+        for linha, dados in enumerate(linhas):
+            erros[linha] = _erro_de_tipo(dados)
+        marcar(ausentes(pessoas, todas), faltando('pessoa_id'))
+        existentes = {pessoa_id for pessoa_id in {pessoas[linha] for linha in todas if erros[linha] is None}
+                      if self._pessoa_controller.buscar_por_id(pessoa_id) is not None}
+        marcar(compress(todas, [erro is None and pessoa_id not in existentes
+                                for erro, pessoa_id in zip(erros, pessoas)]),
+               lambda linha: PessoaNaoEncontradaException(pessoas[linha]))
+        if self._viagem_controller:
+            com_viagem = compress(todas, map(operator.is_not, viagens, repeat(_AUSENTE)))
+            marcar(ausentes(valores, list(com_viagem)), faltando('valor'))
+        antes_do_saldo = list(map(operator.is_not, erros, repeat(None)))
+        
+        nomes = colunas['tipo']
+        marcar(ausentes(nomes, todas), faltando('tipo'))
+        registrados = set(tipos_registrados())
+        tipos = colunas['tipo'] = [_resolver_tipo(nome, registrados) for nome in nomes]
+        marcar(compress(todas, map(operator.is_, tipos, repeat(None))),
+               lambda linha: ValueError(f"Tipo de pagamento inválido: {nomes[linha]}"))
+        
+        por_tipo = {tipo: list(compress(todas, map(operator.is_, tipos, repeat(tipo)))) for tipo in _CAMPOS_POR_TIPO}
+        for tipo, campos in _CAMPOS_POR_TIPO.items():
+            for campo in campos:
+                indices = por_tipo[tipo]
+                marcar(ausentes([linhas[linha].get(campo, _AUSENTE) for linha in indices], indices), faltando(campo))
+        
+        for campo in ('data', 'valor', 'viagem_id'):
+            marcar(ausentes(colunas[campo], todas), faltando(campo))
+        marcar(compress(todas, [erro is None and valor <= 0 for erro, valor in zip(erros, valores)]),
+               lambda linha: ValorInvalidoException(valores[linha], "Valor deve ser positivo"))
+        
+        detalhes = colunas['detalhes'] = [()] * quantidade
+        indices, = self._sem_erro(por_tipo[TipoPagamento.DINHEIRO], erros)
+        marcar([linha for linha in indices if valores[linha] > _LIMITE_DINHEIRO],
+               lambda linha: PagamentoInvalidoException(
+                   f"Valor muito alto para pagamento em dinheiro: R$ {valores[linha]:.2f}"))
+        
+        indices, = self._sem_erro(por_tipo[TipoPagamento.PIX], erros)
+        cpfs = [linhas[linha]['cpf_pagador'] for linha in indices]
+        marcar(compress(indices, [not isinstance(cpf, str) or not cpf.strip() for cpf in cpfs]),
+               lambda linha: PagamentoInvalidoException("CPF do pagador é obrigatório para pagamentos PIX"))
+        indices, cpfs = self._sem_erro(indices, erros, cpfs)
+        analisados = list(map(analisar_cpf, cpfs))
+        marcar(compress(indices, [len(cpf.digitos) != 11 for cpf in analisados]),
+               lambda linha: PagamentoInvalidoException("CPF deve ter 11 dígitos"))
+        marcar(compress(indices, [not cpf.valido for cpf in analisados]),
+               lambda linha: PagamentoInvalidoException("CPF do pagador inválido"))
+        indices, cpfs = self._sem_erro(indices, erros, cpfs)
+        for linha, cpf in zip(indices, cpfs):
+            detalhes[linha] = (('cpf_pagador', cpf),)
+        
+        indices, = self._sem_erro(por_tipo[TipoPagamento.CARTAO], erros)
+        numeros = [linhas[linha]['numero_cartao'] for linha in indices]
+        bandeiras = [linhas[linha]['bandeira'] for linha in indices]
+        marcar(compress(indices, [not isinstance(numero, str) or not numero.strip() for numero in numeros]),
+               lambda linha: PagamentoInvalidoException("Número do cartão é obrigatório"))
+        marcar(compress(indices, [not isinstance(bandeira, str) or not bandeira.strip() for bandeira in bandeiras]),
+               lambda linha: PagamentoInvalidoException("Bandeira do cartão é obrigatória"))
+        indices, numeros, bandeiras = self._sem_erro(indices, erros, numeros, bandeiras)
+        cartoes = analisar_cartoes(numeros)
+        marcar(compress(indices, map(operator.not_, cartoes.validos)),
+               lambda linha: PagamentoInvalidoException("Número do cartão inválido"))
+        detectadas = dict(zip(indices, cartoes.bandeiras))
+        marcar(compress(indices, map(operator.not_, map(bandeira_confere, bandeiras, cartoes.bandeiras))),
+               lambda linha: PagamentoInvalidoException(
+                   f"Bandeira {linhas[linha]['bandeira']} não confere com o número do cartão "
+                   f"({nome_bandeira(detectadas[linha])})"))
+        indices, numeros, bandeiras = self._sem_erro(indices, erros, numeros, bandeiras)
+        for linha, numero, bandeira in zip(indices, numeros, bandeiras):
+            detalhes[linha] = (('bandeira', bandeira), ('numero_cartao', numero))
+        
+        # Tipos registrados em tempo de execução: a validação é a da
+        # strategy, linha a linha, como em ``Pagamento``.
+        indices, = self._sem_erro([linha for linha in todas if isinstance(tipos[linha], str)], erros)
+        for linha in indices:
+            try:
+                detalhes[linha] = _detalhes_registrado(linhas[linha])
+                if not obter_strategy(tipos[linha]).validar(dict(detalhes[linha], valor=valores[linha])):
+                    raise PagamentoInvalidoException("Dados de pagamento inválidos")
+            except PagamentoInvalidoException as erro:
+                erros[linha] = erro
+        
+        return colunas, antes_do_saldo
+    
+    @staticmethod
+    def _sem_erro(indices: List[int], erros: List[Optional[Exception]], *colunas: list) -> tuple:
+        """Filtra ``indices`` (e as colunas alinhadas a eles) para as linhas ainda sem erro."""
+        mantidas = [erros[linha] is None for linha in indices]
+        return (list(compress(indices, mantidas)),) + tuple(list(compress(coluna, mantidas)) for coluna in colunas)
+    
+    def _gravar_lote(self, validas: List[int], colunas: Dict[str, list]) -> List[str]:
+        chaves, ids = novos_ids(len(validas))
+        selecionar = lambda campo: [colunas[campo][linha] for linha in validas]
+        valores, pessoas, viagens = selecionar('valor'), selecionar('pessoa_id'), selecionar('viagem_id')
+        tipos, datas, detalhes = selecionar('tipo'), selecionar('data'), selecionar('detalhes')
+        leves = list(map(_LinhaLote, viagens, pessoas, valores))
+        
+        colecao = self._principal
+        store = colecao.base
+        if isinstance(store, PagamentoStore):
+            with colecao.trava:
+                store.inserir_lote(chaves, valores, [data.toordinal() for data in datas],
+                                   pessoas, viagens, tipos, detalhes)
+                colecao.indexar_lote(zip(ids, leves))
+        else:
+            for pagamento_id, valor, pessoa_id, viagem_id, tipo, data, detalhe in zip(
+                    ids, valores, pessoas, viagens, tipos, datas, detalhes):
+                self._pagamentos[pagamento_id] = Pagamento._restaurar(
+                    pagamento_id, data, valor, pessoa_id, viagem_id, tipo, dict(detalhe))
+        self._livro.registrar_lote(leves)
+        return ids
     
     def buscar_por_id(self, pagamento_id: str) -> Optional[Pagamento]:
         return self._pagamentos.get(pagamento_id)
@@ -67,22 +393,39 @@ class PagamentoController(BaseController[Pagamento]):
     def listar_todos(self) -> List[Pagamento]:
         return list(self._pagamentos.values())
     
-    def deletar(self, pagamento_id: str) -> bool:
-        if pagamento_id in self._pagamentos:
+    def deletar(self, pagamento_id: str, versao_esperada: Optional[int] = None) -> bool:
+        pagamento = self._pagamentos.get(pagamento_id)
+        if pagamento is None:
+            return False
+        with self._livro.trava_viagem(pagamento.viagem_id), self._escrita(pagamento_id, versao_esperada):
+            if pagamento_id not in self._pagamentos:
+                return False
             del self._pagamentos[pagamento_id]
+            self._livro.estornar(pagamento)
             return True
-        return False
     
     def listar_por_viagem(self, viagem_id: str) -> List[Pagamento]:
-        return [p for p in self._pagamentos.values() if p.viagem_id == viagem_id]
+        store = self._principal.base
+        if not isinstance(store, PagamentoStore):
+            return self._consultar('viagem', viagem_id)
+        with self._principal.trava:
+            return store.listar_por_viagem(viagem_id)
     
     def listar_por_pessoa(self, pessoa_id: str) -> List[Pagamento]:
-        return [p for p in self._pagamentos.values() if p.pessoa_id == pessoa_id]
+        store = self._principal.base
+        if not isinstance(store, PagamentoStore):
+            return self._consultar('pessoa', pessoa_id)
+        with self._principal.trava:
+            return store.listar_por_pessoa(pessoa_id)
     
     def calcular_total_por_viagem(self, viagem_id: str) -> float:
-        pagamentos = self.listar_por_viagem(viagem_id)
-        return sum(p.valor for p in pagamentos)
+        return self._livro.total_por_viagem(viagem_id)
     
     def calcular_total_por_pessoa(self, pessoa_id: str) -> float:
-        pagamentos = self.listar_por_pessoa(pessoa_id)
-        return sum(p.valor for p in pagamentos)
+        return self._livro.total_por_pessoa(pessoa_id)
+    
+    def calcular_totais_por_viagem(self) -> Dict[str, float]:
+        return self._livro.totais_por_viagem()
+    
+    def calcular_totais_por_pessoa(self) -> Dict[str, float]:
+        return self._livro.totais_por_pessoa()
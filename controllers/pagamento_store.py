@@ -0,0 +1,369 @@
+import os
+import uuid
+import weakref
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from datetime import date
+from itertools import compress
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+from models.pagamento import Pagamento
+from models.tipo_pagamento import TipoPagamento
+from exceptions import PagamentoInvalidoException
+
+_TAMANHO_UUID = 16
+_SLOT_VAZIO = -1
+_SLOT_REMOVIDO = -2
+_SEM_INDICE = 0xFFFFFFFF
+_SEM_TIPO = 0xFF
+_CAPACIDADE_INICIAL = 8
+_MINIMO_PARA_COMPACTAR = 1024
+
+# Bits de versão (4) e variante (RFC 4122) de um UUID aleatório.
+_VERSAO_4 = bytes((b & 0x0F) | 0x40 for b in range(256))
+_VARIANTE = bytes((b & 0x3F) | 0x80 for b in range(256))
+
+
+def novos_ids(quantidade: int) -> Tuple[bytes, List[str]]:
+    """Ids uuid4 em lote: os 16 bytes concatenados e o texto de cada um."""
+    chaves = bytearray(os.urandom(_TAMANHO_UUID * quantidade))
+    chaves[6::_TAMANHO_UUID] = chaves[6::_TAMANHO_UUID].translate(_VERSAO_4)
+    chaves[8::_TAMANHO_UUID] = chaves[8::_TAMANHO_UUID].translate(_VARIANTE)
+    texto = chaves.hex()
+    ids = [f'{texto[i:i + 8]}-{texto[i + 8:i + 12]}-{texto[i + 12:i + 16]}-{texto[i + 16:i + 20]}-{texto[i + 20:i + 32]}'
+           for i in range(0, len(texto), 2 * _TAMANHO_UUID)]
+    return bytes(chaves), ids
+
+
+class _Interning:
+    """Tabela de valores distintos: cada valor é guardado uma vez e referenciado por índice."""
+
+    def __init__(self, valores: Optional[List[Hashable]] = None):
+        self.valores: List[Hashable] = list(valores or [])
+        self.indices: Dict[Hashable, int] = {v: i for i, v in enumerate(self.valores)}
+
+    def indice(self, valor: Hashable) -> int:
+        indice = self.indices.get(valor)
+        if indice is None:
+            indice = len(self.valores)
+            self.valores.append(valor)
+            self.indices[valor] = indice
+        return indice
+
+
+class _ValoresStore(ValuesView):
+    def __iter__(self):
+        store = self._mapping
+        for linha in compress(range(len(store._ativos)), store._ativos):
+            yield store._materializar(linha)
+
+
+class _ItensStore(ItemsView):
+    def __iter__(self):
+        store = self._mapping
+        for linha in compress(range(len(store._ativos)), store._ativos):
+            pagamento = store._materializar(linha)
+            yield pagamento.id, pagamento
+
+
+class PagamentoStore(MutableMapping):
+    """
+    Pagamentos em colunas ``array``, com ids, tipos e detalhes internados e
+    as linhas de cada pessoa e viagem; ``Pagamento`` só é materializado ao ler.
+    """
+
+    def __init__(self):
+        self._uuids = bytearray()
+        self._valores = array('d')
+        self._datas = array('i')
+        self._pessoas = array('I')
+        self._viagens = array('I')
+        self._tipos = array('B')
+        self._detalhes = array('I')
+        self._ativos = array('B')
+
+        self._pessoa_ids = _Interning()
+        self._viagem_ids = _Interning()
+        self._detalhes_valores = _Interning([()])
+        self._tipos_valores = _Interning(list(TipoPagamento))
+        self._linhas_por_pessoa: List[array] = []
+        self._linhas_por_viagem: List[array] = []
+
+        self._tabela = array('q', [_SLOT_VAZIO]) * _CAPACIDADE_INICIAL
+        self._slots_ocupados = 0
+        self._quantidade = 0
+        self._materializados: 'weakref.WeakValueDictionary[str, Pagamento]' = weakref.WeakValueDictionary()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        estado = self.__dict__.copy()
+        del estado['_materializados']
+        return estado
+
+    def __setstate__(self, estado: Dict[str, Any]):
+        self.__dict__.update(estado)
+        self._materializados = weakref.WeakValueDictionary()
+        if '_linhas_por_viagem' not in estado:
+            self._reconstruir_linhas()
+        if '_tipos_valores' not in estado:
+            self._tipos_valores = _Interning(list(TipoPagamento))
+
+    def _indice_tipo(self, tipo: Hashable) -> int:
+        indice = self._tipos_valores.indices.get(tipo)
+        if indice is not None:
+            return indice
+        if len(self._tipos_valores.valores) >= _SEM_TIPO:
+            raise PagamentoInvalidoException(f"Tipos de pagamento demais para guardar: {tipo}")
+        return self._tipos_valores.indice(tipo)
+
+    @staticmethod
+    def _acrescentar_linha(listas: List[array], indice: int, linha: int):
+        while len(listas) <= indice:
+            listas.append(array('I'))
+        listas[indice].append(linha)
+
+    @staticmethod
+    def _remover_linha(listas: List[array], indice: int, linha: int):
+        linhas = listas[indice]
+        del linhas[bisect_left(linhas, linha)]
+
+    def _reconstruir_linhas(self):
+        self._linhas_por_pessoa = []
+        self._linhas_por_viagem = []
+        for linha in compress(range(len(self._ativos)), self._ativos):
+            self._acrescentar_linha(self._linhas_por_pessoa, self._pessoas[linha], linha)
+            self._acrescentar_linha(self._linhas_por_viagem, self._viagens[linha], linha)
+
+    @staticmethod
+    def _chave(pagamento_id: str) -> Optional[bytes]:
+        try:
+            return uuid.UUID(pagamento_id).bytes
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+    def _localizar(self, chave: bytes) -> Tuple[int, int]:
+        tabela = self._tabela
+        mascara = len(tabela) - 1
+        slot = int.from_bytes(chave[:8], 'little') & mascara
+        primeiro_removido = -1
+
+        while True:
+            linha = tabela[slot]
+            if linha == _SLOT_VAZIO:
+                return (primeiro_removido if primeiro_removido >= 0 else slot), -1
+            if linha == _SLOT_REMOVIDO:
+                if primeiro_removido < 0:
+                    primeiro_removido = slot
+            else:
+                inicio = linha * _TAMANHO_UUID
+                if self._uuids[inicio:inicio + _TAMANHO_UUID] == chave:
+                    return slot, linha
+            slot = (slot + 1) & mascara
+
+    def _reconstruir_tabela(self, capacidade: int):
+        tabela = array('q', [_SLOT_VAZIO]) * capacidade
+        mascara = capacidade - 1
+        uuids = self._uuids
+
+        for linha in compress(range(len(self._ativos)), self._ativos):
+            inicio = linha * _TAMANHO_UUID
+            slot = int.from_bytes(uuids[inicio:inicio + 8], 'little') & mascara
+            while tabela[slot] != _SLOT_VAZIO:
+                slot = (slot + 1) & mascara
+            tabela[slot] = linha
+
+        self._tabela = tabela
+        self._slots_ocupados = self._quantidade
+
+    def _compactar(self):
+        ativos = self._ativos
+        uuids = self._uuids
+        self._uuids = bytearray().join(
+            uuids[linha * _TAMANHO_UUID:(linha + 1) * _TAMANHO_UUID]
+            for linha in compress(range(len(ativos)), ativos)
+        )
+        for nome in ('_valores', '_datas', '_pessoas', '_viagens', '_tipos', '_detalhes'):
+            coluna = getattr(self, nome)
+            setattr(self, nome, array(coluna.typecode, compress(coluna, ativos)))
+        self._ativos = array('B', [1]) * self._quantidade
+        self._reconstruir_linhas()
+
+        capacidade = _CAPACIDADE_INICIAL
+        while capacidade < self._quantidade * 2:
+            capacidade *= 2
+        self._reconstruir_tabela(capacidade)
+
+    def _materializar(self, linha: int) -> Pagamento:
+        inicio = linha * _TAMANHO_UUID
+        pagamento_id = str(uuid.UUID(bytes=bytes(self._uuids[inicio:inicio + _TAMANHO_UUID])))
+
+        pagamento = self._materializados.get(pagamento_id)
+        if pagamento is None:
+            pagamento = Pagamento._restaurar(
+                pagamento_id=pagamento_id,
+                data=date.fromordinal(self._datas[linha]),
+                valor=self._valores[linha],
+                pessoa_id=self._pessoa_ids.valores[self._pessoas[linha]],
+                viagem_id=self._viagem_ids.valores[self._viagens[linha]],
+                tipo=self._tipos_valores.valores[self._tipos[linha]],
+                dados_pagamento=dict(self._detalhes_valores.valores[self._detalhes[linha]])
+            )
+            self._materializados[pagamento_id] = pagamento
+        return pagamento
+
+    def __getitem__(self, pagamento_id: str) -> Pagamento:
+        pagamento = self._materializados.get(pagamento_id)
+        if pagamento is not None:
+            return pagamento
+
+        chave = self._chave(pagamento_id)
+        if chave is None:
+            raise KeyError(pagamento_id)
+        _, linha = self._localizar(chave)
+        if linha < 0:
+            raise KeyError(pagamento_id)
+        return self._materializar(linha)
+
+    def __setitem__(self, pagamento_id: str, pagamento: Pagamento):
+        chave = self._chave(pagamento_id)
+        if chave is None:
+            raise ValueError(f"Id de pagamento inválido: {pagamento_id}")
+
+        detalhes = tuple(sorted(
+            (campo, valor) for campo, valor in pagamento._dados_pagamento.items() if campo != 'valor'
+        ))
+        colunas = (
+            pagamento.valor,
+            pagamento.data.toordinal(),
+            self._pessoa_ids.indice(pagamento.pessoa_id),
+            self._viagem_ids.indice(pagamento.viagem_id),
+            self._indice_tipo(pagamento.tipo),
+            self._detalhes_valores.indice(detalhes)
+        )
+
+        slot, linha = self._localizar(chave)
+        if linha >= 0:
+            for listas, coluna, novo in ((self._linhas_por_pessoa, self._pessoas, colunas[2]),
+                                         (self._linhas_por_viagem, self._viagens, colunas[3])):
+                if coluna[linha] != novo:
+                    self._remover_linha(listas, coluna[linha], linha)
+                    while len(listas) <= novo:
+                        listas.append(array('I'))
+                    insort(listas[novo], linha)
+            (self._valores[linha], self._datas[linha], self._pessoas[linha],
+             self._viagens[linha], self._tipos[linha], self._detalhes[linha]) = colunas
+        else:
+            linha = len(self._ativos)
+            self._uuids += chave
+            self._valores.append(colunas[0])
+            self._datas.append(colunas[1])
+            self._pessoas.append(colunas[2])
+            self._viagens.append(colunas[3])
+            self._tipos.append(colunas[4])
+            self._detalhes.append(colunas[5])
+            self._ativos.append(1)
+            self._acrescentar_linha(self._linhas_por_pessoa, colunas[2], linha)
+            self._acrescentar_linha(self._linhas_por_viagem, colunas[3], linha)
+
+            if self._tabela[slot] == _SLOT_VAZIO:
+                self._slots_ocupados += 1
+            self._tabela[slot] = linha
+            self._quantidade += 1
+
+            if self._slots_ocupados * 2 > len(self._tabela):
+                self._reconstruir_tabela(len(self._tabela) * 2)
+
+        self._materializados[pagamento_id] = pagamento
+
+    def inserir_lote(self, chaves: bytes, valores: List[float], datas: List[int],
+                     pessoa_ids: List[str], viagem_ids: List[str], tipos: List[Union[TipoPagamento, str]],
+                     detalhes: List[Tuple[Tuple[str, Any], ...]]):
+        """Inclui ids novos direto nas colunas: ``chaves`` como em ``novos_ids``, ``datas`` em ordinais."""
+        quantidade = len(chaves) // _TAMANHO_UUID
+        linha = len(self._ativos)
+        self._uuids += chaves
+        self._valores.extend(valores)
+        self._datas.extend(datas)
+        pessoas = list(map(self._pessoa_ids.indice, pessoa_ids))
+        viagens = list(map(self._viagem_ids.indice, viagem_ids))
+        self._pessoas.extend(pessoas)
+        self._viagens.extend(viagens)
+        for listas, indices in ((self._linhas_por_pessoa, pessoas), (self._linhas_por_viagem, viagens)):
+            acrescentar = self._acrescentar_linha
+            for nova, indice in enumerate(indices, linha):
+                acrescentar(listas, indice, nova)
+        self._tipos.extend(map(self._indice_tipo, tipos))
+        self._detalhes.extend(map(self._detalhes_valores.indice, detalhes))
+        self._ativos.frombytes(b'\x01' * quantidade)
+        self._quantidade += quantidade
+
+        capacidade = len(self._tabela)
+        while (self._slots_ocupados + quantidade) * 2 > capacidade:
+            capacidade *= 2
+        if capacidade != len(self._tabela):
+            self._reconstruir_tabela(capacidade)
+            return
+
+        tabela = self._tabela
+        mascara = capacidade - 1
+        for inicio in range(0, len(chaves), _TAMANHO_UUID):
+            slot = int.from_bytes(chaves[inicio:inicio + 8], 'little') & mascara
+            while tabela[slot] >= 0:
+                slot = (slot + 1) & mascara
+            if tabela[slot] == _SLOT_VAZIO:
+                self._slots_ocupados += 1
+            tabela[slot] = linha
+            linha += 1
+
+    def __delitem__(self, pagamento_id: str):
+        chave = self._chave(pagamento_id)
+        if chave is None:
+            raise KeyError(pagamento_id)
+        slot, linha = self._localizar(chave)
+        if linha < 0:
+            raise KeyError(pagamento_id)
+
+        self._tabela[slot] = _SLOT_REMOVIDO
+        self._remover_linha(self._linhas_por_pessoa, self._pessoas[linha], linha)
+        self._remover_linha(self._linhas_por_viagem, self._viagens[linha], linha)
+        self._ativos[linha] = 0
+        self._valores[linha] = 0.0
+        self._pessoas[linha] = _SEM_INDICE
+        self._viagens[linha] = _SEM_INDICE
+        self._tipos[linha] = _SEM_TIPO
+        self._quantidade -= 1
+        self._materializados.pop(pagamento_id, None)
+
+        removidos = len(self._ativos) - self._quantidade
+        if removidos >= _MINIMO_PARA_COMPACTAR and removidos > self._quantidade:
+            self._compactar()
+
+    def __contains__(self, pagamento_id: object) -> bool:
+        chave = self._chave(pagamento_id)
+        return chave is not None and self._localizar(chave)[1] >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        uuids = self._uuids
+        for linha in compress(range(len(self._ativos)), self._ativos):
+            inicio = linha * _TAMANHO_UUID
+            yield str(uuid.UUID(bytes=bytes(uuids[inicio:inicio + _TAMANHO_UUID])))
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def values(self) -> ValuesView:
+        return _ValoresStore(self)
+
+    def items(self) -> ItemsView:
+        return _ItensStore(self)
+
+    def _listar(self, listas: List[array], indice: Optional[int]) -> List[Pagamento]:
+        if indice is None or indice >= len(listas):
+            return []
+        return [self._materializar(linha) for linha in listas[indice]]
+
+    def listar_por_viagem(self, viagem_id: str) -> List[Pagamento]:
+        return self._listar(self._linhas_por_viagem, self._viagem_ids.indices.get(viagem_id))
+
+    def listar_por_pessoa(self, pessoa_id: str) -> List[Pagamento]:
+        return self._listar(self._linhas_por_pessoa, self._pessoa_ids.indices.get(pessoa_id))
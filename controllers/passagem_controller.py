@@ -1,9 +1,12 @@
-from typing import Dict, Any, List, Optional
+from collections.abc import Hashable
+from typing import Dict, Any, Callable, Iterable, List, Optional, MutableMapping
 from datetime import date, time
 from controllers.base_controller import BaseController
 from controllers.empresa_controller import EmpresaController
 from controllers.pessoa_controller import PessoaController
 from controllers.viagem_controller import ViagemController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_HASH
 from models.passagem import Passagem
 from models.tipo_transporte import TipoTransporte
 from exceptions import (
@@ -20,10 +23,16 @@ class PassagemController(BaseController[Passagem]):
     
     def __init__(self, empresa_controller: EmpresaController, 
                  pessoa_controller: PessoaController,
-                 viagem_controller: ViagemController):
-        super().__init__()
-        self._passagens: Dict[str, Passagem] = {}
-        self._tipos_transporte: Dict[str, TipoTransporte] = {}
+                 viagem_controller: ViagemController,
+                 storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._passagens: MutableMapping[str, Passagem] = self._colecao('passagens', indices=(
+            DefinicaoIndice('viagem', INDICE_HASH, 'viagem_id'),
+            DefinicaoIndice('responsavel', INDICE_HASH, 'responsavel_compra_id'),
+            DefinicaoIndice('status', INDICE_HASH, 'compra_realizada'),
+            DefinicaoIndice('viagem_status', INDICE_HASH, lambda p: (p.viagem_id, p.compra_realizada))
+        ))
+        self._tipos_transporte: MutableMapping[str, TipoTransporte] = self._colecao('passagem_tipos_transporte')
         self._empresa_controller = empresa_controller
         self._pessoa_controller = pessoa_controller
         self._viagem_controller = viagem_controller
@@ -47,38 +56,10 @@ class PassagemController(BaseController[Passagem]):
     def criar(self, dados: Dict[str, Any]) -> str:
 
         try:
-            self._viagem_controller.buscar_por_id_obrigatorio(dados['viagem_id'])
-            
-            tipo_transporte = self._tipos_transporte.get(dados['tipo_transporte_id'])
-            if not tipo_transporte:
-                raise ValueError(f"Tipo de transporte não encontrado: {dados['tipo_transporte_id']}")
-            
-            if dados.get('responsavel_compra_id'):
-                self._pessoa_controller.buscar_por_id_obrigatorio(dados['responsavel_compra_id'])
-            
-            horario_partida = None
-            horario_chegada = None
-            
-            if dados.get('horario_partida'):
-                horario_partida = time.fromisoformat(dados['horario_partida'])
-            
-            if dados.get('horario_chegada'):
-                horario_chegada = time.fromisoformat(dados['horario_chegada'])
-            
-            passagem = Passagem(
-                data_viagem=dados['data_viagem'],
-                origem=dados['origem'],
-                destino=dados['destino'],
-                tipo_transporte=tipo_transporte,
-                viagem_id=dados['viagem_id'],
-                horario_partida=horario_partida,
-                horario_chegada=horario_chegada,
-                valor=dados.get('valor'),
-                compra_realizada=dados.get('compra_realizada', False),
-                responsavel_compra_id=dados.get('responsavel_compra_id'),
-                numero_assento=dados.get('numero_assento'),
-                codigo_reserva=dados.get('codigo_reserva')
-            )
+            passagem = self._montar(dados, self._viagem_controller.buscar_por_id_obrigatorio,
+                                    self._tipos_transporte.get,
+                                    self._pessoa_controller.buscar_por_id_obrigatorio,
+                                    time.fromisoformat)
             
             self._passagens[passagem.id] = passagem
             return passagem.id
@@ -91,6 +72,94 @@ class PassagemController(BaseController[Passagem]):
         except ValueError:
             raise
     
+    def criar_lote(self, lote: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Devolve 'ids' e 'erros' como ``EmpresaController.criar_lote``; grava as válidas juntas."""
+        linhas = list(lote)
+        viagens = self._resolver(linhas, 'viagem_id', self._viagem_controller.buscar_por_id)
+        tipos = self._resolver(linhas, 'tipo_transporte_id', self._tipos_transporte.get)
+        pessoas = self._resolver(linhas, 'responsavel_compra_id', self._pessoa_controller.buscar_por_id)
+        horarios: Dict[str, time] = {}
+        
+        def viagem(viagem_id: str):
+            if viagens.get(viagem_id) is None:
+                raise ViagemNaoEncontradaException(viagem_id)
+        
+        def pessoa(pessoa_id: str):
+            if pessoas.get(pessoa_id) is None:
+                raise PessoaNaoEncontradaException(pessoa_id)
+        
+        def horario(texto: str) -> time:
+            convertido = horarios.get(texto)
+            if convertido is None:
+                convertido = horarios[texto] = time.fromisoformat(texto)
+            return convertido
+        
+        erros: Dict[int, str] = {}
+        novas = []
+        for linha, dados in enumerate(linhas):
+            try:
+                passagem = self._montar(dados, viagem, tipos.get, pessoa, horario)
+            except KeyError as e:
+                erros[linha] = str(CampoObrigatorioException(str(e)))
+            except Exception as e:
+                erros[linha] = str(e) or type(e).__name__
+            else:
+                novas.append((passagem.id, passagem))
+        
+        self._passagens.gravar_lote(novas)
+        return {
+            'ids': [passagem_id for passagem_id, _ in novas],
+            'erros': erros
+        }
+    
+    @staticmethod
+    def _resolver(linhas: List[Dict[str, Any]], campo: str,
+                  buscar: Callable[[str], Optional[Any]]) -> Dict[Hashable, Any]:
+        """Busca uma vez cada valor distinto de ``campo`` no lote."""
+        valores = [dados.get(campo) for dados in linhas]
+        try:
+            distintos = set(valores)
+        except TypeError:
+            distintos = {valor for valor in valores if isinstance(valor, Hashable)}
+        return {valor: buscar(valor) if valor else None for valor in distintos}
+    
+    def _montar(self, dados: Dict[str, Any], conferir_viagem: Callable[[str], Any],
+                buscar_tipo: Callable[[str], Optional[TipoTransporte]],
+                conferir_pessoa: Callable[[str], Any],
+                converter_horario: Callable[[str], time]) -> Passagem:
+        conferir_viagem(dados['viagem_id'])
+        
+        tipo_transporte = buscar_tipo(dados['tipo_transporte_id'])
+        if not tipo_transporte:
+            raise ValueError(f"Tipo de transporte não encontrado: {dados['tipo_transporte_id']}")
+        
+        if dados.get('responsavel_compra_id'):
+            conferir_pessoa(dados['responsavel_compra_id'])
+        
+        horario_partida = None
+        horario_chegada = None
+        
+        if dados.get('horario_partida'):
+            horario_partida = converter_horario(dados['horario_partida'])
+        
+        if dados.get('horario_chegada'):
+            horario_chegada = converter_horario(dados['horario_chegada'])
+        
+        return Passagem(
+            data_viagem=dados['data_viagem'],
+            origem=dados['origem'],
+            destino=dados['destino'],
+            tipo_transporte=tipo_transporte,
+            viagem_id=dados['viagem_id'],
+            horario_partida=horario_partida,
+            horario_chegada=horario_chegada,
+            valor=dados.get('valor'),
+            compra_realizada=dados.get('compra_realizada', False),
+            responsavel_compra_id=dados.get('responsavel_compra_id'),
+            numero_assento=dados.get('numero_assento'),
+            codigo_reserva=dados.get('codigo_reserva')
+        )
+    
     def buscar_por_id(self, passagem_id: str) -> Optional[Passagem]:
 
         return self._passagens.get(passagem_id)
@@ -108,26 +177,23 @@ class PassagemController(BaseController[Passagem]):
     
     def listar_por_viagem(self, viagem_id: str) -> List[Passagem]:
 
-        return [p for p in self._passagens.values() if p.viagem_id == viagem_id]
+        return self._consultar('viagem', viagem_id)
     
     def listar_por_responsavel(self, responsavel_id: str) -> List[Passagem]:
 
-        return [p for p in self._passagens.values() 
-                if p.responsavel_compra_id == responsavel_id]
+        return self._consultar('responsavel', responsavel_id)
     
     def listar_pendentes(self, viagem_id: Optional[str] = None) -> List[Passagem]:
 
-        passagens = self._passagens.values()
         if viagem_id:
-            passagens = [p for p in passagens if p.viagem_id == viagem_id]
-        return [p for p in passagens if not p.compra_realizada]
+            return self._consultar('viagem_status', (viagem_id, False))
+        return self._consultar('status', False)
     
     def listar_compradas(self, viagem_id: Optional[str] = None) -> List[Passagem]:
 
-        passagens = self._passagens.values()
         if viagem_id:
-            passagens = [p for p in passagens if p.viagem_id == viagem_id]
-        return [p for p in passagens if p.compra_realizada]
+            return self._consultar('viagem_status', (viagem_id, True))
+        return self._consultar('status', True)
     
     def marcar_como_comprada(self, passagem_id: str, responsavel_id: str,
                            codigo_reserva: Optional[str] = None,
@@ -138,6 +204,7 @@ class PassagemController(BaseController[Passagem]):
             self._pessoa_controller.buscar_por_id_obrigatorio(responsavel_id)
             
             passagem.marcar_como_comprada(responsavel_id, codigo_reserva, numero_assento)
+            self._passagens[passagem_id] = passagem
             return True
             
         except (ValueError, PessoaNaoEncontradaException):
@@ -148,57 +215,61 @@ class PassagemController(BaseController[Passagem]):
         passagem = self.buscar_por_id(passagem_id)
         if passagem:
             passagem.cancelar_compra()
+            self._passagens[passagem_id] = passagem
             return True
         return False
     
-    def atualizar(self, passagem_id: str, dados: Dict[str, Any]) -> bool:
+    def atualizar(self, passagem_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
 
-        passagem = self.buscar_por_id(passagem_id)
-        if not passagem:
-            return False
-        
-        try:
-            if 'data_viagem' in dados:
-                passagem.data_viagem = dados['data_viagem']
-            
-            if 'origem' in dados:
-                passagem.origem = dados['origem']
-            
-            if 'destino' in dados:
-                passagem.destino = dados['destino']
-            
-            if 'horario_partida' in dados:
-                if dados['horario_partida']:
-                    passagem.horario_partida = time.fromisoformat(dados['horario_partida'])
-                else:
-                    passagem.horario_partida = None
-            
-            if 'horario_chegada' in dados:
-                if dados['horario_chegada']:
-                    passagem.horario_chegada = time.fromisoformat(dados['horario_chegada'])
-                else:
-                    passagem.horario_chegada = None
+        with self._escrita(passagem_id, versao_esperada):
+            passagem = self.buscar_por_id(passagem_id)
+            if not passagem:
+                return False
             
-            if 'valor' in dados:
-                passagem.valor = dados['valor']
-            
-            if 'numero_assento' in dados:
-                passagem.numero_assento = dados['numero_assento']
-            
-            if 'codigo_reserva' in dados:
-                passagem.codigo_reserva = dados['codigo_reserva']
-            
-            return True
-            
-        except (ValueError, ValorInvalidoException):
-            return False
+            try:
+                if 'data_viagem' in dados:
+                    passagem.data_viagem = dados['data_viagem']
+                
+                if 'origem' in dados:
+                    passagem.origem = dados['origem']
+                
+                if 'destino' in dados:
+                    passagem.destino = dados['destino']
+                
+                if 'horario_partida' in dados:
+                    if dados['horario_partida']:
+                        passagem.horario_partida = time.fromisoformat(dados['horario_partida'])
+                    else:
+                        passagem.horario_partida = None
+                
+                if 'horario_chegada' in dados:
+                    if dados['horario_chegada']:
+                        passagem.horario_chegada = time.fromisoformat(dados['horario_chegada'])
+                    else:
+                        passagem.horario_chegada = None
+                
+                if 'valor' in dados:
+                    passagem.valor = dados['valor']
+                
+                if 'numero_assento' in dados:
+                    passagem.numero_assento = dados['numero_assento']
+                
+                if 'codigo_reserva' in dados:
+                    passagem.codigo_reserva = dados['codigo_reserva']
+                
+                self._passagens[passagem_id] = passagem
+                return True
+                
+            except (ValueError, ValorInvalidoException):
+                return False
     
-    def deletar(self, passagem_id: str) -> bool:
+    def deletar(self, passagem_id: str, versao_esperada: Optional[int] = None) -> bool:
 
-        if passagem_id in self._passagens:
-            del self._passagens[passagem_id]
-            return True
-        return False
+        with self._escrita(passagem_id, versao_esperada):
+            if passagem_id in self._passagens:
+                del self._passagens[passagem_id]
+                return True
+            return False
     
     def listar_tipos_transporte(self) -> List[TipoTransporte]:
 
@@ -211,12 +282,12 @@ class PassagemController(BaseController[Passagem]):
     
     def gerar_relatorio_passagens(self, viagem_id: str) -> Dict[str, Any]:
 
-        passagens = self.listar_por_viagem(viagem_id)
-        compradas = [p for p in passagens if p.compra_realizada]
-        pendentes = [p for p in passagens if not p.compra_realizada]
+        compradas = self.listar_compradas(viagem_id)
+        pendentes = self.listar_pendentes(viagem_id)
+        total_passagens = len(compradas) + len(pendentes)
         
-        valor_total = sum(p.valor for p in passagens if p.valor is not None)
         valor_compradas = sum(p.valor for p in compradas if p.valor is not None)
+        valor_total = valor_compradas + sum(p.valor for p in pendentes if p.valor is not None)
         
         responsaveis = {}
         for passagem in compradas:
@@ -226,12 +297,12 @@ class PassagemController(BaseController[Passagem]):
             responsaveis[resp_id].append(passagem)
         
         return {
-            'total_passagens': len(passagens),
+            'total_passagens': total_passagens,
             'passagens_compradas': len(compradas),
             'passagens_pendentes': len(pendentes),
             'valor_total': valor_total,
             'valor_compradas': valor_compradas,
-            'percentual_compradas': (len(compradas) / len(passagens) * 100) if passagens else 0,
+            'percentual_compradas': (len(compradas) / total_passagens * 100) if total_passagens else 0,
             'responsaveis_compra': responsaveis,
             'passagens_pendentes_lista': pendentes
         }
@@ -1,8 +1,10 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, MutableMapping
 from datetime import date, time
 from controllers.base_controller import BaseController
 from controllers.pessoa_controller import PessoaController
 from controllers.destino_controller import DestinoController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_HASH, INDICE_TRIGRAMAS
 from models.passeio import Passeio
 from exceptions import (
     PasseioNaoEncontradoException,
@@ -13,9 +15,14 @@ from exceptions import (
 
 
 class PasseioController(BaseController[Passeio]):
-    def __init__(self, pessoa_controller: PessoaController, destino_controller: DestinoController):
-        super().__init__()
-        self._passeios: Dict[str, Passeio] = {}
+    def __init__(self, pessoa_controller: PessoaController, destino_controller: DestinoController,
+                 storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._passeios: MutableMapping[str, Passeio] = self._colecao('passeios', indices=(
+            DefinicaoIndice('pessoa', INDICE_HASH, 'pessoa.id'),
+            DefinicaoIndice('cidade', INDICE_HASH, 'cidade', normalizar=str.lower),
+            DefinicaoIndice('atracao', INDICE_TRIGRAMAS, 'atracao_turistica', sob_demanda=True)
+        ))
         self._pessoa_controller = pessoa_controller
         self._destino_controller = destino_controller
     
@@ -58,37 +65,40 @@ class PasseioController(BaseController[Passeio]):
     def listar_todos(self) -> List[Passeio]:
         return list(self._passeios.values())
     
-    def atualizar(self, passeio_id: str, dados: Dict[str, Any]) -> bool:
-        passeio = self.buscar_por_id(passeio_id)
-        if passeio is None:
-            return False
-        
-        try:
-            if 'valor' in dados:
-                passeio.valor = dados['valor']
+    def atualizar(self, passeio_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(passeio_id, versao_esperada):
+            passeio = self.buscar_por_id(passeio_id)
+            if passeio is None:
+                return False
             
-            if 'destino_id' in dados:
-                if dados['destino_id']:
-                    destino = self._destino_controller.buscar_por_id_obrigatorio(dados['destino_id'])
-                    passeio.destino = destino
-                else:
-                    passeio.destino = None
-            
-            return True
-        except (DestinaNaoEncontradoException, ValorInvalidoException):
-            return False
+            try:
+                if 'valor' in dados:
+                    passeio.valor = dados['valor']
+                
+                if 'destino_id' in dados:
+                    if dados['destino_id']:
+                        destino = self._destino_controller.buscar_por_id_obrigatorio(dados['destino_id'])
+                        passeio.destino = destino
+                    else:
+                        passeio.destino = None
+                
+                self._passeios[passeio_id] = passeio
+                return True
+            except (DestinaNaoEncontradoException, ValorInvalidoException):
+                return False
     
-    def deletar(self, passeio_id: str) -> bool:
-        if passeio_id in self._passeios:
-            del self._passeios[passeio_id]
-            return True
-        return False
+    def deletar(self, passeio_id: str, versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(passeio_id, versao_esperada):
+            if passeio_id in self._passeios:
+                del self._passeios[passeio_id]
+                return True
+            return False
     
     def listar_por_pessoa(self, pessoa_id: str) -> List[Passeio]:
-        return [p for p in self._passeios.values() if p.pessoa.id == pessoa_id]
+        return self._consultar('pessoa', pessoa_id)
     
     def listar_por_cidade(self, cidade: str) -> List[Passeio]:
-        return [p for p in self._passeios.values() if p.cidade.lower() == cidade.lower()]
+        return self._consultar('cidade', cidade)
     
     def listar_por_atracao(self, atracao: str) -> List[Passeio]:
-        return [p for p in self._passeios.values() if atracao.lower() in p.atracao_turistica.lower()]
+        return self._consultar('atracao', atracao)
@@ -1,14 +1,37 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, MutableMapping, Tuple
 from datetime import date
 from controllers.base_controller import BaseController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_HASH, INDICE_ORDENADO, INDICE_UNICO
 from models.pessoa import Pessoa
 from exceptions import PessoaNaoEncontradaException, IdadeInsuficienteException, CampoObrigatorioException
 
 
 class PessoaController(BaseController[Pessoa]):
-    def __init__(self):
-        super().__init__()
-        self._pessoas: Dict[str, Pessoa] = {}
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._pessoas: MutableMapping[str, Pessoa] = self._colecao('pessoas', indices=(
+            DefinicaoIndice('documento', INDICE_UNICO, self._chave_identificacao),
+            DefinicaoIndice('tipo_identificacao', INDICE_HASH, 'tipo_identificacao',
+                            normalizar=self._normalizar_tipo),
+            # Ordinais comparam mais rápido que datas nas buscas do índice.
+            DefinicaoIndice('data_nascimento', INDICE_ORDENADO, 'data_nascimento', normalizar=date.toordinal)
+        ))
+    
+    @staticmethod
+    def _normalizar_tipo(tipo_identificacao: str) -> str:
+        return tipo_identificacao.strip().lower()
+    
+    @staticmethod
+    def _normalizar_identificacao(identificacao: str) -> str:
+        """Sem pontuação e espaços, em maiúsculas."""
+        if identificacao.isalnum():
+            return identificacao.upper()
+        return ''.join(c for c in identificacao if c.isalnum()).upper()
+    
+    def _chave_identificacao(self, pessoa: Pessoa) -> Tuple[str, str]:
+        return (self._normalizar_tipo(pessoa.tipo_identificacao),
+                self._normalizar_identificacao(pessoa.identificacao))
     
     def criar(self, dados: Dict[str, Any]) -> str:
         try:
@@ -20,6 +43,11 @@ class PessoaController(BaseController[Pessoa]):
                 tipo_identificacao=dados.get('tipo_identificacao', 'cpf')
             )
             
+            if self._chave_identificacao(pessoa) in self._indice('documento'):
+                raise ValueError(
+                    f"Já existe uma pessoa cadastrada com {pessoa.tipo_identificacao} {pessoa.identificacao}"
+                )
+            
             self._pessoas[pessoa.id] = pessoa
             return pessoa.id
             
@@ -28,6 +56,73 @@ class PessoaController(BaseController[Pessoa]):
         except IdadeInsuficienteException:
             raise 
     
+    def criar_lote(self, lista_dados: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Devolve 'ids' e 'erros' como ``EmpresaController.criar_lote``."""
+        hoje = date.today()
+        linhas: List[int] = []
+        registros: List[tuple] = []
+        erros: Dict[int, str] = {}
+        
+        for linha, dados in enumerate(lista_dados):
+            try:
+                registros.append((self._gerar_id(),) + self.validar(dados, hoje))
+                linhas.append(linha)
+            except (CampoObrigatorioException, IdadeInsuficienteException,
+                    ValueError, AttributeError, TypeError) as e:
+                erros[linha] = str(e)
+        
+        ids = self.gravar_validadas(linhas, registros, erros)
+        return {
+            'ids': ids,
+            'erros': dict(sorted(erros.items()))
+        }
+    
+    @classmethod
+    def validar(cls, dados: Dict[str, Any], hoje: date) -> tuple:
+        """Confere os dados como ``criar``, sem estado do controlador; devolve a tupla para ``gravar_validadas``."""
+        try:
+            nome = dados['nome']
+            celular = dados['celular']
+            identificacao = dados['identificacao']
+            data_nascimento = dados['data_nascimento']
+        except KeyError as e:
+            raise CampoObrigatorioException(str(e))
+        tipo_identificacao = dados.get('tipo_identificacao') or 'cpf'
+        
+        if isinstance(data_nascimento, str):
+            try:
+                data_nascimento = date.fromisoformat(data_nascimento.strip())
+            except ValueError:
+                raise ValueError(f"Data de nascimento inválida: {data_nascimento}")
+        
+        idade = Pessoa.idade_em(data_nascimento, hoje)
+        if idade < 18:
+            raise IdadeInsuficienteException(idade)
+        
+        chave = (cls._normalizar_tipo(tipo_identificacao), cls._normalizar_identificacao(identificacao))
+        return nome, celular, identificacao, data_nascimento, tipo_identificacao, chave
+    
+    def gravar_validadas(self, linhas: List[int], registros: List[tuple], erros: Dict[int, str]) -> List[str]:
+        """Grava os registros validados, desviando para ``erros`` documentos repetidos; devolve os ids."""
+        documentos = self._indice('documento')
+        vistos = set()
+        novas = []
+        chaves = []
+        with self._principal.trava:
+            for linha, (pessoa_id, nome, celular, identificacao, data_nascimento,
+                        tipo_identificacao, chave) in zip(linhas, registros):
+                if chave in documentos or chave in vistos:
+                    erros[linha] = f"Já existe uma pessoa cadastrada com {tipo_identificacao} {identificacao}"
+                    continue
+                vistos.add(chave)
+                novas.append((pessoa_id, Pessoa._restaurar(pessoa_id, nome, celular, identificacao,
+                                                           data_nascimento, tipo_identificacao)))
+                # Chaves dos índices 'documento', 'tipo_identificacao' e
+                # 'data_nascimento', já normalizadas.
+                chaves.append((chave, chave[0], data_nascimento.toordinal()))
+            self._pessoas.gravar_lote(novas, chaves)
+        return [pessoa_id for pessoa_id, _ in novas]
+    
     def buscar_por_id(self, pessoa_id: str) -> Optional[Pessoa]:
         return self._pessoas.get(pessoa_id)
     
@@ -40,27 +135,59 @@ class PessoaController(BaseController[Pessoa]):
     def listar_todos(self) -> List[Pessoa]:
         return list(self._pessoas.values())
     
-    def atualizar(self, pessoa_id: str, dados: Dict[str, Any]) -> bool:
-        pessoa = self.buscar_por_id(pessoa_id)
-        if pessoa is None:
-            return False
-        
-        if 'celular' in dados:
-            pessoa._celular = dados['celular']
-        
-        return True
-    
-    def deletar(self, pessoa_id: str) -> bool:
-        if pessoa_id in self._pessoas:
-            del self._pessoas[pessoa_id]
+    def atualizar(self, pessoa_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(pessoa_id, versao_esperada):
+            pessoa = self.buscar_por_id(pessoa_id)
+            if pessoa is None:
+                return False
+            
+            if 'celular' in dados:
+                pessoa._celular = dados['celular']
+            
+            self._pessoas[pessoa_id] = pessoa
             return True
-        return False
     
-    def buscar_por_identificacao(self, identificacao: str) -> Optional[Pessoa]:
-        for pessoa in self._pessoas.values():
-            if pessoa.identificacao == identificacao:
+    def deletar(self, pessoa_id: str, versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(pessoa_id, versao_esperada):
+            if pessoa_id in self._pessoas:
+                del self._pessoas[pessoa_id]
+                return True
+            return False
+    
+    def buscar_por_identificacao(self, identificacao: str,
+                                 tipo_identificacao: Optional[str] = None) -> Optional[Pessoa]:
+        """Sem ``tipo_identificacao``, procura em todos os tipos cadastrados."""
+        normalizada = self._normalizar_identificacao(identificacao)
+        if tipo_identificacao is not None:
+            tipos = [self._normalizar_tipo(tipo_identificacao)]
+        else:
+            tipos = list(self._indice('tipo_identificacao').chaves())
+        
+        for tipo in tipos:
+            pessoa = self._consultar_unico('documento', (tipo, normalizada))
+            if pessoa is not None:
                 return pessoa
         return None
     
-    def listar_maiores_idade(self) -> List[Pessoa]:
-        return [p for p in self._pessoas.values() if p.calcular_idade() >= 18]
+    def _faixa_etaria(self, idade_minima: int, idade_maxima: Optional[int],
+                      referencia: Optional[date]) -> Dict[str, Any]:
+        referencia = referencia or date.today()
+        return {
+            'minimo': None if idade_maxima is None else Pessoa.nascidos_ate(referencia, idade_maxima + 1),
+            'maximo': Pessoa.nascidos_ate(referencia, idade_minima),
+            'incluir_minimo': False
+        }
+    
+    def listar_por_faixa_etaria(self, idade_minima: int, idade_maxima: Optional[int] = None,
+                                referencia: Optional[date] = None) -> List[Pessoa]:
+        """Da mais velha para a mais nova, em ``referencia`` (hoje, por padrão)."""
+        return self._consultar_intervalo('data_nascimento', ordem_do_indice=True,
+                                         **self._faixa_etaria(idade_minima, idade_maxima, referencia))
+    
+    def contar_por_faixa_etaria(self, idade_minima: int, idade_maxima: Optional[int] = None,
+                                referencia: Optional[date] = None) -> int:
+        return self._contar_intervalo('data_nascimento',
+                                      **self._faixa_etaria(idade_minima, idade_maxima, referencia))
+    
+    def listar_maiores_idade(self, referencia: Optional[date] = None) -> List[Pessoa]:
+        return self.listar_por_faixa_etaria(18, referencia=referencia)
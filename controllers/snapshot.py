@@ -0,0 +1,37 @@
+import mmap
+import os
+import pickle
+from typing import Dict, MutableMapping, Tuple
+
+MAGICO = b'DSOSNAP1'
+
+
+def gravar_snapshot(caminho: str, colecoes: Dict[str, MutableMapping], lsn: int = 0):
+    """Grava as coleções atomicamente (arquivo temporário + fsync + rename)."""
+    estado = {
+        'lsn': lsn,
+        'colecoes': dict(colecoes)
+    }
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(MAGICO)
+        pickle.dump(estado, arquivo, pickle.HIGHEST_PROTOCOL)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def ler_snapshot(caminho: str) -> Tuple[Dict[str, MutableMapping], int]:
+    """Lê o snapshot via mmap e restaura as entidades sem passar pelos construtores."""
+    with open(caminho, 'rb') as arquivo:
+        if os.fstat(arquivo.fileno()).st_size < len(MAGICO):
+            raise ValueError(f"Arquivo de snapshot inválido: {caminho}")
+
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if mapa[:len(MAGICO)] != MAGICO:
+                raise ValueError(f"Arquivo de snapshot inválido: {caminho}")
+            with memoryview(mapa) as visao, visao[len(MAGICO):] as payload:
+                estado = pickle.loads(payload)
+
+    return estado['colecoes'], estado['lsn']
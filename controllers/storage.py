@@ -0,0 +1,317 @@
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from controllers.snapshot import gravar_snapshot
+
+
+class StorageBackend(ABC):
+    def __init__(self):
+        self._colecoes: Dict[str, MutableMapping] = {}
+
+    def colecao(self, nome: str,
+                fabrica: Optional[Callable[[], MutableMapping]] = None) -> MutableMapping:
+        """``fabrica`` pede uma estrutura em memória especializada; backends em disco podem ignorá-la."""
+        if nome not in self._colecoes:
+            self._colecoes[nome] = self._criar_colecao(nome, fabrica)
+        return self._colecoes[nome]
+
+    @abstractmethod
+    def _criar_colecao(self, nome: str,
+                       fabrica: Optional[Callable[[], MutableMapping]] = None) -> MutableMapping:
+        pass
+
+    def esta_vazio(self) -> bool:
+        return all(len(colecao) == 0 for colecao in self._colecoes.values())
+
+    def salvar_snapshot(self, caminho: str):
+        self.sincronizar()
+        gravar_snapshot(caminho, self._colecoes_em_memoria())
+
+    def _colecoes_em_memoria(self) -> Dict[str, MutableMapping]:
+        return self._colecoes
+
+    def sincronizar(self):
+        pass
+
+    def fechar(self):
+        self.sincronizar()
+
+
+def converter_colecao(inicial: Optional[MutableMapping],
+                      fabrica: Optional[Callable[[], MutableMapping]]) -> MutableMapping:
+    if fabrica is None:
+        return inicial if inicial is not None else {}
+    if isinstance(inicial, fabrica):
+        return inicial
+
+    colecao = fabrica()
+    if inicial:
+        colecao.update(inicial.items())
+    return colecao
+
+
+class MemoryStorage(StorageBackend):
+    def __init__(self, colecoes: Optional[Dict[str, MutableMapping]] = None):
+        super().__init__()
+        self._iniciais = dict(colecoes) if colecoes else {}
+
+    def _criar_colecao(self, nome: str,
+                       fabrica: Optional[Callable[[], MutableMapping]] = None) -> MutableMapping:
+        return converter_colecao(self._iniciais.pop(nome, None), fabrica)
+
+    def esta_vazio(self) -> bool:
+        return super().esta_vazio() and not any(self._iniciais.values())
+
+
+class _ValoresSQLite(ValuesView):
+    def __iter__(self):
+        for _, entidade in self._mapping._iterar_itens():
+            yield entidade
+
+
+class _ItensSQLite(ItemsView):
+    def __iter__(self):
+        return self._mapping._iterar_itens()
+
+
+class SQLiteColecao(MutableMapping):
+    """
+    Coleção em SQLite: escritas pendentes gravadas em lote, cache LRU de
+    ``tamanho_cache`` entidades e as chaves dos índices numa coluna à parte.
+    """
+
+    _SQL_BUSCAR = "SELECT dados FROM entidades WHERE colecao = ? AND entidade_id = ?"
+    _SQL_EXISTE = "SELECT 1 FROM entidades WHERE colecao = ? AND entidade_id = ?"
+    _SQL_LISTAR = "SELECT entidade_id, dados FROM entidades WHERE colecao = ? ORDER BY seq"
+    _SQL_LISTAR_IDS = "SELECT entidade_id FROM entidades WHERE colecao = ? ORDER BY seq"
+    _SQL_LISTAR_CHAVES = "SELECT entidade_id, chaves FROM entidades WHERE colecao = ? ORDER BY seq"
+    _SQL_CONTAR = "SELECT COUNT(*) FROM entidades WHERE colecao = ?"
+    _SQL_GRAVAR = (
+        "INSERT INTO entidades (colecao, entidade_id, dados, chaves) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (colecao, entidade_id) DO UPDATE SET dados = excluded.dados, chaves = excluded.chaves"
+    )
+    _SQL_REMOVER = "DELETE FROM entidades WHERE colecao = ? AND entidade_id = ?"
+
+    _REMOVIDO = object()
+    _LOTE_LEITURA = 500
+
+    def __init__(self, storage: 'SQLiteStorage', nome: str,
+                 tamanho_cache: Optional[int] = None):
+        self._storage = storage
+        self._nome = nome
+        self._tamanho_cache = tamanho_cache
+        self._cache: 'OrderedDict[str, Any]' = OrderedDict()
+        self._pendentes: Dict[str, Any] = {}
+        self._chaves_pendentes: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def _conexao(self) -> sqlite3.Connection:
+        return self._storage._conexao
+
+    def _guardar_cache(self, entidade_id: str, entidade: Any):
+        self._cache[entidade_id] = entidade
+        if self._tamanho_cache is not None:
+            self._cache.move_to_end(entidade_id)
+            while len(self._cache) > self._tamanho_cache:
+                self._cache.popitem(last=False)
+
+    def __getitem__(self, entidade_id: str) -> Any:
+        with self._storage._trava:
+            return self._buscar(entidade_id)
+
+    def _buscar(self, entidade_id: str) -> Any:
+        pendente = self._pendentes.get(entidade_id)
+        if pendente is self._REMOVIDO:
+            raise KeyError(entidade_id)
+        if pendente is not None:
+            return pendente
+
+        entidade = self._cache.get(entidade_id)
+        if entidade is not None:
+            if self._tamanho_cache is not None:
+                self._cache.move_to_end(entidade_id)
+            return entidade
+
+        linha = self._conexao.execute(self._SQL_BUSCAR, (self._nome, entidade_id)).fetchone()
+        if linha is None:
+            raise KeyError(entidade_id)
+
+        entidade = pickle.loads(linha[0])
+        self._guardar_cache(entidade_id, entidade)
+        return entidade
+
+    def __setitem__(self, entidade_id: str, entidade: Any):
+        self.gravar_com_chaves(entidade_id, entidade, None)
+
+    def gravar_com_chaves(self, entidade_id: str, entidade: Any, chaves: Optional[Dict[str, Any]]):
+        with self._storage._trava:
+            self._guardar_cache(entidade_id, entidade)
+            self._pendentes[entidade_id] = entidade
+            if chaves is None:
+                self._chaves_pendentes.pop(entidade_id, None)
+            else:
+                self._chaves_pendentes[entidade_id] = chaves
+            self._storage._registrar_escrita()
+
+    def __delitem__(self, entidade_id: str):
+        with self._storage._trava:
+            if entidade_id not in self:
+                raise KeyError(entidade_id)
+            self._cache.pop(entidade_id, None)
+            self._pendentes[entidade_id] = self._REMOVIDO
+            self._chaves_pendentes.pop(entidade_id, None)
+            self._storage._registrar_escrita()
+
+    def __contains__(self, entidade_id: object) -> bool:
+        with self._storage._trava:
+            pendente = self._pendentes.get(entidade_id)
+            if pendente is not None:
+                return pendente is not self._REMOVIDO
+            if entidade_id in self._cache:
+                return True
+            return self._conexao.execute(self._SQL_EXISTE, (self._nome, entidade_id)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._storage._trava:
+            self._storage.sincronizar()
+            ids = [entidade_id for (entidade_id,) in self._conexao.execute(self._SQL_LISTAR_IDS, (self._nome,))]
+        return iter(ids)
+
+    def __len__(self) -> int:
+        with self._storage._trava:
+            self._storage.sincronizar()
+            return self._conexao.execute(self._SQL_CONTAR, (self._nome,)).fetchone()[0]
+
+    def values(self) -> ValuesView:
+        return _ValoresSQLite(self)
+
+    def items(self) -> ItemsView:
+        return _ItensSQLite(self)
+
+    def _iterar_itens(self) -> Iterator[Tuple[str, Any]]:
+        with self._storage._trava:
+            self._storage.sincronizar()
+            cursor = self._conexao.execute(self._SQL_LISTAR, (self._nome,))
+        while True:
+            with self._storage._trava:
+                linhas = cursor.fetchmany(self._LOTE_LEITURA)
+                itens = []
+                for entidade_id, dados in linhas:
+                    entidade = self._cache.get(entidade_id)
+                    if entidade is None:
+                        entidade = pickle.loads(dados)
+                        self._guardar_cache(entidade_id, entidade)
+                    itens.append((entidade_id, entidade))
+            if not itens:
+                return
+            yield from itens
+
+    def chaves_indexadas(self, nomes: List[str]) -> List[Tuple[str, Optional[Tuple[Any, ...]]]]:
+        """(id, chaves de ``nomes``) na ordem da coleção; ``None`` se faltar alguma."""
+        with self._storage._trava:
+            self._storage.sincronizar()
+            linhas = self._conexao.execute(self._SQL_LISTAR_CHAVES, (self._nome,)).fetchall()
+        resultado = []
+        for entidade_id, dados in linhas:
+            chaves = pickle.loads(dados) if dados is not None else {}
+            if all(nome in chaves for nome in nomes):
+                resultado.append((entidade_id, tuple(chaves[nome] for nome in nomes)))
+            else:
+                resultado.append((entidade_id, None))
+        return resultado
+
+    def _gravar_pendentes(self):
+        if not self._pendentes:
+            return
+
+        gravacoes = []
+        remocoes = []
+        for entidade_id, entidade in self._pendentes.items():
+            if entidade is self._REMOVIDO:
+                remocoes.append((self._nome, entidade_id))
+            else:
+                chaves = self._chaves_pendentes.get(entidade_id)
+                gravacoes.append((self._nome, entidade_id,
+                                  pickle.dumps(entidade, pickle.HIGHEST_PROTOCOL),
+                                  None if chaves is None else pickle.dumps(chaves, pickle.HIGHEST_PROTOCOL)))
+
+        if gravacoes:
+            self._conexao.executemany(self._SQL_GRAVAR, gravacoes)
+        if remocoes:
+            self._conexao.executemany(self._SQL_REMOVER, remocoes)
+        self._pendentes.clear()
+        self._chaves_pendentes.clear()
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Entidades serializadas uma a uma numa tabela; referências a outras
+    coleções devem ser ids (os destinos de uma viagem ainda são cópias).
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entidades ("
+        " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " colecao TEXT NOT NULL,"
+        " entidade_id TEXT NOT NULL,"
+        " dados BLOB NOT NULL,"
+        " chaves BLOB)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_entidades_colecao_id "
+        "ON entidades (colecao, entidade_id)",
+        "CREATE INDEX IF NOT EXISTS idx_entidades_colecao_seq "
+        "ON entidades (colecao, seq)",
+    )
+
+    def __init__(self, caminho: str, tamanho_lote: int = 500,
+                 tamanho_cache: Optional[int] = 10000):
+        super().__init__()
+        self._caminho = caminho
+        self._tamanho_lote = tamanho_lote
+        self._tamanho_cache = tamanho_cache
+        self._escritas_pendentes = 0
+        self._trava = threading.RLock()
+
+        self._conexao = sqlite3.connect(caminho, cached_statements=64, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode = WAL")
+        self._conexao.execute("PRAGMA synchronous = NORMAL")
+        with self._conexao:
+            for comando in self._SCHEMA:
+                self._conexao.execute(comando)
+            colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(entidades)")}
+            if 'chaves' not in colunas:
+                self._conexao.execute("ALTER TABLE entidades ADD COLUMN chaves BLOB")
+
+    def _criar_colecao(self, nome: str,
+                       fabrica: Optional[Callable[[], MutableMapping]] = None) -> MutableMapping:
+        return SQLiteColecao(self, nome, self._tamanho_cache)
+
+    def _colecoes_em_memoria(self) -> Dict[str, MutableMapping]:
+        return {nome: dict(colecao.items()) for nome, colecao in self._colecoes.items()}
+
+    def _registrar_escrita(self):
+        self._escritas_pendentes += 1
+        if self._escritas_pendentes >= self._tamanho_lote:
+            self.sincronizar()
+
+    def esta_vazio(self) -> bool:
+        with self._trava:
+            self.sincronizar()
+            return self._conexao.execute("SELECT 1 FROM entidades LIMIT 1").fetchone() is None
+
+    def sincronizar(self):
+        with self._trava:
+            if self._escritas_pendentes == 0:
+                return
+            with self._conexao:
+                for colecao in self._colecoes.values():
+                    colecao._gravar_pendentes()
+            self._escritas_pendentes = 0
+
+    def fechar(self):
+        with self._trava:
+            self.sincronizar()
+            self._conexao.close()
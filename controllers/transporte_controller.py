@@ -1,5 +1,6 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, MutableMapping
 from controllers.base_controller import BaseController
+from controllers.storage import StorageBackend
 from controllers.empresa_controller import EmpresaController
 from models.transporte import TipoTransporte, Transporte
 from exceptions import (
@@ -10,10 +11,11 @@ from exceptions import (
 
 
 class TransporteController(BaseController[Transporte]):
-    def __init__(self, empresa_controller: EmpresaController):
-        super().__init__()
-        self._tipos: Dict[str, TipoTransporte] = {}
-        self._transportes: Dict[str, Transporte] = {}
+    def __init__(self, empresa_controller: EmpresaController,
+                 storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._transportes: MutableMapping[str, Transporte] = self._colecao('transportes')
+        self._tipos: MutableMapping[str, TipoTransporte] = self._colecao('tipos_transporte')
         self._empresa_controller = empresa_controller
     
     def criar_tipo(self, dados: Dict[str, Any]) -> str:
@@ -67,21 +69,24 @@ class TransporteController(BaseController[Transporte]):
     def listar_tipos(self) -> List[TipoTransporte]:
         return list(self._tipos.values())
     
-    def atualizar(self, transporte_id: str, dados: Dict[str, Any]) -> bool:
-        transporte = self.buscar_por_id(transporte_id)
-        if transporte is None:
-            return False
-        
-        if 'compra_realizada' in dados:
-            transporte.compra_realizada = dados['compra_realizada']
-        
-        if 'responsavel_compra' in dados:
-            transporte.responsavel_compra = dados['responsavel_compra']
-        
-        return True
-    
-    def deletar(self, transporte_id: str) -> bool:
-        if transporte_id in self._transportes:
-            del self._transportes[transporte_id]
+    def atualizar(self, transporte_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(transporte_id, versao_esperada):
+            transporte = self.buscar_por_id(transporte_id)
+            if transporte is None:
+                return False
+            
+            if 'compra_realizada' in dados:
+                transporte.compra_realizada = dados['compra_realizada']
+            
+            if 'responsavel_compra' in dados:
+                transporte.responsavel_compra = dados['responsavel_compra']
+            
+            self._transportes[transporte_id] = transporte
             return True
-        return False
+    
+    def deletar(self, transporte_id: str, versao_esperada: Optional[int] = None) -> bool:
+        with self._escrita(transporte_id, versao_esperada):
+            if transporte_id in self._transportes:
+                del self._transportes[transporte_id]
+                return True
+            return False
@@ -0,0 +1,17 @@
+import threading
+from typing import Hashable, List
+
+
+class TravasListradas:
+    """Travas escolhidas pelo hash da chave, sem uma trava por entidade."""
+
+    def __init__(self, quantidade: int = 64):
+        if quantidade <= 0:
+            raise ValueError("A quantidade de travas deve ser maior que zero")
+        self._travas: List[threading.RLock] = [threading.RLock() for _ in range(quantidade)]
+
+    def __len__(self) -> int:
+        return len(self._travas)
+
+    def trava(self, chave: Hashable) -> threading.RLock:
+        return self._travas[hash(chave) % len(self._travas)]
@@ -1,25 +1,36 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, MutableMapping
 from datetime import date
 from controllers.base_controller import BaseController
 from controllers.pessoa_controller import PessoaController
 from controllers.destino_controller import DestinoController
+from controllers.storage import StorageBackend
+from controllers.indices import DefinicaoIndice, INDICE_MULTIVALOR, INDICE_ORDENADO
+from controllers.livro_pagamentos import LivroPagamentos
+from models.pessoa import Pessoa
 from models.viagem import Viagem
 from models.destino_viagem import DestinoViagem
-from models.pagamento import Pagamento
 from exceptions import (
     ViagemNaoEncontradaException, 
     DataInvalidaException,
     PessoaNaoEncontradaException,
     DestinaNaoEncontradoException,
-    CampoObrigatorioException
+    CampoObrigatorioException,
+    ValorInvalidoException,
+    ViagemComPagamentosException
 )
 
 
 class ViagemController(BaseController[Viagem]):
-    def __init__(self, pessoa_controller: PessoaController, destino_controller: DestinoController):
-        super().__init__()
-        self._viagens: Dict[str, Viagem] = {}
-        self._pagamentos: Dict[str, List[Pagamento]] = {} 
+    def __init__(self, pessoa_controller: PessoaController, destino_controller: DestinoController,
+                 storage: Optional[StorageBackend] = None):
+        super().__init__(storage)
+        self._viagens: MutableMapping[str, Viagem] = self._colecao('viagens', indices=(
+            DefinicaoIndice('data_inicio', INDICE_ORDENADO, 'data_inicio'),
+            DefinicaoIndice('data_fim', INDICE_ORDENADO, 'data_fim'),
+            DefinicaoIndice('destino', INDICE_MULTIVALOR, lambda v: [d.destino.id for d in v.destinos]),
+            DefinicaoIndice('participante', INDICE_MULTIVALOR, Viagem.ids_participantes)
+        ))
+        self._livro = LivroPagamentos()
         self._pessoa_controller = pessoa_controller
         self._destino_controller = destino_controller
     
@@ -47,7 +58,6 @@ class ViagemController(BaseController[Viagem]):
             )
             
             self._viagens[viagem.id] = viagem
-            self._pagamentos[viagem.id] = []
             
             return viagem.id
             
@@ -68,56 +78,89 @@ class ViagemController(BaseController[Viagem]):
     def listar_todos(self) -> List[Viagem]:
         return list(self._viagens.values())
     
-    def atualizar(self, viagem_id: str, dados: Dict[str, Any]) -> bool:
-        viagem = self.buscar_por_id(viagem_id)
-        if viagem is None:
-            return False
-        
-        if 'valor_total' in dados:
-            viagem.valor_total = dados['valor_total']
-        
-        return True
-    
-    def deletar(self, viagem_id: str) -> bool:
-        if viagem_id in self._viagens:
-            del self._viagens[viagem_id]
-            if viagem_id in self._pagamentos:
-                del self._pagamentos[viagem_id]
-            return True
-        return False
-    
-    def adicionar_participante(self, viagem_id: str, pessoa_id: str) -> bool:
-        try:
-            viagem = self.buscar_por_id_obrigatorio(viagem_id)
-            pessoa = self._pessoa_controller.buscar_por_id_obrigatorio(pessoa_id)
+    def atualizar(self, viagem_id: str, dados: Dict[str, Any], versao_esperada: Optional[int] = None) -> bool:
+        with self._livro.trava_viagem(viagem_id), self._escrita(viagem_id, versao_esperada):
+            viagem = self.buscar_por_id(viagem_id)
+            if viagem is None:
+                return False
             
-            viagem.adicionar_participante(pessoa)
-            return True
+            if 'valor_total' in dados:
+                comprometido = self._livro.total_por_viagem(viagem_id) + self._livro.reservado(viagem_id)
+                if dados['valor_total'] < comprometido:
+                    raise ValorInvalidoException(
+                        dados['valor_total'],
+                        f"Valor total não pode ser menor que o já pago ou reservado (R$ {comprometido:.2f})")
+                viagem.valor_total = dados['valor_total']
             
-        except (ViagemNaoEncontradaException, PessoaNaoEncontradaException):
+            self._viagens[viagem_id] = viagem
+            return True
+    
+    def deletar(self, viagem_id: str, versao_esperada: Optional[int] = None) -> bool:
+        """Recusa viagens com pagamentos (ViagemComPagamentosException)."""
+        with self._livro.trava_viagem(viagem_id), self._escrita(viagem_id, versao_esperada):
+            if self._livro.tem_pagamentos(viagem_id):
+                raise ViagemComPagamentosException(viagem_id)
+            if viagem_id in self._viagens:
+                del self._viagens[viagem_id]
+                return True
             return False
     
+    def adicionar_participante(self, viagem_id: str, pessoa_id: str) -> bool:
+        with self._livro.trava_viagem(viagem_id):
+            try:
+                viagem = self.buscar_por_id_obrigatorio(viagem_id)
+                pessoa = self._pessoa_controller.buscar_por_id_obrigatorio(pessoa_id)
+                
+                viagem.adicionar_participante(pessoa)
+                self._viagens[viagem_id] = viagem
+                return True
+                
+            except (ViagemNaoEncontradaException, PessoaNaoEncontradaException):
+                return False
+    
     def remover_participante(self, viagem_id: str, pessoa_id: str) -> bool:
-        try:
-            viagem = self.buscar_por_id_obrigatorio(viagem_id)
-            pessoa = self._pessoa_controller.buscar_por_id_obrigatorio(pessoa_id)
-            
-            viagem.remover_participante(pessoa)
-            return True
-            
-        except (ViagemNaoEncontradaException, PessoaNaoEncontradaException):
-            return False
+        with self._livro.trava_viagem(viagem_id):
+            try:
+                viagem = self.buscar_por_id_obrigatorio(viagem_id)
+                pessoa = self._pessoa_controller.buscar_por_id_obrigatorio(pessoa_id)
+                
+                viagem.remover_participante(pessoa)
+                self._viagens[viagem_id] = viagem
+                return True
+                
+            except (ViagemNaoEncontradaException, PessoaNaoEncontradaException):
+                return False
     
-    def adicionar_pagamento(self, viagem_id: str, pagamento: Pagamento):
-        if viagem_id not in self._pagamentos:
-            self._pagamentos[viagem_id] = []
-        self._pagamentos[viagem_id].append(pagamento)
+    def adicionar_participantes(self, viagem_id: str, pessoa_ids: List[str]) -> bool:
+        """Regrava a viagem uma só vez no final."""
+        with self._livro.trava_viagem(viagem_id):
+            try:
+                viagem = self.buscar_por_id_obrigatorio(viagem_id)
+                pessoas = [self._pessoa_controller.buscar_por_id_obrigatorio(pessoa_id) for pessoa_id in pessoa_ids]
+                
+                for pessoa in pessoas:
+                    viagem.adicionar_participante(pessoa)
+                self._viagens[viagem_id] = viagem
+                return True
+                
+            except (ViagemNaoEncontradaException, PessoaNaoEncontradaException):
+                return False
+    
+    def listar_participantes(self, viagem_id: str) -> List[Pessoa]:
+        viagem = self.buscar_por_id_obrigatorio(viagem_id)
+        pessoas = (self._pessoa_controller.buscar_por_id(pessoa_id) for pessoa_id in viagem.ids_participantes())
+        return [pessoa for pessoa in pessoas if pessoa is not None]
+    
+    def listar_por_participante(self, pessoa_id: str) -> List[Viagem]:
+        return self._consultar('participante', pessoa_id)
+    
+    @property
+    def livro_pagamentos(self) -> LivroPagamentos:
+        """Livro de totais compartilhado com o PagamentoController."""
+        return self._livro
     
     def calcular_total_pago(self, viagem_id: str) -> float:
-        if viagem_id not in self._pagamentos:
-            return 0.0
-        
-        return sum(p.valor for p in self._pagamentos[viagem_id])
+        return self._livro.total_por_viagem(viagem_id)
     
     def calcular_saldo_devedor(self, viagem_id: str) -> float:
         viagem = self.buscar_por_id(viagem_id)
@@ -128,7 +171,7 @@ class ViagemController(BaseController[Viagem]):
         return viagem.valor_total - total_pago
     
     def listar_viagens_em_andamento(self, data_atual: date) -> List[Viagem]:
-        return [v for v in self._viagens.values() if v.data_fim >= data_atual]
+        return self._consultar_intervalo('data_fim', minimo=data_atual)
     
     def reordenar_destinos(self, viagem_id: str, nova_ordem: Dict[str, int]) -> bool:
         """
@@ -141,17 +184,19 @@ class ViagemController(BaseController[Viagem]):
         Returns:
             True se a reordenação foi bem-sucedida
         """
-        try:
-            viagem = self.buscar_por_id_obrigatorio(viagem_id)
-            
-            for destino_viagem in viagem.destinos:
-                destino_id = destino_viagem.destino.id
-                if destino_id in nova_ordem:
-                    destino_viagem.ordem = nova_ordem[destino_id]
-            
-            viagem._destinos.sort(key=lambda d: d.ordem)
-            
-            return True
-            
-        except (ViagemNaoEncontradaException, ValueError):
-            return False
+        with self._livro.trava_viagem(viagem_id):
+            try:
+                viagem = self.buscar_por_id_obrigatorio(viagem_id)
+                
+                for destino_viagem in viagem.destinos:
+                    destino_id = destino_viagem.destino.id
+                    if destino_id in nova_ordem:
+                        destino_viagem.ordem = nova_ordem[destino_id]
+                
+                viagem.ordenar_destinos()
+                self._viagens[viagem_id] = viagem
+                
+                return True
+                
+            except (ViagemNaoEncontradaException, ValueError):
+                return False
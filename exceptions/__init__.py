@@ -14,7 +14,10 @@ from .custom_exceptions import (
     CapacidadeExcedidaException,
     PagamentoVencidoException,
     HorarioInvalidoException,
-    PagamentoExcedeSaldoException
+    PagamentoExcedeSaldoException,
+    ConflitoVersaoException,
+    GatewayIndisponivelException,
+    ViagemComPagamentosException
 )
 
 __all__ = [
@@ -33,5 +36,8 @@ __all__ = [
     'CapacidadeExcedidaException',
     'PagamentoVencidoException',
     'HorarioInvalidoException',
-    'PagamentoExcedeSaldoException'
+    'PagamentoExcedeSaldoException',
+    'ConflitoVersaoException',
+    'GatewayIndisponivelException',
+    'ViagemComPagamentosException'
 ]
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class SistemaViagensException(Exception):
 
     pass
@@ -79,3 +82,21 @@ class PagamentoExcedeSaldoException(SistemaViagensException):
 
     def __init__(self, valor_pagamento: float, saldo_devedor: float):
         super().__init__(f"Pagamento de R$ {valor_pagamento:.2f} excede o saldo devedor de R$ {saldo_devedor:.2f}")
+
+class ConflitoVersaoException(SistemaViagensException):
+
+    def __init__(self, entidade_id: str, versao_esperada: int, versao_atual: Optional[int]):
+        self.entidade_id = entidade_id
+        self.versao_esperada = versao_esperada
+        self.versao_atual = versao_atual
+        super().__init__(f"Conflito de versão em {entidade_id}: esperada {versao_esperada}, atual {versao_atual}")
+
+class GatewayIndisponivelException(SistemaViagensException):
+
+    def __init__(self, motivo: str = "Gateway de pagamento indisponível"):
+        super().__init__(f"Gateway indisponível: {motivo}")
+
+class ViagemComPagamentosException(SistemaViagensException):
+
+    def __init__(self, viagem_id: str):
+        super().__init__(f"Viagem com ID {viagem_id} possui pagamentos e não pode ser excluída.")
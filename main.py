@@ -1,12 +1,49 @@
+import argparse
 from views.sistema_view import SistemaViagensView
+from controllers.storage import MemoryStorage, SQLiteStorage
+from controllers.journal import JournalStorage, POLITICAS_FSYNC, FSYNC_GRUPO
+from controllers.snapshot import ler_snapshot
+
+
+def criar_storage(args):
+    if args.db:
+        return SQLiteStorage(args.db)
+    if args.journal:
+        return JournalStorage(args.journal, politica_fsync=args.fsync)
+    if args.snapshot:
+        colecoes, _ = ler_snapshot(args.snapshot)
+        return MemoryStorage(colecoes)
+    return None
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Sistema de Gerenciamento de Viagens")
+    persistencia = parser.add_mutually_exclusive_group()
+    persistencia.add_argument('--db', metavar='CAMINHO',
+                              help="arquivo SQLite para persistir os dados entre execuções")
+    persistencia.add_argument('--journal', metavar='DIRETORIO',
+                              help="diretório do journal + snapshot para persistir os dados")
+    persistencia.add_argument('--snapshot', metavar='CAMINHO',
+                              help="restaura todos os dados de um snapshot binário")
+    parser.add_argument('--fsync', choices=POLITICAS_FSYNC, default=FSYNC_GRUPO,
+                        help="política de fsync do journal (padrão: %(default)s)")
+    parser.add_argument('--salvar-snapshot', metavar='CAMINHO',
+                        help="grava um snapshot binário dos dados ao sair")
+    parser.add_argument('--no-seed', action='store_true',
+                        help="não cadastra os dados iniciais de exemplo")
+    args = parser.parse_args()
+    
+    sistema = None
     try:
-        sistema = SistemaViagensView()
+        sistema = SistemaViagensView(criar_storage(args), semear=not args.no_seed)
         sistema.executar()
+        if args.salvar_snapshot:
+            sistema.salvar_snapshot(args.salvar_snapshot)
     except Exception as e:
         print(f"Erro crítico no sistema: {e}")
+    finally:
+        if sistema is not None:
+            sistema.encerrar()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,19 @@
 from datetime import date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import uuid
 from .tipo_pagamento import TipoPagamento
 from .strategy_pagamento import StrategyPagamento
-from .strategies_pagamento import (
-    StrategyPagamentoDinheiro,
-    StrategyPagamentoPix,
-    StrategyPagamentoCartao
-)
+from .registro_strategies import obter_strategy
 from exceptions import ValorInvalidoException, PagamentoInvalidoException
 
 
 class Pagamento:
+    # Guarda só se ``validar`` passou, nunca o cartão ou o CPF. Pagamentos
+    # restaurados (ou gravados antes deste campo) validam de novo.
+    _validado = False
+    
     def __init__(self, data: date, valor: float, pessoa_id: str, viagem_id: str, 
-                 tipo: TipoPagamento, dados_pagamento: Optional[Dict[str, Any]] = None):
+                 tipo: Union[TipoPagamento, str], dados_pagamento: Optional[Dict[str, Any]] = None):
         
         if valor <= 0:
             raise ValorInvalidoException(valor, "Valor deve ser positivo")
@@ -32,19 +32,28 @@ class Pagamento:
         
         if not self._strategy.validar(self._dados_pagamento):
             raise PagamentoInvalidoException("Dados de pagamento inválidos")
+        self._validado = True
     
-    def _get_strategy(self, tipo: TipoPagamento) -> StrategyPagamento:
-        strategies = {
-            TipoPagamento.DINHEIRO: StrategyPagamentoDinheiro(),
-            TipoPagamento.PIX: StrategyPagamentoPix(),
-            TipoPagamento.CARTAO: StrategyPagamentoCartao()
-        }
-        
-        strategy = strategies.get(tipo)
-        if not strategy:
-            raise PagamentoInvalidoException(f"Tipo de pagamento não suportado: {tipo}")
-        
-        return strategy
+    @classmethod
+    def _restaurar(cls, pagamento_id: str, data: date, valor: float, pessoa_id: str,
+                   viagem_id: str, tipo: Union[TipoPagamento, str],
+                   dados_pagamento: Dict[str, Any]) -> 'Pagamento':
+        pagamento = cls.__new__(cls)
+        pagamento._id = pagamento_id
+        pagamento._data = data
+        pagamento._valor = valor
+        pagamento._pessoa_id = pessoa_id
+        pagamento._viagem_id = viagem_id
+        pagamento._tipo = tipo
+        pagamento._dados_pagamento = dados_pagamento
+        pagamento._dados_pagamento['valor'] = valor
+        pagamento._strategy = pagamento._get_strategy(tipo)
+        return pagamento
+    
+    def _get_strategy(self, tipo: Union[TipoPagamento, str]) -> StrategyPagamento:
+        # Instância compartilhada do registro (models.registro_strategies),
+        # onde também entram tipos novos.
+        return obter_strategy(tipo)
     
     @property
     def id(self) -> str:
@@ -67,12 +76,17 @@ class Pagamento:
         return self._viagem_id
     
     @property
-    def tipo(self) -> TipoPagamento:
+    def tipo(self) -> Union[TipoPagamento, str]:
         return self._tipo
     
     def processar_pagamento(self) -> bool:
+        if self._validado:
+            return self._strategy.processar_validado(self._dados_pagamento)
         return self._strategy.processar(self._dados_pagamento)
     
+    async def processar_pagamento_async(self, gateway=None) -> bool:
+        return await self._strategy.processar_async(self._dados_pagamento, gateway, self._id, self._validado)
+    
     def get_detalhes_pagamento(self) -> str:
         return self._strategy.get_detalhes(self._dados_pagamento)
     
@@ -80,4 +94,4 @@ class Pagamento:
         return f"Pagamento de R$ {self._valor:.2f} em {self._data} - {self.get_detalhes_pagamento()}"
     
     def __repr__(self) -> str:
-        return f"Pagamento(id={self._id}, valor={self._valor}, tipo={self._tipo.value}, data={self._data})"
+        return f"Pagamento(id={self._id}, valor={self._valor}, tipo={self._tipo}, data={self._data})"
@@ -1,4 +1,7 @@
+from calendar import isleap
 from datetime import datetime, date
+from functools import lru_cache
+from typing import Optional
 import uuid
 from exceptions import IdadeInsuficienteException
 
@@ -14,10 +17,22 @@ class Pessoa:
         self._data_nascimento = data_nascimento
         self._tipo_identificacao = tipo_identificacao
         
-        if not self._tem_idade_minima():
-            idade = self.calcular_idade()
+        idade = self.calcular_idade()
+        if idade < 18:
             raise IdadeInsuficienteException(idade)
     
+    @classmethod
+    def _restaurar(cls, pessoa_id: str, nome: str, celular: str, identificacao: str,
+                   data_nascimento: date, tipo_identificacao: str) -> 'Pessoa':
+        pessoa = cls.__new__(cls)
+        pessoa._id = pessoa_id
+        pessoa._nome = nome
+        pessoa._celular = celular
+        pessoa._identificacao = identificacao
+        pessoa._data_nascimento = data_nascimento
+        pessoa._tipo_identificacao = tipo_identificacao
+        return pessoa
+    
     @property
     def id(self) -> str:
         return self._id
@@ -42,14 +57,24 @@ class Pessoa:
     def tipo_identificacao(self) -> str:
         return self._tipo_identificacao
     
-    def calcular_idade(self) -> int:
-        hoje = date.today()
-        idade = hoje.year - self._data_nascimento.year
-        
-        if hoje < date(hoje.year, self._data_nascimento.month, self._data_nascimento.day):
-            idade -= 1
-            
-        return idade
+    @staticmethod
+    def idade_em(data_nascimento: date, referencia: date) -> int:
+        # Comparar (mês, dia) em vez de montar o aniversário deste ano
+        # também serve para quem nasceu em 29/02 (faz aniversário em 01/03).
+        return referencia.year - data_nascimento.year - (
+            (referencia.month, referencia.day) < (data_nascimento.month, data_nascimento.day))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def nascidos_ate(referencia: date, anos: int) -> date:
+        """Última data de nascimento de quem tem pelo menos ``anos`` anos em ``referencia``."""
+        ano = referencia.year - anos
+        if (referencia.month, referencia.day) == (2, 29) and not isleap(ano):
+            return date(ano, 2, 28)
+        return referencia.replace(year=ano)
+    
+    def calcular_idade(self, referencia: Optional[date] = None) -> int:
+        return self.idade_em(self._data_nascimento, referencia or date.today())
     
     def _tem_idade_minima(self) -> bool:
         return self.calcular_idade() >= 18
@@ -0,0 +1,79 @@
+import threading
+from importlib import import_module
+from typing import Callable, Dict, List, Union
+
+from .strategy_pagamento import StrategyPagamento
+from .tipo_pagamento import TipoPagamento
+from exceptions import PagamentoInvalidoException
+
+# Uma strategy pode ser registrada já pronta, por uma fábrica (a própria
+# classe, por exemplo) ou pelo caminho "modulo:Classe"; as duas últimas só
+# são carregadas no primeiro pagamento do tipo.
+Carregador = Union[StrategyPagamento, Callable[[], StrategyPagamento], str]
+
+_CARREGADORES: Dict[str, Carregador] = {
+    TipoPagamento.DINHEIRO.value: 'models.strategies_pagamento:StrategyPagamentoDinheiro',
+    TipoPagamento.PIX.value: 'models.strategies_pagamento:StrategyPagamentoPix',
+    TipoPagamento.CARTAO.value: 'models.strategies_pagamento:StrategyPagamentoCartao'
+}
+# Instâncias já carregadas, pelo tipo como foi pedido (TipoPagamento ou
+# nome), para que a busca comum seja um único acesso ao dict.
+_INSTANCIAS: Dict[Union[TipoPagamento, str], StrategyPagamento] = {}
+_trava = threading.Lock()
+
+
+def _nome(tipo: Union[TipoPagamento, str]) -> str:
+    if isinstance(tipo, TipoPagamento):
+        return tipo.value
+    return str(tipo).lower().strip()
+
+
+def _carregar(carregador: Carregador) -> StrategyPagamento:
+    if isinstance(carregador, StrategyPagamento):
+        return carregador
+    if isinstance(carregador, str):
+        modulo, _, classe = carregador.partition(':')
+        carregador = getattr(import_module(modulo), classe)
+    strategy = carregador()
+    if not isinstance(strategy, StrategyPagamento):
+        raise TypeError(f"Strategy de pagamento inválida: {strategy!r}")
+    return strategy
+
+
+def registrar_strategy(tipo: Union[TipoPagamento, str], strategy: Carregador):
+    """
+    Registra (ou substitui) a strategy do tipo de pagamento ``tipo``, que
+    pode ser um tipo novo, como "boleto". A mesma instância é compartilhada
+    por todos os pagamentos do tipo, então a strategy não deve guardar
+    estado de um pagamento. Pagamentos já criados continuam com a strategy
+    anterior.
+    """
+    nome = _nome(tipo)
+    if not nome:
+        raise ValueError("O tipo de pagamento deve ter um nome")
+    with _trava:
+        _CARREGADORES[nome] = strategy
+        for chave in [chave for chave in _INSTANCIAS if _nome(chave) == nome]:
+            del _INSTANCIAS[chave]
+
+
+def obter_strategy(tipo: Union[TipoPagamento, str]) -> StrategyPagamento:
+    strategy = _INSTANCIAS.get(tipo)
+    if strategy is not None:
+        return strategy
+
+    nome = _nome(tipo)
+    with _trava:
+        strategy = _INSTANCIAS.get(nome)
+        if strategy is None:
+            carregador = _CARREGADORES.get(nome)
+            if carregador is None:
+                raise PagamentoInvalidoException(f"Tipo de pagamento não suportado: {tipo}")
+            strategy = _INSTANCIAS[nome] = _carregar(carregador)
+        _INSTANCIAS[tipo] = strategy
+    return strategy
+
+
+def tipos_registrados() -> List[str]:
+    with _trava:
+        return list(_CARREGADORES)
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from .strategy_pagamento import StrategyPagamento
 from exceptions import PagamentoInvalidoException
+from utils.validacao_pagamento import analisar_cartao, analisar_cpf, bandeira_confere, nome_bandeira
 
 
 class StrategyPagamentoDinheiro(StrategyPagamento):
@@ -20,6 +21,9 @@ class StrategyPagamentoDinheiro(StrategyPagamento):
             return True
         return False
     
+    def processar_validado(self, dados: Dict[str, Any]) -> bool:
+        return True
+    
     def get_detalhes(self, dados: Dict[str, Any]) -> str:
         return "Dinheiro"
     
@@ -28,6 +32,8 @@ class StrategyPagamentoDinheiro(StrategyPagamento):
 
 
 class StrategyPagamentoPix(StrategyPagamento):
+    usa_gateway = True
+    
     def validar(self, dados: Dict[str, Any]) -> bool:
         valor = dados.get('valor', 0)
         cpf_pagador = dados.get('cpf_pagador', '')
@@ -38,9 +44,11 @@ class StrategyPagamentoPix(StrategyPagamento):
         if not cpf_pagador or not cpf_pagador.strip():
             raise PagamentoInvalidoException("CPF do pagador é obrigatório para pagamentos PIX")
         
-        cpf_numeros = ''.join(filter(str.isdigit, cpf_pagador))
-        if len(cpf_numeros) != 11:
+        cpf = analisar_cpf(cpf_pagador)
+        if len(cpf.digitos) != 11:
             raise PagamentoInvalidoException("CPF deve ter 11 dígitos")
+        if not cpf.valido:
+            raise PagamentoInvalidoException("CPF do pagador inválido")
         
         return True
     
@@ -49,6 +57,9 @@ class StrategyPagamentoPix(StrategyPagamento):
             return True
         return False
     
+    def processar_validado(self, dados: Dict[str, Any]) -> bool:
+        return True
+    
     def get_detalhes(self, dados: Dict[str, Any]) -> str:
         cpf_pagador = dados.get('cpf_pagador', '')
         return f"PIX - CPF: {cpf_pagador}"
@@ -58,6 +69,8 @@ class StrategyPagamentoPix(StrategyPagamento):
 
 
 class StrategyPagamentoCartao(StrategyPagamento):
+    usa_gateway = True
+    
     def validar(self, dados: Dict[str, Any]) -> bool:
         valor = dados.get('valor', 0)
         numero_cartao = dados.get('numero_cartao', '')
@@ -72,10 +85,14 @@ class StrategyPagamentoCartao(StrategyPagamento):
         if not bandeira or not bandeira.strip():
             raise PagamentoInvalidoException("Bandeira do cartão é obrigatória")
         
-        cartao_numeros = ''.join(filter(str.isdigit, numero_cartao))
-        if len(cartao_numeros) < 13 or len(cartao_numeros) > 19:
+        cartao = analisar_cartao(numero_cartao)
+        if not cartao.valido:
             raise PagamentoInvalidoException("Número do cartão inválido")
         
+        if not bandeira_confere(bandeira, cartao.bandeira):
+            raise PagamentoInvalidoException(
+                f"Bandeira {bandeira} não confere com o número do cartão ({nome_bandeira(cartao.bandeira)})")
+        
         return True
     
     def processar(self, dados: Dict[str, Any]) -> bool:
@@ -83,6 +100,9 @@ class StrategyPagamentoCartao(StrategyPagamento):
             return True
         return False
     
+    def processar_validado(self, dados: Dict[str, Any]) -> bool:
+        return True
+    
     def get_detalhes(self, dados: Dict[str, Any]) -> str:
         numero_cartao = dados.get('numero_cartao', '')
         bandeira = dados.get('bandeira', '')
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from exceptions import PagamentoInvalidoException
 
 
 class StrategyPagamento(ABC):
+    # Tipos que dependem de autorização externa (PIX, cartão).
+    usa_gateway = False
+    
     @abstractmethod
     def validar(self, dados: Dict[str, Any]) -> bool:
         pass
@@ -12,6 +15,10 @@ class StrategyPagamento(ABC):
     def processar(self, dados: Dict[str, Any]) -> bool:
         pass
     
+    def processar_validado(self, dados: Dict[str, Any]) -> bool:
+        """``processar`` para dados que já passaram por ``validar``."""
+        return self.processar(dados)
+    
     @abstractmethod
     def get_detalhes(self, dados: Dict[str, Any]) -> str:
         pass
@@ -19,3 +26,17 @@ class StrategyPagamento(ABC):
     @abstractmethod
     def get_nome_tipo(self) -> str:
         pass
+    
+    async def processar_async(self, dados: Dict[str, Any], gateway=None, chave: Optional[str] = None,
+                              validado: bool = False) -> bool:
+        """
+        Versão assíncrona de ``processar``: nos tipos com ``usa_gateway``,
+        valida localmente e espera a autorização do ``gateway``
+        (``services.gateway_pagamento``); nos demais, ou sem gateway,
+        processa como ``processar``.
+        """
+        if not self.usa_gateway or gateway is None:
+            return self.processar_validado(dados) if validado else self.processar(dados)
+        if not validado and not self.validar(dados):
+            return False
+        return await gateway.autorizar(chave, self.get_nome_tipo(), dados)
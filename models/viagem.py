@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 from .pessoa import Pessoa
 from .destino import Destino
@@ -9,6 +9,8 @@ from exceptions import DataInvalidaException, ValorInvalidoException
 
 
 class Viagem:
+    """Participantes guardados pelo id; as pessoas vêm de ``ViagemController.listar_participantes``."""
+    
     def __init__(self, titulo: str, data_inicio: date, data_fim: date, 
                  valor_total: float, destinos: List[DestinoViagem]):
         if data_fim <= data_inicio:
@@ -25,10 +27,28 @@ class Viagem:
         self._data_inicio = data_inicio
         self._data_fim = data_fim
         self._valor_total = valor_total
-        self._destinos = sorted(destinos.copy(), key=lambda d: d.ordem)
+        self._destinos: Tuple[DestinoViagem, ...] = tuple(sorted(destinos, key=lambda d: d.ordem))
         
-        self._transportes: List[Transporte] = []
-        self._participantes: List[Pessoa] = []
+        self._transportes: Tuple[Transporte, ...] = ()
+        self._participantes: Dict[str, None] = {}
+        self._visao_participantes: Optional[Tuple[str, ...]] = None
+    
+    def __getstate__(self) -> dict:
+        estado = self.__dict__.copy()
+        estado['_visao_participantes'] = None
+        return estado
+    
+    def __setstate__(self, estado: dict):
+        # Viagens gravadas antes das visões em tupla guardavam listas, e
+        # os participantes como as próprias pessoas (em lista ou dict).
+        estado['_destinos'] = tuple(estado['_destinos'])
+        estado['_transportes'] = tuple(estado['_transportes'])
+        estado['_visao_participantes'] = None
+        if isinstance(estado['_participantes'], list):
+            estado['_participantes'] = dict.fromkeys(pessoa.id for pessoa in estado['_participantes'])
+        else:
+            estado['_participantes'] = dict.fromkeys(estado['_participantes'])
+        self.__dict__.update(estado)
     
     @property
     def id(self) -> str:
@@ -57,32 +77,46 @@ class Viagem:
         self._valor_total = valor
     
     @property
-    def destinos(self) -> List[DestinoViagem]:
-        return self._destinos.copy()
+    def destinos(self) -> Tuple[DestinoViagem, ...]:
+        return self._destinos
     
     @property
-    def transportes(self) -> List[Transporte]:
-        return self._transportes.copy()
+    def transportes(self) -> Tuple[Transporte, ...]:
+        return self._transportes
     
     @property
-    def participantes(self) -> List[Pessoa]:
-        return self._participantes.copy()
+    def participantes(self) -> Tuple[str, ...]:
+        return self.ids_participantes()
+    
+    def ids_participantes(self) -> Tuple[str, ...]:
+        if self._visao_participantes is None:
+            self._visao_participantes = tuple(self._participantes)
+        return self._visao_participantes
+    
+    def tem_participante(self, pessoa_id: str) -> bool:
+        return pessoa_id in self._participantes
     
     def adicionar_participante(self, pessoa: Pessoa):
-        if pessoa not in self._participantes:
-            self._participantes.append(pessoa)
+        if pessoa.id not in self._participantes:
+            self._participantes[pessoa.id] = None
+            self._visao_participantes = None
     
     def remover_participante(self, pessoa: Pessoa):
-        if pessoa in self._participantes:
-            self._participantes.remove(pessoa)
+        if pessoa.id in self._participantes:
+            del self._participantes[pessoa.id]
+            self._visao_participantes = None
     
     def adicionar_transporte(self, transporte: Transporte):
-        self._transportes.append(transporte)
+        self._transportes += (transporte,)
     
     def adicionar_destino(self, destino_viagem: DestinoViagem):
         if destino_viagem not in self._destinos:
-            self._destinos.append(destino_viagem)
-            self._destinos.sort(key=lambda d: d.ordem)
+            self._destinos += (destino_viagem,)
+            self.ordenar_destinos()
+    
+    def ordenar_destinos(self):
+        """Reaplica a ordem dos destinos depois que a ``ordem`` de algum deles mudou."""
+        self._destinos = tuple(sorted(self._destinos, key=lambda d: d.ordem))
     
     def duracao_dias(self) -> int:
         return (self._data_fim - self._data_inicio).days
@@ -0,0 +1,63 @@
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from exceptions import GatewayIndisponivelException
+
+
+class GatewayPagamento(ABC):
+    """
+    Cliente do gateway que autoriza pagamentos PIX e cartão.
+
+    ``chave`` identifica o pagamento (é o id dele): o gateway deve tratar
+    duas chamadas com a mesma chave como a mesma autorização, já que o
+    PagamentoController repete a chamada depois de um timeout.
+    """
+
+    @abstractmethod
+    async def autorizar(self, chave: str, tipo: str, dados: Dict[str, Any]) -> bool:
+        """
+        True se autorizado, False se recusado. Falhas temporárias levantam
+        GatewayIndisponivelException e podem ser tentadas de novo.
+        """
+
+
+class GatewaySimulado(GatewayPagamento):
+    """
+    Gateway local para testes e benchmarks: responde depois de
+    ``latencia`` segundos (mais até ``variacao`` aleatória), falha
+    temporariamente com probabilidade ``taxa_falha`` e recusa com
+    probabilidade ``taxa_recusa``.
+    """
+
+    def __init__(self, latencia: float = 0.05, variacao: float = 0.0,
+                 taxa_falha: float = 0.0, taxa_recusa: float = 0.0,
+                 semente: Optional[int] = None):
+        self.latencia = latencia
+        self.variacao = variacao
+        self.taxa_falha = taxa_falha
+        self.taxa_recusa = taxa_recusa
+        self._aleatorio = random.Random(semente)
+        self._respostas: Dict[str, bool] = {}
+        self.chamadas = 0
+        self.em_andamento = 0
+        self.pico_em_andamento = 0
+
+    async def autorizar(self, chave: str, tipo: str, dados: Dict[str, Any]) -> bool:
+        self.chamadas += 1
+        self.em_andamento += 1
+        self.pico_em_andamento = max(self.pico_em_andamento, self.em_andamento)
+        try:
+            await asyncio.sleep(self.latencia + self._aleatorio.random() * self.variacao)
+            if self._aleatorio.random() < self.taxa_falha:
+                raise GatewayIndisponivelException(f"falha temporária ao autorizar {chave}")
+            if chave not in self._respostas:
+                self._respostas[chave] = self._aleatorio.random() >= self.taxa_recusa
+            return self._respostas[chave]
+        finally:
+            self.em_andamento -= 1
+
+    @property
+    def autorizados(self) -> int:
+        return sum(self._respostas.values())
@@ -0,0 +1,144 @@
+import csv
+import json
+import time
+from datetime import date
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from controllers.passagem_controller import PassagemController
+
+FORMATO_CSV = 'csv'
+FORMATO_JSONL = 'jsonl'
+
+_OPCIONAIS = ('horario_partida', 'horario_chegada', 'responsavel_compra_id', 'numero_assento', 'codigo_reserva')
+_VERDADEIROS = ('1', 'true', 'sim', 's', 'yes')
+
+
+class ResultadoImportacao:
+    """Linhas lidas, passagens criadas e linhas rejeitadas, como (número da linha, motivo)."""
+
+    def __init__(self):
+        self.linhas = 0
+        self.importadas = 0
+        self.rejeitadas: List[Tuple[int, str]] = []
+        self.segundos = 0.0
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        return self.linhas / self.segundos if self.segundos else 0.0
+
+
+class ImportadorPassagens:
+    """Importa manifestos de passagens (CSV ou JSONL) em streaming, em lotes de ``tamanho_lote`` linhas."""
+
+    def __init__(self, passagem_controller: PassagemController, tamanho_lote: int = 5000):
+        if tamanho_lote <= 0:
+            raise ValueError("O tamanho do lote deve ser maior que zero")
+        self._passagem_controller = passagem_controller
+        self._tamanho_lote = tamanho_lote
+
+    def importar(self, caminho: str, formato: Optional[str] = None,
+                 progresso: Optional[Callable[[ResultadoImportacao], None]] = None) -> ResultadoImportacao:
+        """Sem ``formato``, ele é deduzido da extensão (.jsonl/.ndjson ou CSV)."""
+        if formato is None:
+            formato = FORMATO_JSONL if caminho.lower().endswith(('.jsonl', '.ndjson')) else FORMATO_CSV
+        if formato not in (FORMATO_CSV, FORMATO_JSONL):
+            raise ValueError(f"Formato de importação inválido: {formato}")
+
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            registros = self._ler_csv(arquivo) if formato == FORMATO_CSV else self._ler_jsonl(arquivo)
+            return self.importar_registros(registros, progresso)
+
+    def importar_registros(self, registros: Iterable[Tuple[int, Union[Dict[str, Any], Exception]]],
+                           progresso: Optional[Callable[[ResultadoImportacao], None]] = None) -> ResultadoImportacao:
+        """Importa pares (número da linha, registro lido ou exceção de leitura)."""
+        resultado = ResultadoImportacao()
+        inicio = time.perf_counter()
+        registros = iter(registros)
+
+        while True:
+            lote = list(islice(registros, self._tamanho_lote))
+            if not lote:
+                break
+            self._importar_lote(lote, resultado)
+            resultado.segundos = time.perf_counter() - inicio
+            if progresso is not None:
+                progresso(resultado)
+
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def _importar_lote(self, lote: List[Tuple[int, Union[Dict[str, Any], Exception]]],
+                       resultado: ResultadoImportacao):
+        datas: Dict[str, date] = {}
+        numeros, convertidos, rejeitadas = [], [], []
+        for numero, registro in lote:
+            if isinstance(registro, Exception):
+                rejeitadas.append((numero, str(registro)))
+                continue
+            try:
+                convertidos.append(self._converter(registro, datas))
+                numeros.append(numero)
+            except Exception as e:
+                rejeitadas.append((numero, str(e)))
+
+        criados = self._passagem_controller.criar_lote(convertidos)
+        rejeitadas.extend((numeros[posicao], mensagem) for posicao, mensagem in criados['erros'].items())
+        # Leitura/conversão e criar_lote rejeitam em passadas diferentes;
+        # os lotes vêm em ordem, então basta ordenar dentro de cada um.
+        rejeitadas.sort(key=itemgetter(0))
+        resultado.rejeitadas.extend(rejeitadas)
+        resultado.importadas += len(criados['ids'])
+        resultado.linhas += len(lote)
+
+    @staticmethod
+    def _converter(dados: Dict[str, Any], datas: Dict[str, date]) -> Dict[str, Any]:
+        """Converte os campos que chegam como texto para os tipos que ``criar`` espera."""
+        if not isinstance(dados, dict):
+            raise ValueError("Registro deve ser um objeto com os campos da passagem")
+
+        data_viagem = dados.get('data_viagem')
+        if isinstance(data_viagem, str):
+            convertida = datas.get(data_viagem)
+            if convertida is None:
+                convertida = datas[data_viagem] = date.fromisoformat(data_viagem.strip())
+            dados['data_viagem'] = convertida
+
+        valor = dados.get('valor')
+        if isinstance(valor, str):
+            dados['valor'] = float(valor.replace(',', '.')) if valor.strip() else None
+
+        comprada = dados.get('compra_realizada')
+        if isinstance(comprada, str):
+            dados['compra_realizada'] = comprada.strip().lower() in _VERDADEIROS
+        elif comprada is None:
+            dados['compra_realizada'] = False
+
+        for campo in _OPCIONAIS:
+            if dados.get(campo) == '':
+                dados[campo] = None
+        return dados
+
+    @staticmethod
+    def _ler_csv(arquivo) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        leitor = csv.reader(arquivo)
+        cabecalho = [campo.strip() for campo in next(leitor, [])]
+        if not cabecalho:
+            return
+        # Colunas que faltam numa linha ficam fora do registro, que então
+        # falha como em ``criar`` (campo obrigatório); colunas a mais são
+        # ignoradas.
+        for linha in leitor:
+            if linha:
+                yield leitor.line_num, dict(zip(cabecalho, linha))
+
+    @staticmethod
+    def _ler_jsonl(arquivo) -> Iterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+        for numero, linha in enumerate(arquivo, 1):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except ValueError as e:
+                yield numero, ValueError(f"JSON inválido: {e}")
@@ -0,0 +1,121 @@
+import csv
+import gc
+import io
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from controllers.pessoa_controller import PessoaController
+from exceptions import CampoObrigatorioException, IdadeInsuficienteException
+from services.importacao_passagens import ResultadoImportacao
+
+# Um trecho é a unidade de trabalho de cada processo: ~100 mil linhas de
+# um CSV de clientes típico.
+_TAMANHO_TRECHO = 8 * 2 ** 20
+
+
+@contextmanager
+def _sem_coleta_de_ciclos():
+    """Desliga o coletor de ciclos durante a carga: os registros importados não formam ciclos."""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def _validar_trecho(caminho: str, inicio: int, fim: int, cabecalho: List[str],
+                    hoje: date) -> Tuple[int, List[int], List[tuple], List[Tuple[int, str]]]:
+    """Valida, num processo do pool, as linhas que começam entre os bytes ``inicio`` e ``fim``."""
+    with open(caminho, 'rb') as arquivo:
+        if inicio > 0:
+            arquivo.seek(inicio - 1)
+            if arquivo.read(1) != b'\n':
+                # A linha que começou no trecho anterior é dele.
+                inicio += len(arquivo.readline())
+        bruto = arquivo.read(max(fim - inicio, 0))
+        if bruto and not bruto.endswith(b'\n'):
+            bruto += arquivo.readline()
+
+    posicoes: List[int] = []
+    registros: List[tuple] = []
+    erros: List[Tuple[int, str]] = []
+    quantidade = 0
+    with _sem_coleta_de_ciclos():
+        for quantidade, linha in enumerate(csv.reader(io.StringIO(bruto.decode('utf-8'), newline='')), 1):
+            if not linha:
+                continue
+            try:
+                registros.append((str(uuid.uuid4()),) + PessoaController.validar(dict(zip(cabecalho, linha)), hoje))
+                posicoes.append(quantidade - 1)
+            except (CampoObrigatorioException, IdadeInsuficienteException,
+                    ValueError, AttributeError, TypeError) as e:
+                erros.append((quantidade - 1, str(e)))
+    return quantidade, posicoes, registros, erros
+
+
+# Os trechos são cortados nas quebras de linha, então campos com quebra de
+# linha entre aspas não são suportados.
+class ImportadorPessoas:
+    """Importa um CSV de clientes em trechos validados em paralelo e gravados na ordem do arquivo."""
+
+    def __init__(self, pessoa_controller: PessoaController, processos: Optional[int] = None,
+                 tamanho_trecho: int = _TAMANHO_TRECHO):
+        if tamanho_trecho <= 0:
+            raise ValueError("O tamanho do trecho deve ser maior que zero")
+        self._pessoa_controller = pessoa_controller
+        self._processos = processos or os.cpu_count() or 1
+        self._tamanho_trecho = tamanho_trecho
+
+    def importar(self, caminho: str,
+                 progresso: Optional[Callable[[ResultadoImportacao], None]] = None) -> ResultadoImportacao:
+        """``progresso`` recebe o resultado parcial depois de cada trecho gravado."""
+        resultado = ResultadoImportacao()
+        inicio = time.perf_counter()
+        hoje = date.today()
+
+        with open(caminho, 'rb') as arquivo:
+            primeira = arquivo.readline()
+        cabecalho = [campo.strip() for campo in next(csv.reader([primeira.decode('utf-8-sig')]), [])]
+        tamanho = os.path.getsize(caminho)
+        trechos = [(caminho, posicao, min(posicao + self._tamanho_trecho, tamanho), cabecalho, hoje)
+                   for posicao in range(len(primeira), tamanho, self._tamanho_trecho)]
+
+        # Linha 1 é o cabeçalho.
+        proxima_linha = 2
+        with _sem_coleta_de_ciclos():
+            for quantidade, posicoes, registros, erros in self._validar(trechos):
+                linhas = [proxima_linha + posicao for posicao in posicoes]
+                erros_trecho: Dict[int, str] = {proxima_linha + posicao: motivo for posicao, motivo in erros}
+                resultado.importadas += len(self._pessoa_controller.gravar_validadas(linhas, registros, erros_trecho))
+                resultado.rejeitadas.extend(sorted(erros_trecho.items()))
+                resultado.linhas += quantidade
+                proxima_linha += quantidade
+                resultado.segundos = time.perf_counter() - inicio
+                if progresso is not None:
+                    progresso(resultado)
+
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def _validar(self, trechos: List[tuple]):
+        if self._processos == 1 or len(trechos) <= 1:
+            for trecho in trechos:
+                yield _validar_trecho(*trecho)
+            return
+
+        with ProcessPoolExecutor(self._processos) as executor:
+            pendentes = deque()
+            for trecho in trechos:
+                pendentes.append(executor.submit(_validar_trecho, *trecho))
+                if len(pendentes) >= 2 * self._processos:
+                    yield pendentes.popleft().result()
+            while pendentes:
+                yield pendentes.popleft().result()
@@ -42,8 +42,9 @@ class RelatorioService:
         valores_por_destino: Dict[str, List[float]] = {}
         
         for viagem in self._viagem_controller.listar_todos():
-            valor_por_destino = viagem.valor_total / len(viagem.destinos) if viagem.destinos else 0
-            for destino in viagem.destinos:
+            destinos = viagem.destinos
+            valor_por_destino = viagem.valor_total / len(destinos) if destinos else 0
+            for destino in destinos:
                 if destino.id not in valores_por_destino:
                     valores_por_destino[destino.id] = []
                 valores_por_destino[destino.id].append(valor_por_destino)
@@ -8,35 +8,35 @@ class MockedData:
         return [
             {
                 'nome': 'João Silva',
-                'identificacao': '12345678901',
+                'identificacao': '12345678909',
                 'data_nascimento': date(1990, 5, 15),
                 'celular': '(11) 99999-1111',
                 'tipo_identificacao': 'cpf'
             },
             {
                 'nome': 'Maria Santos',
-                'identificacao': '98765432109',
+                'identificacao': '98765432100',
                 'data_nascimento': date(1985, 8, 20),
                 'celular': '(11) 99999-2222',
                 'tipo_identificacao': 'cpf'
             },
             {
                 'nome': 'Pedro Costa',
-                'identificacao': '11122233344',
+                'identificacao': '11122233396',
                 'data_nascimento': date(1992, 12, 10),
                 'celular': '(11) 99999-3333',
                 'tipo_identificacao': 'cpf'
             },
             {
                 'nome': 'Ana Oliveira',
-                'identificacao': '55566677788',
+                'identificacao': '55566677720',
                 'data_nascimento': date(1988, 3, 25),
                 'celular': '(11) 99999-4444',
                 'tipo_identificacao': 'cpf'
             },
             {
                 'nome': 'Carlos Ferreira',
-                'identificacao': '44433322211',
+                'identificacao': '44433322270',
                 'data_nascimento': date(1995, 11, 8),
                 'celular': '(11) 99999-5555',
                 'tipo_identificacao': 'cpf'
@@ -309,7 +309,7 @@ class MockedData:
                 'pessoa_id': cliente_ids[1],
                 'viagem_id': None, 
                 'tipo': 'cartao',
-                'numero_cartao': '1234567812345678',
+                'numero_cartao': '4111111111111111',
                 'bandeira': 'Visa'
             },
             {
@@ -318,7 +318,7 @@ class MockedData:
                 'pessoa_id': cliente_ids[2],
                 'viagem_id': None,  
                 'tipo': 'pix',
-                'cpf_pagador': '11122233344'
+                'cpf_pagador': '11122233396'
             },
             {
                 'data': date(2025, 9, 4),
@@ -326,6 +326,6 @@ class MockedData:
                 'pessoa_id': cliente_ids[0],
                 'viagem_id': None,  
                 'tipo': 'pix',
-                'cpf_pagador': '12345678901'
+                'cpf_pagador': '12345678909'
             }
         ]
@@ -0,0 +1,14 @@
+import unicodedata
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Forma canônica para comparar nomes digitados pelo usuário: decompõe
+    com NFKD, descarta os acentos, aplica casefold e junta espaços
+    repetidos. "Maceió" e " MACEIO " viram "maceio".
+    """
+    if texto.isascii():
+        return ' '.join(texto.casefold().split())
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
@@ -0,0 +1,191 @@
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import eq, mul
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from utils.texto import normalizar_texto
+
+_DIGITOS = b'0123456789'
+# Tabelas para bytes.translate sobre dígitos ASCII: o valor do dígito e,
+# para o Luhn, a soma dos algarismos do dobro (7 -> 14 -> 5).
+_VALOR = bytes.maketrans(_DIGITOS, bytes(range(10)))
+_DOBRO = bytes.maketrans(_DIGITOS, bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
+_MULTIPLO_DE_10 = bytes(int(soma % 10 == 0) for soma in range(256))
+
+_PESOS_CPF = tuple(range(11, 1, -1))
+_TAMANHOS_CARTAO = set(range(13, 20))
+
+_NOMES_BANDEIRAS = {
+    'visa': 'Visa',
+    'mastercard': 'Mastercard',
+    'amex': 'American Express',
+    'diners': 'Diners Club',
+    'discover': 'Discover',
+    'elo': 'Elo',
+    'hipercard': 'Hipercard',
+    'jcb': 'JCB'
+}
+_APELIDOS_BANDEIRAS = {
+    'master': 'mastercard',
+    'master card': 'mastercard',
+    'american express': 'amex',
+    'diners club': 'diners'
+}
+# Faixas de BIN (início e fim com o mesmo número de dígitos). Quando uma
+# faixa mais longa está dentro de outra (Elo dentro de Visa e Discover,
+# Hipercard dentro de Diners), vale a mais longa.
+_FAIXAS_BIN = (
+    ('4', '4', 'visa'),
+    ('51', '55', 'mastercard'), ('2221', '2720', 'mastercard'),
+    ('34', '34', 'amex'), ('37', '37', 'amex'),
+    ('300', '305', 'diners'), ('36', '36', 'diners'), ('38', '39', 'diners'),
+    ('6011', '6011', 'discover'), ('644', '649', 'discover'), ('65', '65', 'discover'),
+    ('3528', '3589', 'jcb'),
+    ('384100', '384100', 'hipercard'), ('384140', '384140', 'hipercard'), ('384160', '384160', 'hipercard'),
+    ('606282', '606282', 'hipercard'),
+    ('401178', '401179', 'elo'), ('431274', '431274', 'elo'), ('438935', '438935', 'elo'),
+    ('451416', '451416', 'elo'), ('457393', '457393', 'elo'), ('457631', '457632', 'elo'),
+    ('504175', '504175', 'elo'), ('506699', '506778', 'elo'), ('509000', '509999', 'elo'),
+    ('627780', '627780', 'elo'), ('636297', '636297', 'elo'), ('636368', '636368', 'elo'),
+    ('650031', '650033', 'elo'), ('650035', '650051', 'elo'), ('650405', '650439', 'elo'),
+    ('650485', '650538', 'elo'), ('650541', '650598', 'elo'), ('650700', '650718', 'elo'),
+    ('650720', '650727', 'elo'), ('650901', '650920', 'elo'), ('651652', '651679', 'elo'),
+    ('655000', '655019', 'elo'), ('655021', '655058', 'elo')
+)
+_BINS: Dict[str, str] = {
+    str(prefixo).zfill(len(inicio)): bandeira
+    for inicio, fim, bandeira in _FAIXAS_BIN
+    for prefixo in range(int(inicio), int(fim) + 1)
+}
+_TAMANHOS_BIN = sorted({len(prefixo) for prefixo in _BINS}, reverse=True)
+
+
+class ResultadoCpf(NamedTuple):
+    digitos: str
+    valido: bool
+
+
+class ResultadoCartao(NamedTuple):
+    digitos: str
+    # 13 a 19 dígitos e dígito verificador (Luhn) correto.
+    valido: bool
+    bandeira: Optional[str]
+
+
+class ResultadosCartoes(NamedTuple):
+    digitos: List[str]
+    validos: List[bool]
+    bandeiras: List[Optional[str]]
+
+
+def somente_digitos(texto: str) -> str:
+    if texto.isdigit() and texto.isascii():
+        return texto
+    return ''.join(c for c in texto if c in '0123456789')
+
+
+def digitos_cpf(base: str) -> str:
+    """Os dois dígitos verificadores dos 9 primeiros dígitos de um CPF."""
+    valores = list(base.encode('ascii').translate(_VALOR))
+    primeiro = sum(map(mul, valores, _PESOS_CPF[1:])) * 10 % 11 % 10
+    valores.append(primeiro)
+    segundo = sum(map(mul, valores, _PESOS_CPF)) * 10 % 11 % 10
+    return f'{primeiro}{segundo}'
+
+
+def analisar_cpf(cpf: str) -> ResultadoCpf:
+    """
+    Dígitos do CPF (sem pontuação) e se ele é válido: 11 dígitos, não
+    todos iguais, com os verificadores corretos.
+    """
+    digitos = somente_digitos(cpf)
+    valido = (len(digitos) == 11 and digitos != digitos[0] * 11
+              and digitos[9:] == digitos_cpf(digitos[:9]))
+    return ResultadoCpf(digitos, valido)
+
+
+def _soma_luhn(digitos: bytes) -> int:
+    return sum(digitos[-1::-2].translate(_VALOR)) + sum(digitos[-2::-2].translate(_DOBRO))
+
+
+def digito_luhn(parcial: str) -> str:
+    """Dígito que completa ``parcial`` para passar no Luhn."""
+    return str(-_soma_luhn(parcial.encode('ascii') + b'0') % 10)
+
+
+# O cache é indexado só pelo BIN (6 primeiros dígitos), nunca pelo
+# número do cartão.
+@lru_cache(maxsize=65536)
+def _bandeira_do_bin(prefixo: str) -> Optional[str]:
+    for tamanho in _TAMANHOS_BIN:
+        bandeira = _BINS.get(prefixo[:tamanho])
+        if bandeira is not None:
+            return bandeira
+    return None
+
+
+def detectar_bandeira(numero: str) -> Optional[str]:
+    """Bandeira ('visa', 'mastercard', 'elo'...) pelo BIN, ou None."""
+    return _bandeira_do_bin(numero[:6])
+
+
+def analisar_cartao(numero: str) -> ResultadoCartao:
+    """
+    Dígitos, validade (tamanho e Luhn) e bandeira de um número de
+    cartão, numa passada só.
+    """
+    digitos = somente_digitos(numero)
+    valido = len(digitos) in _TAMANHOS_CARTAO and _soma_luhn(digitos.encode('ascii')) % 10 == 0
+    return ResultadoCartao(digitos, valido, detectar_bandeira(digitos))
+
+
+def analisar_cartoes(numeros: Iterable[str]) -> ResultadosCartoes:
+    """
+    ``analisar_cartao`` para um lote de números, por colunas.
+
+    O Luhn é calculado para todos os números de mesmo tamanho de uma vez:
+    os dígitos de cada número, com os dobrados já somados, viram um byte
+    de um único inteiro; multiplicá-lo por 0x0101...01 (um byte 1 por
+    dígito do número) acumula a soma de cada número no seu último byte,
+    sem "vai um", já que nenhuma soma passa de 255.
+    """
+    digitos = [numero if numero.isdigit() and numero.isascii() else somente_digitos(numero)
+               for numero in numeros]
+    tamanhos = list(map(len, digitos))
+    validos = bytearray(len(digitos))
+
+    for tamanho in set(tamanhos) & _TAMANHOS_CARTAO:
+        posicoes = list(compress(range(len(digitos)), map(eq, tamanhos, repeat(tamanho))))
+        grupo = [digitos[posicao] for posicao in posicoes]
+        # Um zero à esquerda não muda o Luhn e deixa todos com tamanho par.
+        if tamanho % 2:
+            bruto, tamanho = ('0' + '0'.join(grupo)).encode('ascii'), tamanho + 1
+        else:
+            bruto = ''.join(grupo).encode('ascii')
+        parcelas = bytearray(bruto.translate(_VALOR))
+        parcelas[0::2] = bruto[0::2].translate(_DOBRO)
+        somas = (int.from_bytes(parcelas, 'little') * int.from_bytes(b'\x01' * tamanho, 'little')).to_bytes(
+            len(parcelas) + tamanho, 'little')[tamanho - 1::tamanho]
+        for posicao, valido in zip(posicoes, somas.translate(_MULTIPLO_DE_10)):
+            validos[posicao] = valido
+
+    prefixos = [numero[:6] for numero in digitos]
+    bandeiras = {prefixo: _bandeira_do_bin(prefixo) for prefixo in set(prefixos)}
+    return ResultadosCartoes(digitos, list(map(bool, validos)), list(map(bandeiras.__getitem__, prefixos)))
+
+
+def nome_bandeira(bandeira: str) -> str:
+    return _NOMES_BANDEIRAS.get(bandeira, bandeira)
+
+
+def bandeira_confere(informada: str, detectada: Optional[str]) -> bool:
+    """
+    Se a bandeira informada pelo cliente é compatível com a detectada
+    pelo BIN. Bandeiras que não conhecemos (de um lado ou de outro) não
+    são recusadas.
+    """
+    if detectada is None:
+        return True
+    nome = normalizar_texto(informada)
+    nome = _APELIDOS_BANDEIRAS.get(nome, nome)
+    return nome not in _NOMES_BANDEIRAS or nome == detectada
@@ -1,5 +1,5 @@
 from datetime import date, time
-from typing import List, Any
+from typing import List, Any, Optional, Callable, Dict
 from views.base_view import BaseView
 from controllers.pessoa_controller import PessoaController
 from controllers.destino_controller import DestinoController
@@ -9,23 +9,31 @@ from controllers.passeio_controller import PasseioController
 from controllers.transporte_controller import TransporteController
 from controllers.empresa_controller import EmpresaController
 from controllers.passagem_controller import PassagemController
+from controllers.base_controller import BaseController
+from controllers.storage import StorageBackend, MemoryStorage
 from utils.mocked_data import MockedData
 from controllers.passagem_controller import PassagemController
 from services.relatorio_service import RelatorioService
+from services.importacao_passagens import ImportadorPassagens, ResultadoImportacao
+from services.importacao_pessoas import ImportadorPessoas
 from models.passeio import Passeio
 from exceptions import *
 
 
 class SistemaViagensView(BaseView):
-    def __init__(self):
-        self.pessoa_controller = PessoaController()
-        self.destino_controller = DestinoController()
-        self.empresa_controller = EmpresaController()
-        self.viagem_controller = ViagemController(self.pessoa_controller, self.destino_controller)
-        self.pagamento_controller = PagamentoController(self.pessoa_controller, self.viagem_controller)
-        self.passeio_controller = PasseioController(self.pessoa_controller, self.destino_controller)
-        self.transporte_controller = TransporteController(self.empresa_controller)
-        self.passagem_controller = PassagemController(self.empresa_controller, self.pessoa_controller, self.viagem_controller)
+    TAMANHO_PAGINA = 20
+    
+    def __init__(self, storage: Optional[StorageBackend] = None, semear: bool = True):
+        self._storage = storage if storage is not None else MemoryStorage()
+        
+        self.pessoa_controller = PessoaController(self._storage)
+        self.destino_controller = DestinoController(self._storage)
+        self.empresa_controller = EmpresaController(self._storage)
+        self.viagem_controller = ViagemController(self.pessoa_controller, self.destino_controller, self._storage)
+        self.pagamento_controller = PagamentoController(self.pessoa_controller, self.viagem_controller, self._storage)
+        self.passeio_controller = PasseioController(self.pessoa_controller, self.destino_controller, self._storage)
+        self.transporte_controller = TransporteController(self.empresa_controller, self._storage)
+        self.passagem_controller = PassagemController(self.empresa_controller, self.pessoa_controller, self.viagem_controller, self._storage)
         self.relatorio_service = RelatorioService(
             self.viagem_controller, 
             self.destino_controller,
@@ -33,7 +41,14 @@ class SistemaViagensView(BaseView):
             self.pagamento_controller
         )
         
-        self.cadastrar_dados_iniciais()
+        if semear and self._storage.esta_vazio():
+            self.cadastrar_dados_iniciais()
+    
+    def salvar_snapshot(self, caminho: str):
+        self._storage.salvar_snapshot(caminho)
+    
+    def encerrar(self):
+        self._storage.fechar()
     
     def exibir_menu(self) -> int:
         print("\n" + "="*50)
@@ -64,6 +79,72 @@ class SistemaViagensView(BaseView):
         for i, item in enumerate(items, 1):
             print(f"{i:2d}. {item}")
     
+    def exibir_paginas(self, controller: BaseController, titulo: str = "",
+                       exibir: Optional[Callable[[Any], None]] = None):
+        """
+        Lista a coleção do controlador de ``TAMANHO_PAGINA`` em
+        ``TAMANHO_PAGINA`` itens, pedindo confirmação entre as páginas.
+        Sem ``exibir``, cada item é mostrado numerado, como em ``exibir_lista``.
+        """
+        if titulo:
+            print(f"\n{titulo}")
+            print("-" * len(titulo))
+        
+        numero = 0
+        cursor = None
+        while True:
+            itens, cursor = controller.listar_pagina(cursor, self.TAMANHO_PAGINA)
+            if not itens and numero == 0:
+                print("Nenhum item encontrado.")
+                return
+            
+            for item in itens:
+                numero += 1
+                if exibir is None:
+                    print(f"{numero:2d}. {item}")
+                else:
+                    exibir(item)
+            
+            if cursor is None:
+                return
+            if input("Enter para a próxima página, 0 para parar: ").strip() == '0':
+                return
+    
+    def selecionar(self, controller: BaseController, titulo: str, prompt: str, vazio: str,
+                   formatar: Callable[[Any], str] = str, invalido: str = "Índice inválido") -> Optional[Any]:
+        """
+        Mostra a coleção do controlador página a página para o usuário
+        escolher um item pelo número; Enter sem número passa para a
+        próxima página. Devolve ``None``, já avisando o usuário, se a
+        coleção estiver vazia ou o número não corresponder a nenhum item.
+        """
+        opcoes: Dict[int, Any] = {}
+        cursor = None
+        while True:
+            itens, cursor = controller.listar_pagina(cursor, self.TAMANHO_PAGINA)
+            if not itens and not opcoes:
+                self.exibir_mensagem(vazio)
+                return None
+            if not opcoes:
+                print(titulo)
+            
+            for item in itens:
+                opcoes[len(opcoes) + 1] = item
+                print(f"{len(opcoes)}. {formatar(item)}")
+            
+            if cursor is None:
+                numero = self.solicitar_entrada(prompt, int)
+                break
+            entrada = self.solicitar_entrada(f"{prompt} (Enter para mais)", int, obrigatorio=False)
+            if entrada is not None:
+                numero = entrada
+                break
+        
+        if numero not in opcoes:
+            self.exibir_erro(invalido)
+            return None
+        return opcoes[numero]
+    
     def exibir_mensagem(self, mensagem: str, tipo: str = "info"):
         if tipo == "erro":
             print(f"\n❌ {mensagem}")
@@ -115,6 +196,7 @@ class SistemaViagensView(BaseView):
             print("3. Buscar Pessoa")
             print("4. Atualizar Pessoa")
             print("5. Deletar Pessoa")
+            print("6. Importar Pessoas de Arquivo (CSV)")
             print("0. Voltar")
             
             opcao = self.solicitar_entrada("Opção", int)
@@ -131,6 +213,31 @@ class SistemaViagensView(BaseView):
                 self.atualizar_pessoa()
             elif opcao == 5:
                 self.deletar_pessoa()
+            elif opcao == 6:
+                self.importar_pessoas()
+    
+    def importar_pessoas(self):
+        try:
+            print("\n=== IMPORTAR PESSOAS ===")
+            caminho = self.solicitar_entrada("Caminho do arquivo (.csv)", str)
+            resultado = ImportadorPessoas(self.pessoa_controller).importar(caminho, progresso=self._exibir_progresso)
+            self._exibir_importacao(resultado, "pessoas")
+        except Exception as e:
+            self.exibir_erro(f"Erro ao importar pessoas: {str(e)}")
+    
+    @staticmethod
+    def _exibir_progresso(parcial: ResultadoImportacao):
+        print(f"  {parcial.linhas} linhas lidas ({parcial.linhas_por_segundo:.0f} linhas/s)")
+    
+    def _exibir_importacao(self, resultado: ResultadoImportacao, entidades: str):
+        self.exibir_sucesso(f"{resultado.importadas} {entidades} importadas de {resultado.linhas} linhas "
+                            f"em {resultado.segundos:.2f}s ({resultado.linhas_por_segundo:.0f} linhas/s).")
+        if resultado.rejeitadas:
+            self.exibir_erro(f"{len(resultado.rejeitadas)} linhas rejeitadas:")
+            for numero, motivo in resultado.rejeitadas[:20]:
+                print(f"  Linha {numero}: {motivo}")
+            if len(resultado.rejeitadas) > 20:
+                print(f"  ... e mais {len(resultado.rejeitadas) - 20}")
     
     def cadastrar_pessoa(self):
         try:
@@ -165,8 +272,7 @@ class SistemaViagensView(BaseView):
             self.exibir_erro(f"Erro ao cadastrar pessoa: {str(e)}")
     
     def listar_pessoas(self):
-        pessoas = self.pessoa_controller.listar_todos()
-        self.exibir_lista(pessoas, "PESSOAS CADASTRADAS")
+        self.exibir_paginas(self.pessoa_controller, "PESSOAS CADASTRADAS")
     
     def buscar_pessoa(self):
 
@@ -182,67 +288,40 @@ class SistemaViagensView(BaseView):
             self.exibir_mensagem("Pessoa não encontrada.")
     
     def atualizar_pessoa(self):
-        pessoas = self.pessoa_controller.listar_todos()
-        
-        if not pessoas:
-            self.exibir_mensagem("Nenhuma pessoa cadastrada.")
+        pessoa = self.selecionar(self.pessoa_controller, "\nPessoas disponíveis:", "Selecione a pessoa para atualizar",
+                                 "Nenhuma pessoa cadastrada.")
+        if pessoa is None:
             return
+        versao = self.pessoa_controller.versao(pessoa.id)
+        
+        print(f"Dados atuais: {pessoa}")
+        
+        dados = {}
+        self.exibir_mensagem("Deixe em branco para manter o valor atual")
         
-        print("\nPessoas disponíveis:")
-        for i, pessoa in enumerate(pessoas, 1):
-            print(f"{i}. {pessoa}")
+        novo_celular = input(f"Novo celular (atual: {pessoa.celular}): ").strip()
+        if novo_celular:
+            dados['celular'] = novo_celular
         
         try:
-            indice = self.solicitar_entrada("Selecione a pessoa para atualizar", int) - 1
-            if not (0 <= indice < len(pessoas)):
-                self.exibir_erro("Índice inválido")
-                return
-            
-            pessoa = pessoas[indice]
-            print(f"Dados atuais: {pessoa}")
-            
-            dados = {}
-            self.exibir_mensagem("Deixe em branco para manter o valor atual")
-            
-            novo_celular = input(f"Novo celular (atual: {pessoa.celular}): ").strip()
-            if novo_celular:
-                dados['celular'] = novo_celular
-            
-            if self.pessoa_controller.atualizar(pessoa.id, dados):
+            if self.pessoa_controller.atualizar(pessoa.id, dados, versao):
                 self.exibir_sucesso("Pessoa atualizada com sucesso")
             else:
                 self.exibir_erro("Erro ao atualizar pessoa")
-                
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        except ConflitoVersaoException:
+            self.exibir_erro("A pessoa foi alterada enquanto você editava. Tente novamente.")
     
     def deletar_pessoa(self):
-        pessoas = self.pessoa_controller.listar_todos()
-        
-        if not pessoas:
-            self.exibir_mensagem("Nenhuma pessoa cadastrada.")
+        pessoa = self.selecionar(self.pessoa_controller, "\nPessoas disponíveis:", "Selecione a pessoa para deletar",
+                                 "Nenhuma pessoa cadastrada.")
+        if pessoa is None:
             return
         
-        print("\nPessoas disponíveis:")
-        for i, pessoa in enumerate(pessoas, 1):
-            print(f"{i}. {pessoa}")
-        
-        try:
-            indice = self.solicitar_entrada("Selecione a pessoa para deletar", int) - 1
-            if not (0 <= indice < len(pessoas)):
-                self.exibir_erro("Índice inválido")
-                return
-            
-            pessoa = pessoas[indice]
-            
-            if self.confirmar_acao(f"Confirma a exclusão de '{pessoa.nome}'?"):
-                if self.pessoa_controller.deletar(pessoa.id):
-                    self.exibir_sucesso("Pessoa deletada com sucesso")
-                else:
-                    self.exibir_erro("Erro ao deletar pessoa")
-                    
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        if self.confirmar_acao(f"Confirma a exclusão de '{pessoa.nome}'?"):
+            if self.pessoa_controller.deletar(pessoa.id):
+                self.exibir_sucesso("Pessoa deletada com sucesso")
+            else:
+                self.exibir_erro("Erro ao deletar pessoa")
     
     def menu_destinos(self):
 
@@ -283,8 +362,7 @@ class SistemaViagensView(BaseView):
     
     def listar_destinos(self):
 
-        destinos = self.destino_controller.listar_todos()
-        self.exibir_lista(destinos, "DESTINOS CADASTRADOS")
+        self.exibir_paginas(self.destino_controller, "DESTINOS CADASTRADOS")
     
     def menu_transportes(self):
 
@@ -350,18 +428,18 @@ class SistemaViagensView(BaseView):
     
     def listar_empresas_transporte(self):
 
-        empresas = self.empresa_controller.listar_todos()
-        if not empresas:
-            self.exibir_mensagem("Nenhuma empresa cadastrada.")
-            return
-        
-        print("\n=== EMPRESAS DE TRANSPORTE ===")
-        for empresa in empresas:
+        def exibir_empresa(empresa):
             print(f"ID: {empresa.id}")
             print(f"Nome: {empresa.nome}")
             print(f"CNPJ: {empresa.cnpj}")
             print(f"Telefone: {empresa.telefone}")
             print("-" * 40)
+        
+        if not self.empresa_controller.contar_todos():
+            self.exibir_mensagem("Nenhuma empresa cadastrada.")
+            return
+        
+        self.exibir_paginas(self.empresa_controller, "=== EMPRESAS DE TRANSPORTE ===", exibir_empresa)
     
     def menu_tipos_transporte(self):
 
@@ -387,21 +465,12 @@ class SistemaViagensView(BaseView):
         try:
             print("\n=== CADASTRAR TIPO DE TRANSPORTE ===")
             
-            empresas = self.empresa_controller.listar_todos()
-            if not empresas:
-                self.exibir_erro("Nenhuma empresa cadastrada. Cadastre uma empresa primeiro.")
+            empresa_selecionada = self.selecionar(
+                self.empresa_controller, "\nEmpresas disponíveis:", "Escolha uma empresa (número)",
+                "Nenhuma empresa cadastrada. Cadastre uma empresa primeiro.",
+                lambda e: f"{e.nome} (CNPJ: {e.cnpj})", invalido="Empresa inválida!")
+            if empresa_selecionada is None:
                 return
-            
-            print("\nEmpresas disponíveis:")
-            for i, empresa in enumerate(empresas, 1):
-                print(f"{i}. {empresa.nome} (CNPJ: {empresa.cnpj})")
-            
-            escolha = self.solicitar_entrada("Escolha uma empresa (número)", int) - 1
-            if escolha < 0 or escolha >= len(empresas):
-                self.exibir_erro("Empresa inválida!")
-                return
-            
-            empresa_selecionada = empresas[escolha]
             tipo = self.solicitar_entrada("Tipo de transporte (ex: Avião, Ônibus, Trem)")
             
             dados = {
@@ -507,13 +576,7 @@ class SistemaViagensView(BaseView):
     
     def listar_trechos_viagem(self):
 
-        trechos = self.transporte_controller.listar_todos()
-        if not trechos:
-            self.exibir_mensagem("Nenhum trecho cadastrado.")
-            return
-        
-        print("\n=== TRECHOS DE VIAGEM ===")
-        for trecho in trechos:
+        def exibir_trecho(trecho):
             print(f"ID: {trecho.id}")
             print(f"Trecho: {trecho.origem} → {trecho.destino}")
             print(f"Data: {trecho.data}")
@@ -522,27 +585,28 @@ class SistemaViagensView(BaseView):
             if trecho.responsavel_compra:
                 print(f"Responsável: {trecho.responsavel_compra}")
             print("-" * 50)
+        
+        if not self.transporte_controller.contar_todos():
+            self.exibir_mensagem("Nenhum trecho cadastrado.")
+            return
+        
+        self.exibir_paginas(self.transporte_controller, "=== TRECHOS DE VIAGEM ===", exibir_trecho)
     
     def atualizar_status_compra(self):
 
         try:
-            trechos = self.transporte_controller.listar_todos()
-            if not trechos:
+            if not self.transporte_controller.contar_todos():
                 self.exibir_mensagem("Nenhum trecho cadastrado.")
                 return
             
             print("\n=== ATUALIZAR STATUS DE COMPRA ===")
-            print("\nTrechos disponíveis:")
-            for i, trecho in enumerate(trechos, 1):
-                status = "Comprado" if trecho.compra_realizada else "Pendente"
-                print(f"{i}. {trecho.origem} → {trecho.destino} ({trecho.data}) - {status}")
-            
-            escolha = self.solicitar_entrada("Escolha um trecho (número)", int) - 1
-            if escolha < 0 or escolha >= len(trechos):
-                self.exibir_erro("Trecho inválido!")
+            trecho_selecionado = self.selecionar(
+                self.transporte_controller, "\nTrechos disponíveis:", "Escolha um trecho (número)", "Nenhum trecho cadastrado.",
+                lambda t: f"{t.origem} → {t.destino} ({t.data}) - {'Comprado' if t.compra_realizada else 'Pendente'}",
+                invalido="Trecho inválido!")
+            if trecho_selecionado is None:
                 return
-            
-            trecho_selecionado = trechos[escolha]
+            versao = self.transporte_controller.versao(trecho_selecionado.id)
             
             novo_status = self.solicitar_entrada("Compra realizada? (s/n)").lower() == 's'
             responsavel = None
@@ -555,7 +619,7 @@ class SistemaViagensView(BaseView):
                 'responsavel_compra': responsavel
             }
             
-            if self.transporte_controller.atualizar(trecho_selecionado.id, dados):
+            if self.transporte_controller.atualizar(trecho_selecionado.id, dados, versao):
                 self.exibir_sucesso("Status atualizado com sucesso!")
             else:
                 self.exibir_erro("Erro ao atualizar status.")
@@ -566,23 +630,17 @@ class SistemaViagensView(BaseView):
     def deletar_trecho_viagem(self):
 
         try:
-            trechos = self.transporte_controller.listar_todos()
-            if not trechos:
+            if not self.transporte_controller.contar_todos():
                 self.exibir_mensagem("Nenhum trecho cadastrado.")
                 return
             
             print("\n=== DELETAR TRECHO ===")
-            print("\nTrechos disponíveis:")
-            for i, trecho in enumerate(trechos, 1):
-                print(f"{i}. {trecho.origem} → {trecho.destino} ({trecho.data})")
-            
-            escolha = self.solicitar_entrada("Escolha um trecho para deletar (número)", int) - 1
-            if escolha < 0 or escolha >= len(trechos):
-                self.exibir_erro("Trecho inválido!")
+            trecho_selecionado = self.selecionar(
+                self.transporte_controller, "\nTrechos disponíveis:", "Escolha um trecho para deletar (número)", "Nenhum trecho cadastrado.",
+                lambda t: f"{t.origem} → {t.destino} ({t.data})", invalido="Trecho inválido!")
+            if trecho_selecionado is None:
                 return
             
-            trecho_selecionado = trechos[escolha]
-            
             confirmacao = self.solicitar_entrada(f"Confirma a exclusão do trecho {trecho_selecionado.origem} → {trecho_selecionado.destino}? (s/n)").lower()
             
             if confirmacao == 's':
@@ -605,6 +663,7 @@ class SistemaViagensView(BaseView):
             print("3. Listar Passagens por Viagem")
             print("4. Listar Passagens por Responsável")
             print("5. Atualizar Status de Compra")
+            print("6. Importar Passagens de Arquivo (CSV/JSONL)")
             print("0. Voltar")
             
             opcao = self.solicitar_entrada("Opção", int)
@@ -621,6 +680,8 @@ class SistemaViagensView(BaseView):
                 self.listar_passagens_por_responsavel()
             elif opcao == 5:
                 self.atualizar_status_compra_passagem()
+            elif opcao == 6:
+                self.importar_passagens()
             else:
                 self.exibir_erro("Opção inválida!")
 
@@ -629,21 +690,11 @@ class SistemaViagensView(BaseView):
         try:
             print("\n=== CADASTRAR PASSAGEM ===")
             
-            viagens = self.viagem_controller.listar_todos()
-            if not viagens:
-                self.exibir_erro("Nenhuma viagem cadastrada.")
-                return
-                
-            print("\nViagens disponíveis:")
-            for i, viagem in enumerate(viagens, 1):
-                print(f"{i}. {viagem.titulo} - {viagem.data_inicio} a {viagem.data_fim}")
-            
-            viagem_index = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if viagem_index < 0 or viagem_index >= len(viagens):
-                self.exibir_erro("Viagem inválida.")
+            viagem_selecionada = self.selecionar(
+                self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem", "Nenhuma viagem cadastrada.",
+                lambda v: f"{v.titulo} - {v.data_inicio} a {v.data_fim}", invalido="Viagem inválida.")
+            if viagem_selecionada is None:
                 return
-            
-            viagem_selecionada = viagens[viagem_index]
             viagem_id = viagem_selecionada.id
             
             origem = self.solicitar_entrada("Origem", str)
@@ -654,21 +705,11 @@ class SistemaViagensView(BaseView):
             hora_partida_str = self.solicitar_entrada("Hora de partida (HH:MM) - opcional", str, obrigatorio=False)
             hora_chegada_str = self.solicitar_entrada("Hora de chegada (HH:MM) - opcional", str, obrigatorio=False)
             
-            empresas = self.empresa_controller.listar_todos()
-            if not empresas:
-                self.exibir_erro("Nenhuma empresa cadastrada.")
-                return
-                
-            print("\nEmpresas disponíveis:")
-            for i, empresa in enumerate(empresas, 1):
-                print(f"{i}. {empresa.nome} - CNPJ: {empresa.cnpj}")
-            
-            empresa_index = self.solicitar_entrada("Selecione a empresa", int) - 1
-            if empresa_index < 0 or empresa_index >= len(empresas):
-                self.exibir_erro("Empresa inválida.")
+            empresa_selecionada = self.selecionar(
+                self.empresa_controller, "\nEmpresas disponíveis:", "Selecione a empresa", "Nenhuma empresa cadastrada.",
+                lambda e: f"{e.nome} - CNPJ: {e.cnpj}", invalido="Empresa inválida.")
+            if empresa_selecionada is None:
                 return
-            
-            empresa_selecionada = empresas[empresa_index]
             empresa_id = empresa_selecionada.id
             
             from models.tipo_transporte import TipoTransporte
@@ -688,26 +729,18 @@ class SistemaViagensView(BaseView):
                 'tipo': tipo_transporte
             })
             
-            pessoas = self.pessoa_controller.listar_todos()
-            if not pessoas:
+            if not self.pessoa_controller.contar_todos():
                 self.exibir_erro("Nenhuma pessoa cadastrada.")
                 return
-                
-            print("\nPessoas disponíveis:")
-            print("0. Nenhuma (não definir responsável)")
-            for i, pessoa in enumerate(pessoas, 1):
-                print(f"{i}. {pessoa.nome} - {pessoa.identificacao}")
-            
-            responsavel_index = self.solicitar_entrada("Selecione o responsável (0 para nenhum)", int)
             
             responsavel_id = None
-            if responsavel_index > 0:
-                if responsavel_index <= len(pessoas):
-                    responsavel_selecionado = pessoas[responsavel_index - 1]
-                    responsavel_id = responsavel_selecionado.id
-                else:
-                    self.exibir_erro("Pessoa inválida.")
+            if self.confirmar_acao("Definir o responsável pela compra?"):
+                responsavel_selecionado = self.selecionar(
+                    self.pessoa_controller, "\nPessoas disponíveis:", "Selecione o responsável", "Nenhuma pessoa cadastrada.",
+                    lambda p: f"{p.nome} - {p.identificacao}", invalido="Pessoa inválida.")
+                if responsavel_selecionado is None:
                     return
+                responsavel_id = responsavel_selecionado.id
             
             preco = self.solicitar_entrada("Preço (opcional)", float, obrigatorio=False)
             assento = self.solicitar_entrada("Número do assento (opcional)", str, obrigatorio=False)
@@ -738,19 +771,31 @@ class SistemaViagensView(BaseView):
         except Exception as e:
             self.exibir_erro(f"Erro ao cadastrar passagem: {str(e)}")
 
+    def importar_passagens(self):
+
+        try:
+            print("\n=== IMPORTAR PASSAGENS ===")
+            caminho = self.solicitar_entrada("Caminho do arquivo (.csv ou .jsonl)", str)
+            
+            resultado = ImportadorPassagens(self.passagem_controller).importar(
+                caminho, progresso=self._exibir_progresso)
+            self._exibir_importacao(resultado, "passagens")
+            
+        except Exception as e:
+            self.exibir_erro(f"Erro ao importar passagens: {str(e)}")
+
     def listar_passagens(self):
 
         try:
-            passagens = self.passagem_controller.listar_todos()
-            if not passagens:
+            if not self.passagem_controller.contar_todos():
                 self.exibir_mensagem("Nenhuma passagem cadastrada.")
                 return
             
-            self.exibir_lista(passagens, "=== PASSAGENS CADASTRADAS ===")
+            self.exibir_paginas(self.passagem_controller, "=== PASSAGENS CADASTRADAS ===")
             
         except Exception as e:
             self.exibir_erro(f"Erro ao listar passagens: {str(e)}")
-
+    
     def listar_passagens_por_viagem(self):
 
         try:
@@ -784,23 +829,13 @@ class SistemaViagensView(BaseView):
     def atualizar_status_compra_passagem(self):
 
         try:
-            passagens = self.passagem_controller.listar_todos()
-            if not passagens:
-                self.exibir_mensagem("Nenhuma passagem cadastrada.")
+            passagem_selecionada = self.selecionar(
+                self.passagem_controller, "\nPassagens disponíveis:", "Selecione a passagem", "Nenhuma passagem cadastrada.",
+                lambda p: f"{p.origem} → {p.destino} - Status: {'Comprada' if p.comprada else 'Não comprada'}",
+                invalido="Passagem inválida.")
+            if passagem_selecionada is None:
                 return
             
-            print("\nPassagens disponíveis:")
-            for i, passagem in enumerate(passagens, 1):
-                status = "Comprada" if passagem.comprada else "Não comprada"
-                print(f"{i}. {passagem.origem} → {passagem.destino} - Status: {status}")
-            
-            passagem_index = self.solicitar_entrada("Selecione a passagem", int) - 1
-            if passagem_index < 0 or passagem_index >= len(passagens):
-                self.exibir_erro("Passagem inválida.")
-                return
-            
-            passagem_selecionada = passagens[passagem_index]
-            
             print(f"\nPassagem selecionada: {passagem_selecionada.origem} → {passagem_selecionada.destino}")
             print(f"Status atual: {'Comprada' if passagem_selecionada.comprada else 'Não comprada'}")
             
@@ -813,25 +848,19 @@ class SistemaViagensView(BaseView):
                         passagem_selecionada.responsavel_compra_id
                     )
                 else:
-                    pessoas = self.pessoa_controller.listar_todos()
-                    if pessoas:
-                        print("\nQuem será o responsável pela compra:")
-                        for i, pessoa in enumerate(pessoas, 1):
-                            print(f"{i}. {pessoa.nome}")
-                        
-                        responsavel_index = self.solicitar_entrada("Selecione o responsável", int) - 1
-                        if 0 <= responsavel_index < len(pessoas):
-                            responsavel = pessoas[responsavel_index]
-                            self.passagem_controller.marcar_como_comprada(
-                                passagem_selecionada.id, 
-                                responsavel.id
-                            )
-                        else:
-                            self.exibir_erro("Responsável inválido.")
-                            return
-                    else:
+                    if not self.pessoa_controller.contar_todos():
                         self.exibir_erro("Nenhuma pessoa cadastrada para ser responsável.")
                         return
+                    
+                    responsavel = self.selecionar(
+                        self.pessoa_controller, "\nQuem será o responsável pela compra:", "Selecione o responsável", "Nenhuma pessoa cadastrada.",
+                        lambda p: p.nome, invalido="Responsável inválido.")
+                    if responsavel is None:
+                        return
+                    self.passagem_controller.marcar_como_comprada(
+                        passagem_selecionada.id, 
+                        responsavel.id
+                    )
             else:
                 self.passagem_controller.cancelar_compra(passagem_selecionada.id)
             
@@ -1030,30 +1059,18 @@ class SistemaViagensView(BaseView):
             print(f"{i}. {passeio.atracao_turistica} em {passeio.cidade} - R$ {valor:.2f}")
     
     def relatorio_financeiro(self):
-        viagens = self.viagem_controller.listar_todos()
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem",
+                                 "Nenhuma viagem cadastrada.", invalido="Índice inválido.")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
+        relatorio = self.relatorio_service.relatorio_financeiro_viagem(viagem.id)
         
-        try:
-            indice = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if 0 <= indice < len(viagens):
-                viagem = viagens[indice]
-                relatorio = self.relatorio_service.relatorio_financeiro_viagem(viagem.id)
-                
-                print(f"\n=== RELATÓRIO FINANCEIRO - {viagem.titulo} ===")
-                print(f"Valor Total: R$ {relatorio['valor_total']:.2f}")
-                print(f"Total Pago: R$ {relatorio['total_pago']:.2f}")
-                print(f"Saldo Devedor: R$ {relatorio['saldo_devedor']:.2f}")
-                print(f"Percentual Pago: {relatorio['percentual_pago']:.1f}%")
-            else:
-                self.exibir_erro("Índice inválido.")
-        except ValueError:
-            self.exibir_erro("Valor inválido.")
+        print(f"\n=== RELATÓRIO FINANCEIRO - {viagem.titulo} ===")
+        print(f"Valor Total: R$ {relatorio['valor_total']:.2f}")
+        print(f"Total Pago: R$ {relatorio['total_pago']:.2f}")
+        print(f"Saldo Devedor: R$ {relatorio['saldo_devedor']:.2f}")
+        print(f"Percentual Pago: {relatorio['percentual_pago']:.1f}%")
     
     def menu_viagens(self):
         while True:
@@ -1105,32 +1122,22 @@ class SistemaViagensView(BaseView):
             
             valor_total = self.solicitar_entrada("Valor total", float)
             
-            destinos = self.destino_controller.listar_todos()
-            if not destinos:
+            if not self.destino_controller.contar_todos():
                 self.exibir_erro("Nenhum destino cadastrado. Cadastre destinos primeiro.")
                 return
             
-            print("\nDestinos disponíveis:")
-            for i, destino in enumerate(destinos, 1):
-                print(f"{i}. {destino}")
-            
             destino_ids = []
             while True:
-                try:
-                    indice = self.solicitar_entrada("Selecione destino (0 para finalizar)", int)
-                    if indice == 0:
-                        break
-                    if 1 <= indice <= len(destinos):
-                        destino_id = destinos[indice-1].id
-                        if destino_id not in destino_ids:
-                            destino_ids.append(destino_id)
-                            print(f"Destino {destinos[indice-1].nome_completo()} adicionado")
-                        else:
-                            print("Destino já adicionado")
+                destino = self.selecionar(self.destino_controller, "\nDestinos disponíveis:", "Selecione destino",
+                                          "Nenhum destino cadastrado.")
+                if destino is not None:
+                    if destino.id not in destino_ids:
+                        destino_ids.append(destino.id)
+                        print(f"Destino {destino.nome_completo()} adicionado")
                     else:
-                        print("Índice inválido")
-                except ValueError:
-                    print("Valor inválido")
+                        print("Destino já adicionado")
+                if not self.confirmar_acao("Adicionar outro destino?"):
+                    break
             
             if not destino_ids:
                 self.exibir_erro("Pelo menos um destino deve ser selecionado")
@@ -1151,110 +1158,63 @@ class SistemaViagensView(BaseView):
             self.exibir_erro(f"Erro ao criar viagem: {str(e)}")
     
     def listar_viagens(self):
-        viagens = self.viagem_controller.listar_todos()
-        self.exibir_lista(viagens, "VIAGENS CADASTRADAS")
+        self.exibir_paginas(self.viagem_controller, "VIAGENS CADASTRADAS")
     
     def buscar_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem", "Nenhuma viagem cadastrada.")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
-        
-        try:
-            indice = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if 0 <= indice < len(viagens):
-                viagem = viagens[indice]
-                print(f"\n=== DETALHES DA VIAGEM ===")
-                print(f"Título: {viagem.titulo}")
-                print(f"Período: {viagem.data_inicio} a {viagem.data_fim}")
-                print(f"Valor Total: R$ {viagem.valor_total:.2f}")
-                print(f"Participantes: {len(viagem.participantes)}")
-                print(f"Destinos: {', '.join([d.nome_completo() for d in viagem.destinos])}")
-            else:
-                self.exibir_erro("Índice inválido")
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        print(f"\n=== DETALHES DA VIAGEM ===")
+        print(f"Título: {viagem.titulo}")
+        print(f"Período: {viagem.data_inicio} a {viagem.data_fim}")
+        print(f"Valor Total: R$ {viagem.valor_total:.2f}")
+        print(f"Participantes: {len(viagem.participantes)}")
+        print(f"Destinos: {', '.join([d.nome_completo() for d in viagem.destinos])}")
     
     def adicionar_participante_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        pessoas = self.pessoa_controller.listar_todos()
-        
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        if not self.pessoa_controller.contar_todos():
+            self.exibir_mensagem("Nenhuma pessoa cadastrada.")
             return
         
-        if not pessoas:
-            self.exibir_mensagem("Nenhuma pessoa cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem",
+                                 "Nenhuma viagem cadastrada.", invalido="Índice de viagem inválido")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
+        pessoa = self.selecionar(self.pessoa_controller, "\nPessoas disponíveis:", "Selecione a pessoa",
+                                 "Nenhuma pessoa cadastrada.", invalido="Índice de pessoa inválido")
+        if pessoa is None:
+            return
         
-        try:
-            indice_viagem = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if not (0 <= indice_viagem < len(viagens)):
-                self.exibir_erro("Índice de viagem inválido")
-                return
-            
-            viagem = viagens[indice_viagem]
-            
-            print("\nPessoas disponíveis:")
-            for i, pessoa in enumerate(pessoas, 1):
-                print(f"{i}. {pessoa}")
-            
-            indice_pessoa = self.solicitar_entrada("Selecione a pessoa", int) - 1
-            if not (0 <= indice_pessoa < len(pessoas)):
-                self.exibir_erro("Índice de pessoa inválido")
-                return
-            
-            pessoa = pessoas[indice_pessoa]
-            
-            if self.viagem_controller.adicionar_participante(viagem.id, pessoa.id):
-                self.exibir_sucesso(f"Participante {pessoa.nome} adicionado à viagem {viagem.titulo}")
-            else:
-                self.exibir_erro("Erro ao adicionar participante")
-                
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        if self.viagem_controller.adicionar_participante(viagem.id, pessoa.id):
+            self.exibir_sucesso(f"Participante {pessoa.nome} adicionado à viagem {viagem.titulo}")
+        else:
+            self.exibir_erro("Erro ao adicionar participante")
     
     def remover_participante_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem", "Nenhuma viagem cadastrada.",
+                                 lambda v: f"{v} - {len(v.participantes)} participante(s)",
+                                 invalido="Índice de viagem inválido")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem} - {len(viagem.participantes)} participante(s)")
-        
         try:
-            indice_viagem = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if not (0 <= indice_viagem < len(viagens)):
-                self.exibir_erro("Índice de viagem inválido")
-                return
-            
-            viagem = viagens[indice_viagem]
-            
-            if not viagem.participantes:
+            participantes = self.viagem_controller.listar_participantes(viagem.id)
+            if not participantes:
                 self.exibir_mensagem("Esta viagem não possui participantes.")
                 return
             
             print("\nParticipantes da viagem:")
-            for i, pessoa in enumerate(viagem.participantes, 1):
+            for i, pessoa in enumerate(participantes, 1):
                 print(f"{i}. {pessoa}")
             
             indice_pessoa = self.solicitar_entrada("Selecione a pessoa para remover", int) - 1
-            if not (0 <= indice_pessoa < len(viagem.participantes)):
+            if not (0 <= indice_pessoa < len(participantes)):
                 self.exibir_erro("Índice de pessoa inválido")
                 return
             
-            pessoa = viagem.participantes[indice_pessoa]
+            pessoa = participantes[indice_pessoa]
             
             if self.viagem_controller.remover_participante(viagem.id, pessoa.id):
                 self.exibir_sucesso(f"Participante {pessoa.nome} removido da viagem {viagem.titulo}")
@@ -1265,63 +1225,41 @@ class SistemaViagensView(BaseView):
             self.exibir_erro("Valor inválido")
     
     def atualizar_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem para atualizar",
+                                 "Nenhuma viagem cadastrada.")
+        if viagem is None:
             return
+        versao = self.viagem_controller.versao(viagem.id)
+        
+        print(f"Valor atual: R$ {viagem.valor_total:.2f}")
+        novo_valor = self.solicitar_entrada("Novo valor total", float)
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
+        dados = {'valor_total': novo_valor}
         
         try:
-            indice = self.solicitar_entrada("Selecione a viagem para atualizar", int) - 1
-            if not (0 <= indice < len(viagens)):
-                self.exibir_erro("Índice inválido")
-                return
-            
-            viagem = viagens[indice]
-            print(f"Valor atual: R$ {viagem.valor_total:.2f}")
-            novo_valor = self.solicitar_entrada("Novo valor total", float)
-            
-            dados = {'valor_total': novo_valor}
-            
-            if self.viagem_controller.atualizar(viagem.id, dados):
+            if self.viagem_controller.atualizar(viagem.id, dados, versao):
                 self.exibir_sucesso("Viagem atualizada com sucesso")
             else:
                 self.exibir_erro("Erro ao atualizar viagem")
-                
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        except ConflitoVersaoException:
+            self.exibir_erro("A viagem foi alterada enquanto você editava. Tente novamente.")
+        except ValorInvalidoException as e:
+            self.exibir_erro(str(e))
     
     def deletar_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem para deletar",
+                                 "Nenhuma viagem cadastrada.")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
-        
-        try:
-            indice = self.solicitar_entrada("Selecione a viagem para deletar", int) - 1
-            if not (0 <= indice < len(viagens)):
-                self.exibir_erro("Índice inválido")
-                return
-            
-            viagem = viagens[indice]
-            
-            if self.confirmar_acao(f"Confirma a exclusão da viagem '{viagem.titulo}'?"):
+        if self.confirmar_acao(f"Confirma a exclusão da viagem '{viagem.titulo}'?"):
+            try:
                 if self.viagem_controller.deletar(viagem.id):
                     self.exibir_sucesso("Viagem deletada com sucesso")
                 else:
                     self.exibir_erro("Erro ao deletar viagem")
-                    
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+            except ViagemComPagamentosException as e:
+                self.exibir_erro(str(e))
     
     def menu_pagamentos(self):
         while True:
@@ -1352,39 +1290,24 @@ class SistemaViagensView(BaseView):
         try:
             print("\n=== REGISTRAR PAGAMENTO ===")
             
-            pessoas = self.pessoa_controller.listar_todos()
-            viagens = self.viagem_controller.listar_todos()
-            
-            if not pessoas:
+            if not self.pessoa_controller.contar_todos():
                 self.exibir_erro("Nenhuma pessoa cadastrada.")
                 return
             
-            if not viagens:
+            if not self.viagem_controller.contar_todos():
                 self.exibir_erro("Nenhuma viagem cadastrada.")
                 return
             
-            print("Pessoas disponíveis:")
-            for i, pessoa in enumerate(pessoas, 1):
-                print(f"{i}. {pessoa}")
-            
-            indice_pessoa = self.solicitar_entrada("Selecione a pessoa", int) - 1
-            if not (0 <= indice_pessoa < len(pessoas)):
-                self.exibir_erro("Índice de pessoa inválido")
+            pessoa = self.selecionar(self.pessoa_controller, "Pessoas disponíveis:", "Selecione a pessoa",
+                                     "Nenhuma pessoa cadastrada.", invalido="Índice de pessoa inválido")
+            if pessoa is None:
                 return
             
-            pessoa = pessoas[indice_pessoa]
-            
-            print("\nViagens disponíveis:")
-            for i, viagem in enumerate(viagens, 1):
-                print(f"{i}. {viagem}")
-            
-            indice_viagem = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if not (0 <= indice_viagem < len(viagens)):
-                self.exibir_erro("Índice de viagem inválido")
+            viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem",
+                                     "Nenhuma viagem cadastrada.", invalido="Índice de viagem inválido")
+            if viagem is None:
                 return
             
-            viagem = viagens[indice_viagem]
-            
             print("Data do pagamento:")
             dia = self.solicitar_entrada("Dia", int)
             mes = self.solicitar_entrada("Mês", int)
@@ -1427,97 +1350,54 @@ class SistemaViagensView(BaseView):
             self.exibir_erro(f"Erro ao registrar pagamento: {str(e)}")
     
     def listar_pagamentos(self):
-        pagamentos = self.pagamento_controller.listar_todos()
-        self.exibir_lista(pagamentos, "PAGAMENTOS REGISTRADOS")
+        self.exibir_paginas(self.pagamento_controller, "PAGAMENTOS REGISTRADOS")
     
     def listar_pagamentos_por_viagem(self):
-        viagens = self.viagem_controller.listar_todos()
-        
-        if not viagens:
-            self.exibir_mensagem("Nenhuma viagem cadastrada.")
+        viagem = self.selecionar(self.viagem_controller, "\nViagens disponíveis:", "Selecione a viagem", "Nenhuma viagem cadastrada.")
+        if viagem is None:
             return
         
-        print("\nViagens disponíveis:")
-        for i, viagem in enumerate(viagens, 1):
-            print(f"{i}. {viagem}")
+        pagamentos = self.pagamento_controller.listar_por_viagem(viagem.id)
         
-        try:
-            indice = self.solicitar_entrada("Selecione a viagem", int) - 1
-            if 0 <= indice < len(viagens):
-                viagem = viagens[indice]
-                pagamentos = self.pagamento_controller.listar_por_viagem(viagem.id)
-                
-                if pagamentos:
-                    print(f"\n=== PAGAMENTOS DA VIAGEM: {viagem.titulo} ===")
-                    for pagamento in pagamentos:
-                        print(f"- {pagamento}")
-                    
-                    total = self.pagamento_controller.calcular_total_por_viagem(viagem.id)
-                    print(f"\nTotal pago: R$ {total:.2f}")
-                    print(f"Saldo devedor: R$ {viagem.valor_total - total:.2f}")
-                else:
-                    self.exibir_mensagem("Nenhum pagamento encontrado para esta viagem.")
-            else:
-                self.exibir_erro("Índice inválido")
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        if pagamentos:
+            print(f"\n=== PAGAMENTOS DA VIAGEM: {viagem.titulo} ===")
+            for pagamento in pagamentos:
+                print(f"- {pagamento}")
+            
+            total = self.pagamento_controller.calcular_total_por_viagem(viagem.id)
+            print(f"\nTotal pago: R$ {total:.2f}")
+            print(f"Saldo devedor: R$ {viagem.valor_total - total:.2f}")
+        else:
+            self.exibir_mensagem("Nenhum pagamento encontrado para esta viagem.")
     
     def listar_pagamentos_por_pessoa(self):
-        pessoas = self.pessoa_controller.listar_todos()
-        
-        if not pessoas:
-            self.exibir_mensagem("Nenhuma pessoa cadastrada.")
+        pessoa = self.selecionar(self.pessoa_controller, "\nPessoas disponíveis:", "Selecione a pessoa", "Nenhuma pessoa cadastrada.")
+        if pessoa is None:
             return
         
-        print("\nPessoas disponíveis:")
-        for i, pessoa in enumerate(pessoas, 1):
-            print(f"{i}. {pessoa}")
+        pagamentos = self.pagamento_controller.listar_por_pessoa(pessoa.id)
         
-        try:
-            indice = self.solicitar_entrada("Selecione a pessoa", int) - 1
-            if 0 <= indice < len(pessoas):
-                pessoa = pessoas[indice]
-                pagamentos = self.pagamento_controller.listar_por_pessoa(pessoa.id)
-                
-                if pagamentos:
-                    print(f"\n=== PAGAMENTOS DE: {pessoa.nome} ===")
-                    for pagamento in pagamentos:
-                        print(f"- {pagamento}")
-                    
-                    total = self.pagamento_controller.calcular_total_por_pessoa(pessoa.id)
-                    print(f"\nTotal pago: R$ {total:.2f}")
-                else:
-                    self.exibir_mensagem("Nenhum pagamento encontrado para esta pessoa.")
-            else:
-                self.exibir_erro("Índice inválido")
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+        if pagamentos:
+            print(f"\n=== PAGAMENTOS DE: {pessoa.nome} ===")
+            for pagamento in pagamentos:
+                print(f"- {pagamento}")
+            
+            total = self.pagamento_controller.calcular_total_por_pessoa(pessoa.id)
+            print(f"\nTotal pago: R$ {total:.2f}")
+        else:
+            self.exibir_mensagem("Nenhum pagamento encontrado para esta pessoa.")
     
     def estornar_pagamento(self):
-        pagamentos = self.pagamento_controller.listar_todos()
-        
-        if not pagamentos:
-            self.exibir_mensagem("Nenhum pagamento registrado.")
+        pagamento = self.selecionar(self.pagamento_controller, "\nPagamentos disponíveis:", "Selecione o pagamento para estornar",
+                                    "Nenhum pagamento registrado.")
+        if pagamento is None:
             return
         
-        print("\nPagamentos disponíveis:")
-        for i, pagamento in enumerate(pagamentos, 1):
-            print(f"{i}. {pagamento}")
-        
-        try:
-            indice = self.solicitar_entrada("Selecione o pagamento para estornar", int) - 1
-            if 0 <= indice < len(pagamentos):
-                pagamento = pagamentos[indice]
-                
-                if self.confirmar_acao(f"Confirma o estorno do pagamento de R$ {pagamento.valor:.2f}?"):
-                    if self.pagamento_controller.deletar(pagamento.id):
-                        self.exibir_sucesso("Pagamento estornado com sucesso")
-                    else:
-                        self.exibir_erro("Erro ao estornar pagamento")
+        if self.confirmar_acao(f"Confirma o estorno do pagamento de R$ {pagamento.valor:.2f}?"):
+            if self.pagamento_controller.deletar(pagamento.id):
+                self.exibir_sucesso("Pagamento estornado com sucesso")
             else:
-                self.exibir_erro("Índice inválido")
-        except ValueError:
-            self.exibir_erro("Valor inválido")
+                self.exibir_erro("Erro ao estornar pagamento")
     
     def menu_passeios(self):
         while True:
@@ -1548,10 +1428,7 @@ class SistemaViagensView(BaseView):
         try:
             print("\n=== CADASTRAR PASSEIO ===")
             
-            pessoas = self.pessoa_controller.listar_todos()
-            destinos = self.destino_controller.listar_todos()
-            
-            if not pessoas:
+            if not self.pessoa_controller.contar_todos():
                 self.exibir_erro("Nenhuma pessoa cadastrada.")
                 return
             
@@ -1576,27 +1453,15 @@ class SistemaViagensView(BaseView):
             ano = self.solicitar_entrada("Ano", int)
             data_passeio = date(ano, mes, dia)
             
-            print("\nPessoas disponíveis:")
-            for i, pessoa in enumerate(pessoas, 1):
-                print(f"{i}. {pessoa}")
-            
-            indice_pessoa = self.solicitar_entrada("Selecione a pessoa", int) - 1
-            if not (0 <= indice_pessoa < len(pessoas)):
-                self.exibir_erro("Índice de pessoa inválido")
+            pessoa = self.selecionar(self.pessoa_controller, "\nPessoas disponíveis:", "Selecione a pessoa",
+                                     "Nenhuma pessoa cadastrada.", invalido="Índice de pessoa inválido")
+            if pessoa is None:
                 return
             
-            pessoa = pessoas[indice_pessoa]
-            
             destino = None
-            if destinos:
-                print("\nDestinos disponíveis (opcional):")
-                print("0. Nenhum")
-                for i, dest in enumerate(destinos, 1):
-                    print(f"{i}. {dest}")
-                
-                indice_destino = self.solicitar_entrada("Selecione o destino", int)
-                if 1 <= indice_destino <= len(destinos):
-                    destino = destinos[indice_destino - 1]
+            if self.destino_controller.contar_todos() and self.confirmar_acao("Vincular o passeio a um destino?"):
+                destino = self.selecionar(self.destino_controller, "\nDestinos disponíveis:", "Selecione o destino",
+                                          "Nenhum destino cadastrado.")
             
             from models.passeio import Passeio
             passeio = Passeio(